@@ -1,7 +1,7 @@
 """
 
 	User interface for Vertex Color Bench (VCB) v1.0
-	
+
 	VCB offers a set of tools for editting vertex color information.
 	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
 
@@ -14,9 +14,14 @@
 # Main Window
 
 ## Imports
-import pymel.core as pm
-import VCB_core as core
-import VCB_optVars as vars
+# Only maya.cmds and the profile hooks are needed to open the window. The
+# core, engine and preview modules, and NumPy with them, load on first use
+import json
+import sys
+
+import maya.cmds as cmds
+import VCB.VCB_optVars as vars
+import VCB.VCB_profile as profile
 
 ## Initialize
 
@@ -36,239 +41,719 @@ WIN_MAIN = "VCB_winMain"
 FRAME_SETTINGS = "FRAME_SETTINGS"
 FRAME_GRADIENT = "FRAME_GRADIENT"
 FRAME_COLORS = "FRAME_COLORS"
+FRAME_SMOOTH = "FRAME_SMOOTH"
+FRAME_PACK = "FRAME_PACK"
+
+CHANNELS = ("R", "G", "B", "A")
+
+# Blend mode labels in the order of the kernel.BLEND_* codes
+BLEND_MODES = ("Replace", "Add", "Multiply", "Screen", "Overlay", "Subtract", "Min", "Max", "Lerp")
+
+optionVar = vars.optionVar
 
 ## Main Window
 
 def createUI():
 	# Check for window duplicate
-	if pm.window(WIN_MAIN, exists = True):
-		pm.deleteUI(WIN_MAIN)
-	
+	if cmds.window(WIN_MAIN, exists = True):
+		cmds.deleteUI(WIN_MAIN)
+
 	visStateMode = True
 	visStateBounds = True
-	
+
 	# Read Opt Vars and set visibility
-	if pm.optionVar["gradientMode_VCB"] == 1:
+	if optionVar["gradientMode_VCB"] == 1:
 		visStateMode = False
-		
-	if pm.optionVar["gradientBounds_VCB"] == 2:
+
+	if optionVar["gradientBounds_VCB"] != 1:
 		visStateBounds = False
-	
+
 	# Create Major UI Containers
-	with pm.window(WIN_MAIN, title = "Vertex Color Bench", resizeToFitChildren = True, menuBar=True) as winVCB:
-		menuTool = pm.menu(allowOptionBoxes=False, label="Tool Options", tearOff=False)
-		with pm.formLayout(parent=winVCB) as formContainer:
-			with pm.frameLayout(labelVisible=False, marginHeight = MARGIN_SM, marginWidth=MARGIN_SM) as frameMain:
-				with pm.formLayout() as formMain:
-					frameSettings = pm.frameLayout(FRAME_SETTINGS, label="Settings", collapsable=False,borderVisible=False, parent=formMain)	
-					frameColors = pm.frameLayout(FRAME_COLORS, label="Colors", collapsable=True,borderVisible=False, parent=formMain)
-					frameGradientOptions = pm.frameLayout(FRAME_GRADIENT, label="Gradient Options", collapsable=True, borderVisible=False, parent=formMain, enable = visStateMode)
-						
+	winVCB = cmds.window(WIN_MAIN, title = "Vertex Color Bench", resizeToFitChildren = True, menuBar=True)
+	menuTool = cmds.menu(allowOptionBoxes=False, label="Tool Options", tearOff=False)
+	formContainer = cmds.formLayout(parent=winVCB)
+	frameMain = cmds.frameLayout(labelVisible=False, marginHeight = MARGIN_SM, marginWidth=MARGIN_SM, parent=formContainer)
+	formMain = cmds.formLayout(parent=frameMain)
+	frameSettings = cmds.frameLayout(FRAME_SETTINGS, label="Settings", collapsable=False,borderVisible=False, parent=formMain)
+	frameColors = cmds.frameLayout(FRAME_COLORS, label="Colors", collapsable=True,borderVisible=False, parent=formMain)
+	frameGradientOptions = cmds.frameLayout(FRAME_GRADIENT, label="Gradient Options", collapsable=True, borderVisible=False, parent=formMain, enable = visStateMode)
+	frameSmooth = cmds.frameLayout(FRAME_SMOOTH, label="Smooth", collapsable=True, collapse=True, borderVisible=False, parent=formMain)
+	framePack = cmds.frameLayout(FRAME_PACK, label="Channel Pack", collapsable=True, collapse=True, borderVisible=False, parent=formMain)
+
 	# Add Tool Menu Items
-	with menuTool:
-		pm.menuItem(
-			label = "Reset Settings",
-			annotation = "Reset all VCB settings.",
-			command = lambda *args: vars.reset()
-		)
-		pm.menuItem(divider=True)
-		pm.menuItem(
-			label = "Create Shelf Button",
-			annotation = "Create a shelf button on the currently active shelf.",
-			command = lambda *args: core.VCB_CreateShelfBtn()
+	cmds.setParent(menuTool, menu = True)
+	cmds.menuItem(
+		label = "Reset Settings",
+		annotation = "Reset all VCB settings.",
+		command = lambda *args: vars.reset()
+	)
+	cmds.menuItem(divider=True)
+	cmds.menuItem(
+		label = "Live Preview",
+		annotation = "Show the colors on the selection while dragging the color and alpha sliders.",
+		checkBox = optionVar["livePreview_VCB"],
+		command = lambda state: PreviewOptVars(state)
+	)
+	cmds.menuItem(
+		label = "Apply in Background",
+		annotation = "Compute the colors on a worker thread so Maya stays responsive on large meshes. The colors are dropped if the settings change first.",
+		checkBox = optionVar["asyncApply_VCB"],
+		command = lambda state: AsyncOptVars(state)
+	)
+	cmds.menuItem(divider=True)
+	cmds.menuItem(
+		label = "Log Apply Timings",
+		annotation = "Print the time spent in each phase of every apply to the Script Editor.",
+		checkBox = optionVar["logStats_VCB"],
+		command = lambda state: StatsOptVars(state)
+	)
+	cmds.menuItem(
+		label = "Profile Next Apply",
+		annotation = "Print a cProfile report of the next apply to the Script Editor.",
+		command = lambda *args: profile.VCB_ProfileNextApply()
+	)
+	cmds.menuItem(divider=True)
+	cmds.menuItem(
+		label = "Undo Precision",
+		subMenu = True,
+	)
+	cmds.radioMenuItemCollection()
+	cmds.menuItem(
+		label = "8-bit",
+		annotation = "Store undo colors as 8-bit values, a quarter of the memory of full floats.",
+		radioButton = optionVar["undoPrecision_VCB"] == 1,
+		command = lambda *args: UndoOptVars(1)
+	)
+	cmds.menuItem(
+		label = "Half Float",
+		annotation = "Store undo colors as 16-bit floats.",
+		radioButton = optionVar["undoPrecision_VCB"] == 2,
+		command = lambda *args: UndoOptVars(2)
+	)
+	cmds.setParent("..", menu = True)
+	cmds.menuItem(
+		label = "Result Cache",
+		subMenu = True,
+	)
+	cmds.radioMenuItemCollection()
+	for label, size in (("Off", 0), ("64 MB", 64), ("256 MB", 256), ("1 GB", 1024)):
+		cmds.menuItem(
+			label = label,
+			annotation = "Memory kept for reusing colors computed from the same settings and geometry.",
+			radioButton = optionVar["resultCacheMB_VCB"] == size,
+			command = lambda *args, size = size: CacheOptVars(size)
 		)
-	
-	# Add Settings Controls
-	with frameSettings:
-		radioGrpGradientMode = pm.radioButtonGrp(
-			label = "Mode:",
-			numberOfRadioButtons = 2,
-			label1 = "Standard",
-			label2 = "Gradient",
-			select = pm.optionVar["gradientMode_VCB"],
-			changeCommand = lambda *args: SettingsOptVars(0),
-			vertical = False,
-			columnWidth = [1,COLUMN_01],
+	cmds.menuItem(divider=True)
+	cmds.menuItem(
+		label = "Print Cache Stats",
+		annotation = "Print the result cache's hits, misses and size to the Script Editor.",
+		command = lambda *args: Core().VCB_PrintCacheStats()
+	)
+	cmds.menuItem(
+		label = "Clear Cache",
+		annotation = "Drop every cached result.",
+		command = lambda *args: ClearCache()
+	)
+	cmds.setParent("..", menu = True)
+	cmds.menuItem(divider=True)
+	cmds.menuItem(
+		label = "Apply to Scene...",
+		annotation = "Apply to every mesh in object sets, namespaces or name patterns. Instances of a shape are colored once.",
+		command = lambda *args: ApplyToScene()
+	)
+	cmds.menuItem(
+		label = "Export Colors...",
+		annotation = "Save the selected mesh's vertex colors to a file.",
+		command = lambda *args: ColorFileDialog(export = True)
+	)
+	cmds.menuItem(
+		label = "Import Colors...",
+		annotation = "Load vertex colors from a file onto the selected meshes. Meshes with other topology get the colors of the nearest exported vertex.",
+		command = lambda *args: ColorFileDialog(export = False)
+	)
+	cmds.menuItem(divider=True)
+	cmds.menuItem(
+		label = "Create Shelf Button",
+		annotation = "Create a shelf button on the currently active shelf.",
+		command = lambda *args: Core().VCB_CreateShelfBtn()
+	)
+
+	# Modules that pull in NumPy, imported on first use
+	def Core():
+		import VCB.VCB_core as core
+		return core
+
+	def Preview():
+		import VCB.VCB_preview as preview
+		return preview
+
+	# Ask for the sets, namespaces or name patterns to batch
+	def ApplyToScene():
+		result = cmds.promptDialog(
+			title = "Apply to Scene",
+			message = "Object sets, namespaces or name patterns:",
+			text = optionVar["sceneTargets_VCB"],
+			button = ["Apply", "Cancel"],
+			defaultButton = "Apply",
+			cancelButton = "Cancel",
+			dismissString = "Cancel"
 		)
-		radioGrpBlendMode = pm.radioButtonGrp(
-			label = "Blend:",
-			numberOfRadioButtons = 3,
-			label1 = "Replace",
-			label2 = "Add",
-			label3 = "Multiply",
-			select = pm.optionVar["blendMode_VCB"],
-			changeCommand = lambda *args: SettingsOptVars(1),
-			vertical = False,
-			columnWidth = [1,COLUMN_01],
+		if result != "Apply":
+			return
+		text = cmds.promptDialog(query = True, text = True)
+		optionVar["sceneTargets_VCB"] = text
+		targets = text.replace(",", " ").split()
+		if targets:
+			Core().VCB_ApplyToScene(targets)
+
+	# Pick a color file to export to or import from
+	def ColorFileDialog(export):
+		paths = cmds.fileDialog2(
+			caption = "Export Colors" if export else "Import Colors",
+			fileFilter = "VCB Colors (*.vcbc)",
+			fileMode = 0 if export else 1,
+			dialogStyle = 2
 		)
-		
+		if not paths:
+			return
+		if export:
+			Core().VCB_ExportColors(paths[0])
+		else:
+			Core().VCB_ImportColors(paths[0])
+
+	# Stats Opt Vars
+	def StatsOptVars(state):
+		optionVar["logStats_VCB"] = state
+		profile.VCB_EnableStats(state, log = state)
+
+	profile.VCB_EnableStats(optionVar["logStats_VCB"], log = optionVar["logStats_VCB"])
+
+	# Undo Opt Vars
+	def UndoOptVars(precision):
+		optionVar["undoPrecision_VCB"] = precision
+
+	# Async Opt Vars
+	def AsyncOptVars(state):
+		optionVar["asyncApply_VCB"] = state
+
+	# Cache Opt Vars
+	def CacheOptVars(size):
+		optionVar["resultCacheMB_VCB"] = size
+		if "VCB.VCB_cache" in sys.modules:
+			sys.modules["VCB.VCB_cache"].VCB_SetCacheLimit(size * 1024 * 1024)
+
+	def ClearCache():
+		if "VCB.VCB_cache" in sys.modules:
+			sys.modules["VCB.VCB_cache"].VCB_ClearCache()
+
+	# Preview Opt Vars
+	def PreviewOptVars(state):
+		optionVar["livePreview_VCB"] = state
+		if not state:
+			CancelPreview()
+
+	# Nothing to revert until a preview has run
+	def CancelPreview():
+		if "VCB.VCB_preview" in sys.modules:
+			Preview().VCB_CancelPreview()
+
+	# Put the original colors back when the window closes or the selection changes
+	cmds.scriptJob(uiDeleted = [winVCB, CancelPreview])
+	cmds.scriptJob(event = ["SelectionChanged", CancelPreview], parent = winVCB)
+
+	# Add Settings Controls
+	cmds.setParent(frameSettings)
+	radioGrpGradientMode = cmds.radioButtonGrp(
+		label = "Mode:",
+		numberOfRadioButtons = 2,
+		label1 = "Standard",
+		label2 = "Gradient",
+		select = optionVar["gradientMode_VCB"],
+		changeCommand = lambda *args: SettingsOptVars(0),
+		vertical = False,
+		columnWidth = [1,COLUMN_01],
+	)
+	optionMenuBlendMode = cmds.optionMenuGrp(
+		label = "Blend:",
+		changeCommand = lambda *args: SettingsOptVars(1),
+		columnWidth = [1,COLUMN_01],
+		annotation = "How the new colors combine with the colors already on the mesh. Lerp mixes by the new color's alpha.",
+	)
+	for label in BLEND_MODES:
+		cmds.menuItem(label = label)
+	cmds.optionMenuGrp(optionMenuBlendMode, edit = True, select = optionVar["blendMode_VCB"])
+	sliderBlendOpacity = cmds.floatSliderGrp(
+		label = "Opacity:",
+		value = optionVar["blendOpacity_VCB"],
+		changeCommand = lambda *args: SettingsOptVars(4),
+		dragCommand = lambda *args: PreviewColors(),
+		field = True,
+		maxValue = 1.0,
+		minValue = 0.0,
+		precision = 2,
+		columnWidth = [1,COLUMN_01],
+		annotation = "How much of the blended colors is kept over the colors already on the mesh.",
+	)
+	checkGrpBlendChannels = cmds.checkBoxGrp(
+		label = "Channels:",
+		numberOfCheckBoxes = 4,
+		labelArray4 = list(CHANNELS),
+		valueArray4 = [bool(channel) for channel in optionVar["blendChannels_VCB"]],
+		changeCommand = lambda *args: SettingsOptVars(5),
+		columnWidth = [1,COLUMN_01],
+		annotation = "RGBA channels the blend writes, the others keep their colors.",
+	)
+	checkSoftWeights = cmds.checkBoxGrp(
+		label = "Soft Falloff:",
+		label1 = "Fade around the selection",
+		value1 = optionVar["softWeights_VCB"],
+		changeCommand = lambda *args: SettingsOptVars(2),
+		columnWidth = [1,COLUMN_01],
+		annotation = "Fade the colors out around selected components, following Soft Select when it's on.",
+	)
+	sliderSoftRadius = cmds.floatSliderGrp(
+		label = "Soft Radius:",
+		value = optionVar["softRadius_VCB"],
+		changeCommand = lambda *args: SettingsOptVars(3),
+		field = True,
+		maxValue = 10.0,
+		minValue = 0.0,
+		fieldMaxValue = 100000.0,
+		precision = 3,
+		columnWidth = [1,COLUMN_01],
+		enable = optionVar["softWeights_VCB"],
+		annotation = "Distance the colors fade out over when Soft Select is off.",
+	)
+
 	# Settings Opt Vars
 	def SettingsOptVars(varType):
 		if varType == 0:
 			# Adjust UI and set opt var
-			if radioGrpGradientMode.getSelect() == 1: # Standard
-				frameGradientOptions.setEnable(False) # Hide
-				hLayoutSwapColor.setEnable(False) # Hide
-				colorSub.setEnable(False) # Hide
-				alphaSub.setEnable(False) # Hide
-			else:
-				frameGradientOptions.setEnable(True) # Show
-				frameGradientOptions.setEnable(True) # Show
-				hLayoutSwapColor.setEnable(True) # Show
-				colorSub.setEnable(True) # Show
-				alphaSub.setEnable(True) # Show
-				
-			pm.optionVar["gradientMode_VCB"] = radioGrpGradientMode.getSelect()
-			
+			gradient = cmds.radioButtonGrp(radioGrpGradientMode, query = True, select = True) == 2
+			cmds.frameLayout(frameGradientOptions, edit = True, enable = gradient) # Show or Hide
+			cmds.rowLayout(hLayoutSwapColor, edit = True, enable = gradient)
+			cmds.colorSliderGrp(colorSub, edit = True, enable = gradient)
+			cmds.floatSliderGrp(alphaSub, edit = True, enable = gradient)
+
+			optionVar["gradientMode_VCB"] = cmds.radioButtonGrp(radioGrpGradientMode, query = True, select = True)
+
 		elif varType == 1:
-			pm.optionVar["blendMode_VCB"] = radioGrpBlendMode.getSelect()
-	
+			optionVar["blendMode_VCB"] = cmds.optionMenuGrp(optionMenuBlendMode, query = True, select = True)
+
+		elif varType == 2:
+			optionVar["softWeights_VCB"] = cmds.checkBoxGrp(checkSoftWeights, query = True, value1 = True)
+			cmds.floatSliderGrp(sliderSoftRadius, edit = True, enable = optionVar["softWeights_VCB"])
+			# The preview session holds the falloff weights it started with
+			CancelPreview()
+
+		elif varType == 3:
+			optionVar["softRadius_VCB"] = cmds.floatSliderGrp(sliderSoftRadius, query = True, value = True)
+			CancelPreview()
+
+		elif varType == 4:
+			optionVar["blendOpacity_VCB"] = cmds.floatSliderGrp(sliderBlendOpacity, query = True, value = True)
+
+		elif varType == 5:
+			optionVar["blendChannels_VCB"] = [int(value) for value in cmds.checkBoxGrp(checkGrpBlendChannels, query = True, valueArray4 = True)]
+
+		if PreviewActive():
+			PreviewColors()
+
 	# Add Color Controls
-	with frameColors:
-		# Main Color
-		colorMain = pm.colorSliderGrp(
-			label = "Main Color:",
-			rgbValue = pm.optionVar["colorMain_VCB"],
-			changeCommand = lambda *args: ColorOptVars(0),
-			columnWidth = [1,COLUMN_01],
-		)
-		alphaMain = pm.floatSliderGrp(
-			label = "Main Alpha:",
-			value = pm.optionVar["alphaMain_VCB"],
-			changeCommand = lambda *args: ColorOptVars(1),
-			field = True,
-			maxValue = 1.0,
-			minValue = 0.0,
-			precision = 2,
-			columnWidth = [1,COLUMN_01],
-		)
-		# Color Swap Controls
-		with pm.horizontalLayout(ratios = [0,0], spacing = MARGIN_LG, enable = visStateMode) as hLayoutSwapColor:
-			pm.text(
-				label = "Swap Colors:",
-				align = "right",
-				width = 88
-			)
-			pm.iconTextButton(
-				style = "iconOnly",
-				annotation = "Swap Colors",
-				command = lambda *args: SwapColors(),
-				image = "vcb_swapColors_icon.png",
-				width = 32,
-				height = 32
-			)
-		
-		# Sub Color
-		colorSub = pm.colorSliderGrp(
-			label = "Sub Color:",
-			rgbValue = pm.optionVar["colorSub_VCB"],
-			changeCommand = lambda *args: ColorOptVars(2),
-			columnWidth = [1,COLUMN_01],
-			enable = visStateMode,
-		)
-		alphaSub = pm.floatSliderGrp(
-			label = "Sub Alpha:",
-			value = pm.optionVar["alphaSub_VCB"],
-			changeCommand = lambda *args: ColorOptVars(3),
-			field = True,
-			maxValue = 1.0,
-			minValue = 0.0,
-			precision = 2,
-			columnWidth = [1,COLUMN_01],
-			enable = visStateMode,
-		)
-	
+	cmds.setParent(frameColors)
+	# Main Color
+	colorMain = cmds.colorSliderGrp(
+		label = "Main Color:",
+		rgbValue = optionVar["colorMain_VCB"],
+		changeCommand = lambda *args: ColorOptVars(0),
+		dragCommand = lambda *args: PreviewColors(),
+		columnWidth = [1,COLUMN_01],
+	)
+	alphaMain = cmds.floatSliderGrp(
+		label = "Main Alpha:",
+		value = optionVar["alphaMain_VCB"],
+		changeCommand = lambda *args: ColorOptVars(1),
+		dragCommand = lambda *args: PreviewColors(),
+		field = True,
+		maxValue = 1.0,
+		minValue = 0.0,
+		precision = 2,
+		columnWidth = [1,COLUMN_01],
+	)
+	# Color Swap Controls
+	hLayoutSwapColor = cmds.rowLayout(numberOfColumns = 2, columnAttach = (2, "left", MARGIN_LG), enable = visStateMode)
+	cmds.text(
+		label = "Swap Colors:",
+		align = "right",
+		width = 88
+	)
+	cmds.iconTextButton(
+		style = "iconOnly",
+		annotation = "Swap Colors",
+		command = lambda *args: SwapColors(),
+		image = "vcb_swapColors_icon.png",
+		width = 32,
+		height = 32
+	)
+	cmds.setParent("..")
+
+	# Sub Color
+	colorSub = cmds.colorSliderGrp(
+		label = "Sub Color:",
+		rgbValue = optionVar["colorSub_VCB"],
+		changeCommand = lambda *args: ColorOptVars(2),
+		dragCommand = lambda *args: PreviewColors(),
+		columnWidth = [1,COLUMN_01],
+		enable = visStateMode,
+	)
+	alphaSub = cmds.floatSliderGrp(
+		label = "Sub Alpha:",
+		value = optionVar["alphaSub_VCB"],
+		changeCommand = lambda *args: ColorOptVars(3),
+		dragCommand = lambda *args: PreviewColors(),
+		field = True,
+		maxValue = 1.0,
+		minValue = 0.0,
+		precision = 2,
+		columnWidth = [1,COLUMN_01],
+		enable = visStateMode,
+	)
+
 	# Swap Colors
 	def SwapColors():
 		# Store Main
-		tempColor = colorMain.getRgbValue()
-		tempAlpha = alphaMain.getValue()
+		tempColor = cmds.colorSliderGrp(colorMain, query = True, rgbValue = True)
+		tempAlpha = cmds.floatSliderGrp(alphaMain, query = True, value = True)
 		# Set Main
-		colorMain.setRgbValue(colorSub.getRgbValue())
-		alphaMain.setValue(alphaSub.getValue())
+		cmds.colorSliderGrp(colorMain, edit = True, rgbValue = cmds.colorSliderGrp(colorSub, query = True, rgbValue = True))
+		cmds.floatSliderGrp(alphaMain, edit = True, value = cmds.floatSliderGrp(alphaSub, query = True, value = True))
 		# Set Sub
-		colorSub.setRgbValue(tempColor)
-		alphaSub.setValue(tempAlpha)
+		cmds.colorSliderGrp(colorSub, edit = True, rgbValue = tempColor)
+		cmds.floatSliderGrp(alphaSub, edit = True, value = tempAlpha)
 		# Set Opt Vars
 		ColorOptVars(0)
 		ColorOptVars(1)
 		ColorOptVars(2)
 		ColorOptVars(3)
-		
+
 	# Color Opt Vars
 	def ColorOptVars(varType):
 		if varType == 0:
-			pm.optionVar["colorMain_VCB"] = colorMain.getRgbValue()
+			optionVar["colorMain_VCB"] = cmds.colorSliderGrp(colorMain, query = True, rgbValue = True)
 		elif varType == 1:
-			pm.optionVar["alphaMain_VCB"] = alphaMain.getValue()
+			optionVar["alphaMain_VCB"] = cmds.floatSliderGrp(alphaMain, query = True, value = True)
 		elif varType == 2:
-			pm.optionVar["colorSub_VCB"] = colorSub.getRgbValue()
+			optionVar["colorSub_VCB"] = cmds.colorSliderGrp(colorSub, query = True, rgbValue = True)
 		elif varType == 3:
-			pm.optionVar["alphaSub_VCB"] = alphaSub.getValue()
-		
+			optionVar["alphaSub_VCB"] = cmds.floatSliderGrp(alphaSub, query = True, value = True)
+
+		PreviewColors()
+
+	# Live Preview
+	def PreviewActive():
+		return "VCB.VCB_preview" in sys.modules and Preview().VCB_PreviewActive()
+
+	def PreviewColors():
+		if not optionVar["livePreview_VCB"]:
+			return
+
+		import VCB.VCB_engine as engine
+
+		# The sliders are ahead of the opt vars while dragging
+		settings = engine.Settings.fromOptionVars(optionVar)
+		settings.colorMain = tuple(cmds.colorSliderGrp(colorMain, query = True, rgbValue = True))
+		settings.alphaMain = cmds.floatSliderGrp(alphaMain, query = True, value = True)
+		settings.colorSub = tuple(cmds.colorSliderGrp(colorSub, query = True, rgbValue = True))
+		settings.alphaSub = cmds.floatSliderGrp(alphaSub, query = True, value = True)
+		settings.opacity = cmds.floatSliderGrp(sliderBlendOpacity, query = True, value = True)
+
+		Preview().VCB_UpdatePreview(settings, Core().VCB_GetPreviewTargets)
+
 	# Add Gradient Controls
-	with frameGradientOptions:
-		radioGrpGradBounds = pm.radioButtonGrp(
-			label = "Gradient Bounds:",
-			numberOfRadioButtons = 2,
-			label1 = "Mesh Bounds",
-			label2 = "Point to Point",
-			select = pm.optionVar["gradientBounds_VCB"],
-			changeCommand = lambda *args: GradientOptVars(0),
-			vertical = False,
-			columnWidth = [1,COLUMN_01],
-		)
-		radioGrpGradDirection = pm.radioButtonGrp(
-			label = "Gradient Direction:",
-			numberOfRadioButtons = 3,
-			label1 = "X",
-			label2 = "Y",
-			label3 = "Z",
-			select = pm.optionVar["gradientDirection_VCB"],
-			changeCommand = lambda *args: GradientOptVars(1),
-			vertical = False,
-			columnWidth = [1,COLUMN_01],
-			enable = visStateBounds,
-		)
+	cmds.setParent(frameGradientOptions)
+	radioGrpGradBounds = cmds.radioButtonGrp(
+		label = "Gradient Bounds:",
+		numberOfRadioButtons = 4,
+		label1 = "Mesh Bounds",
+		label2 = "Point to Point",
+		label3 = "Selection",
+		label4 = "Surface",
+		select = optionVar["gradientBounds_VCB"],
+		changeCommand = lambda *args: GradientOptVars(0),
+		vertical = False,
+		columnWidth = [1,COLUMN_01],
+	)
+	radioGrpGradDirection = cmds.radioButtonGrp(
+		label = "Gradient Direction:",
+		numberOfRadioButtons = 3,
+		label1 = "X",
+		label2 = "Y",
+		label3 = "Z",
+		select = optionVar["gradientDirection_VCB"],
+		changeCommand = lambda *args: GradientOptVars(1),
+		vertical = False,
+		columnWidth = [1,COLUMN_01],
+		enable = visStateBounds,
+	)
+	radioGrpMultiMesh = cmds.radioButtonGrp(
+		label = "Multiple Meshes:",
+		numberOfRadioButtons = 2,
+		label1 = "Per Mesh",
+		label2 = "Combined",
+		select = optionVar["multiMeshBounds_VCB"],
+		changeCommand = lambda *args: GradientOptVars(2),
+		vertical = False,
+		columnWidth = [1,COLUMN_01],
+		enable = visStateBounds,
+		annotation = "Use each mesh's own bounds or the bounds of all selected meshes.",
+	)
+	sliderFalloffRadius = cmds.floatSliderGrp(
+		label = "Falloff Radius:",
+		value = optionVar["falloffRadius_VCB"],
+		changeCommand = lambda *args: GradientOptVars(4),
+		field = True,
+		maxValue = 10.0,
+		minValue = 0.0,
+		fieldMaxValue = 100000.0,
+		precision = 3,
+		columnWidth = [1,COLUMN_01],
+		enable = optionVar["gradientBounds_VCB"] in (3, 4),
+		annotation = "Distance from the selected components where the gradient reaches the sub color. Surface measures it along the mesh.",
+	)
+	radioGrpGradRamp = cmds.radioButtonGrp(
+		label = "Gradient Colors:",
+		numberOfRadioButtons = 2,
+		label1 = "Main to Sub",
+		label2 = "Ramp",
+		select = optionVar["gradientRamp_VCB"],
+		changeCommand = lambda *args: GradientOptVars(3),
+		vertical = False,
+		columnWidth = [1,COLUMN_01],
+	)
 	
-	# Gradient Opt Vars
-	def GradientOptVars(varType):
+	# Ramp Controls
+	visStateRamp = optionVar["gradientRamp_VCB"] == 2
+	optionMenuRampInterp = cmds.optionMenuGrp(
+		label = "Interpolation:",
+		changeCommand = lambda *args: RampOptVars(0),
+		columnWidth = [1,COLUMN_01],
+		enable = visStateRamp,
+	)
+	for label in ("Linear", "Smooth", "Constant"):
+		cmds.menuItem(label = label)
+	cmds.optionMenuGrp(optionMenuRampInterp, edit = True, select = optionVar["rampInterpolation_VCB"])
+	
+	listRampStops = cmds.textScrollList(
+		annotation = "Ramp stops as position, RGB and alpha.",
+		height = 80,
+		enable = visStateRamp,
+	)
+	hLayoutRampStops = cmds.rowLayout(numberOfColumns = 3, columnAttach = [(2, "left", MARGIN_SM), (3, "left", MARGIN_SM)], enable = visStateRamp)
+	fieldStopPosition = cmds.floatField(
+		annotation = "Position of the new stop, 0 is the main end of the gradient and 1 the sub end.",
+		value = 0.5,
+		minValue = 0.0,
+		maxValue = 1.0,
+		precision = 2,
+		width = COLUMN_01,
+	)
+	cmds.button(
+		annotation = "Add a stop with the main color and alpha at the position.",
+		label = "Add Stop",
+		command = lambda *args: RampOptVars(1)
+	)
+	cmds.button(
+		annotation = "Remove the selected stop.",
+		label = "Remove Stop",
+		command = lambda *args: RampOptVars(2)
+	)
+	cmds.setParent("..")
+	
+	# Ramp Opt Vars
+	def RampOptVars(varType):
+		stops = [optionVar["rampStops_VCB"][i:i + 5] for i in range(0, len(optionVar["rampStops_VCB"]), 5)]
+		
 		if varType == 0:
-			# Adjust UI and set opt var
-			if radioGrpGradBounds.getSelect() == 2: # Point to Point
-				radioGrpGradDirection.setEnable(False) # Hide
-			else:
-				radioGrpGradDirection.setEnable(True) # Show
-				
-			pm.optionVar["gradientBounds_VCB"] = radioGrpGradBounds.getSelect()
+			optionVar["rampInterpolation_VCB"] = cmds.optionMenuGrp(optionMenuRampInterp, query = True, select = True)
 			
 		elif varType == 1:
-			pm.optionVar["gradientDirection_VCB"] = radioGrpGradDirection.getSelect()
-	
-	# Add the Bottom Buttons
-	with formContainer:
-		with pm.horizontalLayout(spacing=MARGIN_SM) as hLayoutBottomButtons:
-			btnApplyAndClose = pm.button(
-				annotation = 'Apply vertex color and close the tool',
-				label = 'Apply Color', 
-				command = lambda *args: core.VCB_ApplyAndClose(winVCB)
-			)
-			btnApply = pm.button(
-				annotation = 'Apply vertex color',
-				label = 'Apply', 
-				command = lambda *args: core.VCB_Apply()
-			)
-			btnClose = pm.button(
-				annotation = 'Closes the window.',
-				label = 'Close', 
-				command = lambda *args: pm.deleteUI(winVCB)
-			)
+			position = cmds.floatField(fieldStopPosition, query = True, value = True)
+			color = cmds.colorSliderGrp(colorMain, query = True, rgbValue = True)
+			stops.append([position] + list(color) + [cmds.floatSliderGrp(alphaMain, query = True, value = True)])
 			
-			hLayoutBottomButtons.redistribute()
+		elif varType == 2:
+			selected = cmds.textScrollList(listRampStops, query = True, selectIndexedItem = True) or []
+			if len(stops) > 1:
+				stops = [stop for i, stop in enumerate(stops) if i + 1 not in selected]
+		
+		stops.sort(key = lambda stop: stop[0])
+		optionVar["rampStops_VCB"] = [float(value) for stop in stops for value in stop]
+		ListRampStops()
+		
+		if PreviewActive():
+			PreviewColors()
 	
+	def ListRampStops():
+		values = optionVar["rampStops_VCB"]
+		cmds.textScrollList(listRampStops, edit = True, removeAll = True)
+		for i in range(0, len(values), 5):
+			cmds.textScrollList(listRampStops, edit = True, append = "%.2f    %.2f %.2f %.2f    %.2f" % tuple(values[i:i + 5]))
 	
+	ListRampStops()
+
+	# Gradient Opt Vars
+	def GradientOptVars(varType):
+		if varType == 0:
+			# Adjust UI and set opt var
+			gradientBounds = cmds.radioButtonGrp(radioGrpGradBounds, query = True, select = True)
+			cmds.radioButtonGrp(radioGrpGradDirection, edit = True, enable = gradientBounds == 1) # Show or Hide
+			cmds.radioButtonGrp(radioGrpMultiMesh, edit = True, enable = gradientBounds == 1)
+			cmds.floatSliderGrp(sliderFalloffRadius, edit = True, enable = gradientBounds in (3, 4))
+
+			optionVar["gradientBounds_VCB"] = cmds.radioButtonGrp(radioGrpGradBounds, query = True, select = True)
+
+		elif varType == 1:
+			optionVar["gradientDirection_VCB"] = cmds.radioButtonGrp(radioGrpGradDirection, query = True, select = True)
+
+		elif varType == 2:
+			optionVar["multiMeshBounds_VCB"] = cmds.radioButtonGrp(radioGrpMultiMesh, query = True, select = True)
+
+		elif varType == 3:
+			# Adjust UI and set opt var
+			ramp = cmds.radioButtonGrp(radioGrpGradRamp, query = True, select = True) == 2
+			cmds.optionMenuGrp(optionMenuRampInterp, edit = True, enable = ramp) # Show or Hide
+			cmds.textScrollList(listRampStops, edit = True, enable = ramp)
+			cmds.rowLayout(hLayoutRampStops, edit = True, enable = ramp)
+
+			optionVar["gradientRamp_VCB"] = cmds.radioButtonGrp(radioGrpGradRamp, query = True, select = True)
+
+		elif varType == 4:
+			optionVar["falloffRadius_VCB"] = cmds.floatSliderGrp(sliderFalloffRadius, query = True, value = True)
+
+		if PreviewActive():
+			PreviewColors()
+
+	# Add Smooth Controls
+	cmds.setParent(frameSmooth)
+	sliderSmoothIterations = cmds.intSliderGrp(
+		label = "Iterations:",
+		value = optionVar["smoothIterations_VCB"],
+		changeCommand = lambda *args: SmoothOptVars(0),
+		field = True,
+		maxValue = 20,
+		minValue = 1,
+		fieldMaxValue = 1000,
+		columnWidth = [1,COLUMN_01],
+		annotation = "Times every vertex is averaged with its neighbors.",
+	)
+	sliderSmoothStrength = cmds.floatSliderGrp(
+		label = "Strength:",
+		value = optionVar["smoothStrength_VCB"],
+		changeCommand = lambda *args: SmoothOptVars(1),
+		field = True,
+		maxValue = 1.0,
+		minValue = 0.0,
+		precision = 2,
+		columnWidth = [1,COLUMN_01],
+		annotation = "How far each iteration moves a vertex towards the average of its neighbors.",
+	)
+	checkGrpSmoothChannels = cmds.checkBoxGrp(
+		label = "Channels:",
+		numberOfCheckBoxes = 4,
+		labelArray4 = ["R", "G", "B", "A"],
+		valueArray4 = [bool(channel) for channel in optionVar["smoothChannels_VCB"]],
+		changeCommand = lambda *args: SmoothOptVars(2),
+		columnWidth = [1,COLUMN_01],
+	)
+	cmds.button(
+		annotation = "Smooth the vertex colors of the selected meshes or components.",
+		label = "Smooth Colors",
+		command = lambda *args: Core().VCB_Smooth()
+	)
+
+	# Smooth Opt Vars
+	def SmoothOptVars(varType):
+		if varType == 0:
+			optionVar["smoothIterations_VCB"] = cmds.intSliderGrp(sliderSmoothIterations, query = True, value = True)
+		elif varType == 1:
+			optionVar["smoothStrength_VCB"] = cmds.floatSliderGrp(sliderSmoothStrength, query = True, value = True)
+		elif varType == 2:
+			optionVar["smoothChannels_VCB"] = [int(value) for value in cmds.checkBoxGrp(checkGrpSmoothChannels, query = True, valueArray4 = True)]
+
+	# Add Channel Pack Controls
+	cmds.setParent(framePack)
+	textPackChannels = []
+	for channel, name in enumerate(CHANNELS):
+		cmds.rowLayout(numberOfColumns = 3, adjustableColumn = 1, columnAttach = [(2, "left", MARGIN_SM), (3, "left", MARGIN_SM)])
+		textPackChannels.append(cmds.text(align = "left"))
+		cmds.button(
+			annotation = "Bake the current settings into the %s channel." % name,
+			label = "Set",
+			command = lambda *args, channel = channel: PackOptVars(channel, True)
+		)
+		cmds.button(
+			annotation = "Leave the %s channel as it is." % name,
+			label = "Clear",
+			command = lambda *args, channel = channel: PackOptVars(channel, False)
+		)
+		cmds.setParent("..")
+	cmds.button(
+		annotation = "Bake every set channel into the selected meshes with one write per mesh.",
+		label = "Bake Channels",
+		command = lambda *args: Core().VCB_BakePacked()
+	)
+
+	# Channel Pack Opt Vars
+	def PackOptVars(channel, store):
+		import VCB.VCB_engine as engine
+
+		packed = list(optionVar["packedChannels_VCB"])
+		packed[channel] = json.dumps(engine.Settings.fromOptionVars(optionVar).asDict()) if store else ""
+		optionVar["packedChannels_VCB"] = packed
+		ListPackChannels()
+
+	def ListPackChannels():
+		for name, text, value in zip(CHANNELS, textPackChannels, optionVar["packedChannels_VCB"]):
+			label = "%s:  Unchanged" % name
+			if value:
+				settings = json.loads(value)
+				if settings["mode"] == 1:
+					label = "%s:  Standard" % name
+				else:
+					bounds = ("Mesh Bounds " + "XYZ"[settings["gradientDirection"] - 1], "Point to Point", "Selection", "Surface")[settings["gradientBounds"] - 1]
+					label = "%s:  %s%s" % (name, bounds, ", Ramp" if settings["ramp"] else "")
+			cmds.text(text, edit = True, label = label)
+	ListPackChannels()
+
+	# Add the Bottom Buttons, split evenly across the window
+	hLayoutBottomButtons = cmds.formLayout(numberOfDivisions = 3, parent = formContainer)
+	btnApplyAndClose = cmds.button(
+		annotation = 'Apply vertex color and close the tool',
+		label = 'Apply Color',
+		command = lambda *args: Core().VCB_ApplyAndClose(winVCB)
+	)
+	btnApply = cmds.button(
+		annotation = 'Apply vertex color',
+		label = 'Apply',
+		command = lambda *args: Core().VCB_ApplyFromOptions()
+	)
+	btnClose = cmds.button(
+		annotation = 'Closes the window.',
+		label = 'Close',
+		command = lambda *args: cmds.deleteUI(winVCB)
+	)
+
+	for column, button in enumerate((btnApplyAndClose, btnApply, btnClose)):
+		cmds.formLayout(
+			hLayoutBottomButtons,
+			edit = True,
+			attachForm = [(button, "top", 0), (button, "bottom", 0)],
+			attachPosition = [(button, "left", MARGIN_SM // 2, column), (button, "right", MARGIN_SM // 2, column + 1)],
+		)
+
+
 	# Format the UI Containers
-	pm.formLayout(
+	cmds.formLayout(
 		formMain,
 		edit = True,
 		attachForm = [
@@ -279,14 +764,20 @@ def createUI():
 			(frameColors, "right", 0),
 			(frameGradientOptions, "left", 0),
 			(frameGradientOptions, "right", 0),
+			(frameSmooth, "left", 0),
+			(frameSmooth, "right", 0),
+			(framePack, "left", 0),
+			(framePack, "right", 0),
 		],
 		attachControl = [
 			(frameColors, "top", MARGIN_MD, frameSettings),
 			(frameGradientOptions, "top", MARGIN_MD, frameColors),
+			(frameSmooth, "top", MARGIN_MD, frameGradientOptions),
+			(framePack, "top", MARGIN_MD, frameSmooth),
 		]
 	)
-	
-	pm.formLayout(
+
+	cmds.formLayout(
 		formContainer,
 		edit = True,
 		attachForm = [
@@ -297,4 +788,7 @@ def createUI():
 			(hLayoutBottomButtons, "left", 0),
 			(hLayoutBottomButtons, "right", 0),
 		]
-	)
\ No newline at end of file
+	)
+
+	cmds.showWindow(winVCB)
+	return winVCB
@@ -0,0 +1,208 @@
+"""
+
+	Background apply for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Usage
+# applier = VCB_async.AsyncApplier()
+# future = applier.submit(adapters, settings, commit = WriteColors)
+# future.add_done_callback(...)		# Runs on the main thread once the colors are written
+#
+# Headless, with the stand-in event loop in place of Maya's idle queue:
+# applier = VCB_async.AsyncApplier(loop = VCB_async.EventLoop())
+# applier.loop.runUntil(applier.submit(adapters, settings))
+
+## Table of Contents
+# Initialization
+# Event Loop
+# Snapshots
+# Async Applier
+
+## Imports
+import concurrent.futures
+import queue
+import threading
+import time
+
+import numpy as np
+
+import VCB.VCB_engine as engine
+import VCB.VCB_mesh as vmesh
+
+try:
+	import maya.utils as mayaUtils
+except ImportError: # Running outside of Maya
+	mayaUtils = None
+
+## Initialization
+
+# Threads computing colors. Jobs run one at a time, every mesh of a job can
+# still be computed on a thread of its own
+JOB_WORKERS = 1
+
+## Event Loop
+
+# Stand-in for Maya's idle queue. Callables posted from any thread run on the
+# thread that calls process
+class EventLoop(object):
+	def __init__(self):
+		self._queue = queue.Queue()
+
+	def post(self, func):
+		self._queue.put(func)
+
+	# Run everything posted so far, waiting up to timeout for the first call.
+	# Returns the number of calls run
+	def process(self, timeout = 0.0):
+		count = 0
+		try:
+			func = self._queue.get(timeout = timeout) if timeout else self._queue.get_nowait()
+			while True:
+				func()
+				count += 1
+				func = self._queue.get_nowait()
+		except queue.Empty:
+			return count
+
+	# Process posted calls until the future is done
+	def runUntil(self, future, timeout = None):
+		deadline = None if timeout is None else time.monotonic() + timeout
+		while not future.done():
+			if deadline is not None and time.monotonic() > deadline:
+				raise concurrent.futures.TimeoutError()
+			self.process(timeout = 0.05)
+		return future
+
+## Snapshots
+
+# In-memory copy of the arrays an apply reads from a mesh, taken on the main
+# thread so the worker never touches the scene
+def VCB_Snapshot(adapter, settings):
+	if settings.mode == 2: # Gradient
+		positions = adapter.getPositions()
+	else:
+		positions = np.zeros((adapter.numVertices(), 3))
+	colors, hasColor = adapter.readColors()
+
+	faceCounts = faceIndices = None
+	if settings.mode == 2 and settings.gradientBounds == 4: # Surface
+		faceCounts, faceIndices = adapter.getFaceVertices()
+
+	return vmesh.MemoryMesh(positions, colors, name = adapter.name, faceCounts = faceCounts, faceIndices = faceIndices, hasColor = hasColor)
+
+## Async Applier
+
+# One submitted apply
+class ApplyJob(object):
+	def __init__(self, generation, adapters, snapshots, commit, isCurrent):
+		self.generation = generation
+		self.adapters = adapters
+		self.snapshots = snapshots
+		self.commit = commit
+		self.isCurrent = isCurrent
+		self.future = concurrent.futures.Future()
+
+# Computes applies on a worker thread and writes them back on the main thread.
+# The meshes are snapshotted when a job is submitted, the worker computes from
+# the snapshots with the engine's array math, which releases the GIL, and the
+# write is posted back through scheduler (Maya's executeDeferred by default).
+# Each submit supersedes the jobs before it, a superseded job's future is
+# cancelled instead of written
+class AsyncApplier(object):
+	def __init__(self, scheduler = None, loop = None, workers = JOB_WORKERS):
+		self.loop = loop
+		if scheduler is None:
+			if loop is None and mayaUtils is None:
+				self.loop = EventLoop()
+			scheduler = self.loop.post if self.loop is not None else mayaUtils.executeDeferred
+		self.scheduler = scheduler
+
+		self._executor = concurrent.futures.ThreadPoolExecutor(max_workers = workers, thread_name_prefix = "VCB")
+		self._lock = threading.Lock()
+		self._generation = 0
+
+	# Start an apply and return its future. Must be called on the main thread.
+	# Once computed, commit(adapter, indices, colors) is called for every mesh on
+	# the main thread, unless the job was superseded or isCurrent() returns
+	# False by then. weightsList works as for VCB_ApplyMeshes. The future's
+	# result is the written [(adapter, indices, colors)]
+	def submit(self, adapters, settings, indicesList = None, anchorsList = None, commit = engine.VCB_Commit, isCurrent = None, weightsList = None):
+		if indicesList is None:
+			indicesList = [None] * len(adapters)
+		snapshots = [VCB_Snapshot(adapter, settings) for adapter in adapters]
+
+		with self._lock:
+			self._generation += 1
+			job = ApplyJob(self._generation, adapters, snapshots, commit, isCurrent)
+
+		work = self._executor.submit(self._compute, job, settings, indicesList, anchorsList, weightsList)
+		work.add_done_callback(lambda work: self.scheduler(lambda: self._finish(job, work)))
+		return job.future
+
+	# Drop every job that hasn't been written yet
+	def supersede(self):
+		with self._lock:
+			self._generation += 1
+
+	def isStale(self, job):
+		return job.generation != self._generation or job.future.cancelled()
+
+	def shutdown(self, wait = True):
+		self.supersede()
+		self._executor.shutdown(wait = wait)
+
+	# Worker thread. Returns the colors per snapshot, or None once superseded
+	def _compute(self, job, settings, indicesList, anchorsList, weightsList):
+		results = []
+		def Collect(snapshot, indices, colors):
+			results.append((indices, colors))
+
+		if anchorsList is not None:
+			if weightsList is None:
+				weightsList = [None] * len(job.snapshots)
+			for snapshot, indices, anchorIndices, weights in zip(job.snapshots, indicesList, anchorsList, weightsList):
+				if self.isStale(job):
+					return None
+				engine.VCB_ApplyMesh(snapshot, settings, indices, anchorIndices, commit = Collect, weights = weights)
+		else:
+			if self.isStale(job):
+				return None
+			engine.VCB_ApplyMeshes(job.snapshots, settings, indicesList, processes = False, commit = Collect, weightsList = weightsList)
+			# A newer job came in while this one computed
+			if self.isStale(job):
+				return None
+		return results
+
+	# Main thread. Writes the computed colors of a job that is still current
+	def _finish(self, job, work):
+		if work.exception() is not None:
+			if not job.future.cancelled():
+				job.future.set_exception(work.exception())
+			return
+
+		results = work.result()
+		if results is None or self.isStale(job) or (job.isCurrent is not None and not job.isCurrent()):
+			job.future.cancel()
+			return
+
+		# A mesh whose vertex count changed since the snapshot can't take the colors
+		for adapter, snapshot in zip(job.adapters, job.snapshots):
+			if adapter.numVertices() != snapshot.numVertices():
+				job.future.set_exception(ValueError("%s changed while its colors were computed." % adapter.name))
+				return
+
+		try:
+			written = []
+			for adapter, (indices, colors) in zip(job.adapters, results):
+				job.commit(adapter, indices, colors)
+				written.append((adapter, indices, colors))
+		except Exception as error:
+			job.future.set_exception(error)
+		else:
+			job.future.set_result(written)
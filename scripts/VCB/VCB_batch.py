@@ -0,0 +1,132 @@
+"""
+
+	Batch command line for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Usage
+# python -m VCB.VCB_batch assets/ --mode gradient --direction y --main 1 0 0 --sub 0 0 1 --output-dir baked/
+# python -m VCB.VCB_batch rock.ply --mode gradient --bounds points --anchors 12 873
+# python -m VCB.VCB_batch rock.ply --mode gradient --stop 0 1 0 0 1 --stop 0.5 1 1 0 1 --stop 1 0 0 1 1
+
+## Imports
+import argparse
+import concurrent.futures
+import os
+import sys
+import time
+
+import VCB.VCB_engine as engine
+import VCB.VCB_kernel as kernel
+import VCB.VCB_meshFiles as meshFiles
+
+## Initialization
+
+MODES = {"standard": 1, "gradient": 2}
+BLEND_MODES = dict((name, blendMode) for blendMode, name in kernel.VCB_BlendModes().items())
+BOUNDS = {"mesh": 1, "points": 2, "selection": 3}
+DIRECTIONS = {"x": 1, "y": 2, "z": 3}
+INTERPOLATIONS = {"linear": kernel.INTERPOLATION_LINEAR, "smooth": kernel.INTERPOLATION_SMOOTH, "constant": kernel.INTERPOLATION_CONSTANT}
+
+## Functions
+
+# Every mesh file in the given files and directories
+def VCB_GatherFiles(paths):
+	files = []
+	for path in paths:
+		if os.path.isdir(path):
+			for name in sorted(os.listdir(path)):
+				if os.path.splitext(name)[1].lower() in meshFiles.FILE_EXTENSIONS:
+					files.append(os.path.join(path, name))
+		else:
+			files.append(path)
+	return files
+
+# Worker entry point, colors one file and returns its vertex count and time
+def _VCB_BatchJob(job):
+	path, outPath, settings, anchorIndices, chunkSize = job
+	start = time.time()
+	count = meshFiles.VCB_ApplyFile(path, settings, outPath, anchorIndices, chunkSize)
+	return path, count, time.time() - start
+
+def VCB_ParseArgs(argv = None):
+	parser = argparse.ArgumentParser(prog = "VCB_batch", description = "Apply Vertex Color Bench colors to PLY and OBJ files without Maya.")
+	parser.add_argument("paths", nargs = "+", help = "Mesh files or directories of mesh files.")
+	parser.add_argument("--output-dir", help = "Write colored files here instead of overwriting the inputs.")
+	parser.add_argument("--mode", choices = sorted(MODES), default = "standard")
+	parser.add_argument("--blend", choices = sorted(BLEND_MODES), default = "replace")
+	parser.add_argument("--opacity", type = float, default = 1.0, help = "How much of the blend is kept over the file's colors.")
+	parser.add_argument("--channels", default = "rgba", help = "RGBA channels the blend writes, e.g. rgb or a.")
+	parser.add_argument("--bounds", choices = sorted(BOUNDS), default = "mesh", help = "Mesh bounds, point to point or distance from seed vertices.")
+	parser.add_argument("--direction", choices = sorted(DIRECTIONS), default = "x", help = "Mesh bounds axis.")
+	parser.add_argument("--anchors", nargs = 2, type = int, metavar = ("FROM", "TO"), help = "Vertex indices for point to point.")
+	parser.add_argument("--seeds", nargs = "+", type = int, metavar = "INDEX", help = "Seed vertex indices for selection bounds.")
+	parser.add_argument("--radius", type = float, default = 1.0, help = "Distance from the seeds that reaches the sub color.")
+	parser.add_argument("--main", nargs = 3, type = float, default = [1.0, 1.0, 1.0], metavar = ("R", "G", "B"))
+	parser.add_argument("--main-alpha", type = float, default = 1.0)
+	parser.add_argument("--sub", nargs = 3, type = float, default = [1.0, 1.0, 1.0], metavar = ("R", "G", "B"))
+	parser.add_argument("--sub-alpha", type = float, default = 1.0)
+	parser.add_argument("--stop", nargs = 5, type = float, action = "append", metavar = ("POS", "R", "G", "B", "A"), help = "Ramp stop, repeat for more stops. Replaces --main and --sub in gradients.")
+	parser.add_argument("--interpolation", choices = sorted(INTERPOLATIONS), default = "linear", help = "Ramp interpolation between stops.")
+	parser.add_argument("--workers", type = int, default = None, help = "Worker processes, every core by default.")
+	parser.add_argument("--chunk-size", type = int, default = meshFiles.CHUNK_SIZE, help = "Vertices per streamed chunk.")
+	return parser.parse_args(argv)
+
+def main(argv = None):
+	args = VCB_ParseArgs(argv)
+
+	settings = engine.Settings(
+		mode = MODES[args.mode],
+		blendMode = BLEND_MODES[args.blend],
+		opacity = args.opacity,
+		blendChannels = [channel in args.channels.lower() for channel in "rgba"],
+		colorMain = args.main,
+		alphaMain = args.main_alpha,
+		colorSub = args.sub,
+		alphaSub = args.sub_alpha,
+		gradientBounds = BOUNDS[args.bounds],
+		gradientDirection = DIRECTIONS[args.direction],
+		ramp = kernel.Ramp(args.stop, INTERPOLATIONS[args.interpolation]) if args.stop else None,
+		falloffRadius = args.radius,
+	)
+	if settings.mode == 2 and settings.gradientBounds == 2 and args.anchors is None:
+		sys.stderr.write("Point to point gradients need --anchors.\n")
+		return 2
+	if settings.mode == 2 and settings.gradientBounds == 3 and not args.seeds:
+		sys.stderr.write("Selection gradients need --seeds.\n")
+		return 2
+	anchorIndices = args.seeds if settings.gradientBounds == 3 else args.anchors
+
+	files = VCB_GatherFiles(args.paths)
+	if args.output_dir and not os.path.isdir(args.output_dir):
+		os.makedirs(args.output_dir)
+
+	jobs = []
+	for path in files:
+		outPath = os.path.join(args.output_dir, os.path.basename(path)) if args.output_dir else None
+		jobs.append((path, outPath, settings, anchorIndices, args.chunk_size))
+
+	# Files are spread across worker processes, each one streams its own chunks
+	failed = 0
+	start = time.time()
+	with concurrent.futures.ProcessPoolExecutor(max_workers = args.workers) as pool:
+		futures = dict((pool.submit(_VCB_BatchJob, job), job[0]) for job in jobs)
+		for future in concurrent.futures.as_completed(futures):
+			try:
+				path, count, seconds = future.result()
+			except Exception as error:
+				failed += 1
+				sys.stderr.write("%s: %s\n" % (futures[future], error))
+				continue
+			print("%s: %d vertices in %.3fs" % (path, count, seconds))
+
+	print("VCB: %d of %d files in %.3fs" % (len(jobs) - failed, len(jobs), time.time() - start))
+	return 1 if failed else 0
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+
+	Benchmarks for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Usage
+# python -m VCB.VCB_bench --output results.json
+# python -m VCB.VCB_bench --sizes 1000 100000 --baseline baseline.json
+# python -m VCB.VCB_bench --baseline baseline.json --update-baseline
+
+## Imports
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import VCB.VCB_async as vasync
+import VCB.VCB_cache as cache
+import VCB.VCB_engine as engine
+import VCB.VCB_kernel as kernel
+import VCB.VCB_mesh as vmesh
+
+## Initialization
+
+SIZES = (1000, 10000, 100000, 1000000, 5000000)
+
+MODES = {1: "standard", 2: "gradient"}
+BOUNDS = {1: "mesh", 2: "points", 3: "selection", 4: "surface"}
+
+# Ways of applying a case. Chunked and async run the replace blend only, the
+# other blends cost the same on every path
+PATHS = ("apply", "chunked", "async")
+
+# Opacity and channel mask of the masked blend cases
+BLEND_OPACITY = 0.5
+BLEND_CHANNELS = (True, True, True, False)
+
+# Seed vertices of the Selection and Surface cases, Point to Point takes the first two
+SEED_COUNT = 16
+
+# A run fails when its vertices/sec drops more than this below the baseline
+TOLERANCE = 0.25
+
+## Meshes
+
+# Random mesh with a fixed seed so every run colors the same vertices. The
+# vertices are laid out as a jittered grid of quads for the Surface cases,
+# any left over past the last full row have no faces
+def VCB_SyntheticMesh(numVertices, seed = 0):
+	random = np.random.RandomState(seed)
+	side = max(int(np.sqrt(numVertices)), 2)
+	grid = np.arange(numVertices)
+	positions = np.column_stack([grid % side, grid // side, np.zeros(numVertices)]) * (20.0 / side) - 10.0
+	positions += random.uniform(-0.25, 0.25, (numVertices, 3)) * (20.0 / side)
+	colors = random.uniform(0.0, 1.0, (numVertices, 4)).astype(np.float32)
+
+	rows = min(side, numVertices // side)
+	corners = (np.arange(rows - 1)[:, None] * side + np.arange(side - 1)[None, :]).ravel()
+	faceIndices = np.column_stack([corners, corners + 1, corners + side + 1, corners + side]).ravel()
+	faceCounts = np.full(len(corners), 4, dtype = np.int64)
+	return vmesh.MemoryMesh(positions, colors, name = "synthetic%d" % numVertices, faceCounts = faceCounts, faceIndices = faceIndices)
+
+# Anchor vertices of every case, spread along the mesh. The first two are
+# the Point to Point anchors, all of them are the Selection and Surface seeds
+def VCB_SeedIndices(mesh, count = SEED_COUNT):
+	return np.unique(np.linspace(0, mesh.numVertices() - 1, count).astype(np.int64))
+
+## Benchmarks
+
+# Name of one benchmark case, used as its key in results and baselines.
+# Standard cases have no bounds, apply cases no path prefix
+def VCB_CaseName(numVertices, mode, blendMode, gradientBounds = None, masked = False, path = "apply"):
+	parts = [MODES[mode], kernel.VCB_BlendModes()[blendMode]]
+	if gradientBounds is not None:
+		parts.append(BOUNDS[gradientBounds])
+	if masked:
+		parts.append("masked")
+	if path != "apply":
+		parts.insert(0, path)
+	return "%s/%d" % ("/".join(parts), numVertices)
+
+# (path, mode, blend mode, gradient bounds, masked) of every case. Only
+# gradients run once per bounds, Standard ignores them
+def VCB_Cases():
+	for path in PATHS:
+		blendModes = sorted(kernel.VCB_BlendModes()) if path == "apply" else [kernel.BLEND_REPLACE]
+		for mode, blendMode in itertools.product(sorted(MODES), blendModes):
+			for gradientBounds in (sorted(BOUNDS) if mode == 2 else [None]):
+				for masked in ((False, True) if path == "apply" else (False,)):
+					yield path, mode, blendMode, gradientBounds, masked
+
+# Settings of one case
+def VCB_CaseSettings(mode, blendMode, gradientBounds = None, masked = False):
+	return engine.Settings(mode = mode, blendMode = blendMode, colorMain = (1.0, 0.5, 0.0), alphaMain = 1.0,
+		colorSub = (0.0, 0.5, 1.0), alphaSub = 0.5, gradientBounds = gradientBounds or 1, gradientDirection = 2, falloffRadius = 10.0,
+		opacity = BLEND_OPACITY if masked else 1.0, blendChannels = BLEND_CHANNELS if masked else (True, True, True, True))
+
+# Time one case. Returns the best of repeat runs and the peak memory of a
+# separate traced run. path picks the engine's direct, chunked or async apply
+def VCB_BenchCase(mesh, settings, repeat = 3, path = "apply"):
+	anchorIndices = VCB_SeedIndices(mesh)
+	applier = None
+
+	if path == "chunked":
+		def Apply():
+			engine.VCB_ApplyChunked([mesh], settings, anchorsList = [anchorIndices])
+	elif path == "async":
+		applier = vasync.AsyncApplier(loop = vasync.EventLoop())
+		def Apply():
+			applier.loop.runUntil(applier.submit([mesh], settings, anchorsList = [anchorIndices])).result()
+	else:
+		def Apply():
+			engine.VCB_ApplyMesh(mesh, settings, anchorIndices = anchorIndices)
+
+	try:
+		timings = []
+		for i in range(repeat):
+			start = time.perf_counter()
+			Apply()
+			timings.append(time.perf_counter() - start)
+
+		tracemalloc.start()
+		Apply()
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+	finally:
+		if applier is not None:
+			applier.shutdown()
+
+	seconds = min(timings)
+	return {
+		"vertices": mesh.numVertices(),
+		"seconds": seconds,
+		"verticesPerSecond": mesh.numVertices() / seconds if seconds > 0 else float("inf"),
+		"peakMemoryBytes": peak,
+	}
+
+# Run every path, mode, blend, bounds and mask combination for each mesh size. The result
+# cache is off throughout, repeats of a case would otherwise only time lookups
+def VCB_RunBenchmarks(sizes = SIZES, repeat = 3, log = None):
+	resultCache = cache.VCB_GetCache()
+	limit = resultCache.limit
+	resultCache.setLimit(0)
+	try:
+		return _VCB_RunBenchmarks(sizes, repeat, log)
+	finally:
+		resultCache.setLimit(limit)
+
+def _VCB_RunBenchmarks(sizes, repeat, log):
+	results = {}
+	for numVertices in sizes:
+		mesh = VCB_SyntheticMesh(numVertices)
+		for path, mode, blendMode, gradientBounds, masked in VCB_Cases():
+			settings = VCB_CaseSettings(mode, blendMode, gradientBounds, masked)
+			name = VCB_CaseName(numVertices, mode, blendMode, gradientBounds, masked, path)
+			results[name] = VCB_BenchCase(mesh, settings, repeat, path)
+			if log:
+				log(VCB_FormatResult(name, results[name]))
+	return results
+
+# Time one blend mode on its own over (N,4) colors, best of repeat runs, with
+# the peak memory of a separate traced run
+def VCB_BenchBlendCase(baseColors, colors, blendMode, opacity = 1.0, channels = None, repeat = 3):
+	timings = []
+	for i in range(repeat):
+		start = time.perf_counter()
+		kernel.VCB_BlendColors(baseColors, colors, blendMode, opacity, channels)
+		timings.append(time.perf_counter() - start)
+
+	tracemalloc.start()
+	kernel.VCB_BlendColors(baseColors, colors, blendMode, opacity, channels)
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	seconds = min(timings)
+	return {
+		"vertices": len(baseColors),
+		"seconds": seconds,
+		"verticesPerSecond": len(baseColors) / seconds if seconds > 0 else float("inf"),
+		"peakMemoryBytes": peak,
+	}
+
+# Run every registered blend mode at full strength and with the opacity and
+# channel mask, for each size
+def VCB_RunBlendBenchmarks(sizes = SIZES, repeat = 3, log = None):
+	results = {}
+	for numVertices in sizes:
+		random = np.random.RandomState(0)
+		baseColors = random.uniform(0.0, 1.0, (numVertices, 4)).astype(np.float32)
+		colors = random.uniform(0.0, 1.0, (numVertices, 4)).astype(np.float32)
+		for blendMode, blendName in sorted(kernel.VCB_BlendModes().items()):
+			for masked in (False, True):
+				name = "blend/%s%s/%d" % (blendName, "/masked" if masked else "", numVertices)
+				if masked:
+					results[name] = VCB_BenchBlendCase(baseColors, colors, blendMode, BLEND_OPACITY, BLEND_CHANNELS, repeat)
+				else:
+					results[name] = VCB_BenchBlendCase(baseColors, colors, blendMode, repeat = repeat)
+				if log:
+					log(VCB_FormatResult(name, results[name]))
+	return results
+
+def VCB_FormatResult(name, result):
+	return "%-48s %12.0f verts/s %10.4fs %10.1f MB" % (name, result["verticesPerSecond"], result["seconds"], result["peakMemoryBytes"] / 1048576.0)
+
+# Cases whose vertices/sec fell more than tolerance below the baseline
+def VCB_FindRegressions(results, baseline, tolerance = TOLERANCE):
+	regressions = []
+	for name, result in sorted(results.items()):
+		if name not in baseline:
+			continue
+		expected = baseline[name]["verticesPerSecond"]
+		if result["verticesPerSecond"] < expected * (1.0 - tolerance):
+			regressions.append((name, expected, result["verticesPerSecond"]))
+	return regressions
+
+## Command Line
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(prog = "VCB_bench", description = "Benchmark Vertex Color Bench applies on synthetic meshes.")
+	parser.add_argument("--sizes", nargs = "+", type = int, default = list(SIZES), help = "Mesh vertex counts.")
+	parser.add_argument("--repeat", type = int, default = 3, help = "Timed runs per case, the best one is kept.")
+	parser.add_argument("--output", help = "Save the results to this JSON file.")
+	parser.add_argument("--baseline", help = "Fail when a case regresses past this JSON baseline.")
+	parser.add_argument("--tolerance", type = float, default = TOLERANCE, help = "Allowed slowdown against the baseline, 0.25 is 25%%.")
+	parser.add_argument("--update-baseline", action = "store_true", help = "Write the results to the baseline file instead of comparing.")
+	args = parser.parse_args(argv)
+
+	results = VCB_RunBenchmarks(args.sizes, args.repeat, log = print)
+	results.update(VCB_RunBlendBenchmarks(args.sizes, args.repeat, log = print))
+	report = {
+		"python": platform.python_version(),
+		"numpy": np.__version__,
+		"machine": platform.machine(),
+		"results": results,
+	}
+
+	if args.output:
+		with open(args.output, "w") as fileObj:
+			json.dump(report, fileObj, indent = 2, sort_keys = True)
+
+	if args.baseline and args.update_baseline:
+		with open(args.baseline, "w") as fileObj:
+			json.dump(report, fileObj, indent = 2, sort_keys = True)
+		return 0
+
+	if args.baseline:
+		with open(args.baseline) as fileObj:
+			baseline = json.load(fileObj)["results"]
+		regressions = VCB_FindRegressions(results, baseline, args.tolerance)
+		for name, expected, actual in regressions:
+			print("REGRESSION %s: %.0f verts/s, baseline %.0f" % (name, actual, expected))
+		if regressions:
+			return 1
+
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+
+	Result cache for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Usage
+# import VCB.VCB_cache as cache
+# cache.VCB_SetCacheLimit(256 * 1024 * 1024)	# Bytes of colors kept, 0 turns the cache off
+# cache.VCB_CacheStats()						# Hits, misses, evictions and size
+# cache.VCB_ClearCache()
+
+## Table of Contents
+# Initialization
+# Keys
+# Result Cache
+
+## Imports
+import collections
+import hashlib
+import json
+import threading
+
+import numpy as np
+
+## Initialization
+
+# Bytes of computed colors kept by default
+DEFAULT_LIMIT = 256 * 1024 * 1024
+
+## Keys
+
+# Digest of any mix of arrays, settings and plain values. Arrays are hashed
+# with their type and shape so equal bytes of different arrays don't collide
+def VCB_HashKey(*parts):
+	digest = hashlib.sha1()
+	for part in parts:
+		if isinstance(part, np.ndarray):
+			part = np.ascontiguousarray(part)
+			digest.update(("%s%s" % (part.dtype.str, part.shape)).encode("ascii"))
+			digest.update(part.data)
+		elif hasattr(part, "asDict"):
+			digest.update(json.dumps(part.asDict(), sort_keys = True).encode("utf-8"))
+		else:
+			digest.update(repr(part).encode("utf-8"))
+		digest.update(b"|")
+	return digest.hexdigest()
+
+## Result Cache
+
+# Computed color arrays by key, the least recently used are dropped once the
+# arrays go over limit bytes. Locked, background applies share it
+class ResultCache(object):
+	def __init__(self, limit = DEFAULT_LIMIT):
+		self._lock = threading.RLock()
+		self.limit = int(limit)
+		self.nbytes = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self._entries = collections.OrderedDict()
+
+	def __len__(self):
+		return len(self._entries)
+
+	def enabled(self):
+		return self.limit > 0
+
+	# A copy of the colors stored under key, or None
+	def get(self, key):
+		with self._lock:
+			colors = self._entries.get(key)
+			if colors is None:
+				self.misses += 1
+				return None
+			self.hits += 1
+			self._entries.move_to_end(key)
+		return colors.copy()
+
+	def put(self, key, colors):
+		colors = np.array(colors)
+		with self._lock:
+			if key in self._entries:
+				self.nbytes -= self._entries.pop(key).nbytes
+			if colors.nbytes > self.limit:
+				return
+			self._entries[key] = colors
+			self.nbytes += colors.nbytes
+			self._evict()
+
+	def setLimit(self, limit):
+		with self._lock:
+			self.limit = int(limit)
+			self._evict()
+
+	def _evict(self):
+		while self.nbytes > self.limit and self._entries:
+			self.nbytes -= self._entries.popitem(last = False)[1].nbytes
+			self.evictions += 1
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+			self.nbytes = 0
+
+	def resetStats(self):
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def stats(self):
+		lookups = self.hits + self.misses
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"hitRate": self.hits / float(lookups) if lookups else 0.0,
+			"evictions": self.evictions,
+			"entries": len(self._entries),
+			"bytes": self.nbytes,
+			"limit": self.limit,
+		}
+
+_cache = ResultCache()
+
+def VCB_GetCache():
+	return _cache
+
+def VCB_SetCacheLimit(limit):
+	_cache.setLimit(limit)
+
+def VCB_CacheStats():
+	return _cache.stats()
+
+def VCB_ClearCache():
+	_cache.clear()
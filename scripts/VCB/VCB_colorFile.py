@@ -0,0 +1,211 @@
+"""
+
+	Color snapshot files for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Usage
+# import VCB.VCB_colorFile as colorFile
+# colorFile.VCB_ExportColors(adapter, "rock.vcbc")					# Half floats plus positions
+# colorFile.VCB_ExportColors(adapter, "rock.vcbc", undo.PRECISION_UINT8, positions = False)
+# colorFile.VCB_ImportColors(adapter, "rock.vcbc")					# By index, or nearest point when the topology differs
+# colorFile.VCB_ImportColors(lodAdapter, "rock.vcbc", radius = 0.5)
+
+## Table of Contents
+# Initialization
+# File Layout
+# Color File
+# Export
+# Import
+
+## Imports
+import hashlib
+import struct
+
+import numpy as np
+
+import VCB.VCB_engine as engine
+import VCB.VCB_spatial as spatial
+import VCB.VCB_undo as undo
+
+## Initialization
+
+FILE_EXTENSION = ".vcbc"
+
+MAGIC = b"VCBC"
+VERSION = 1
+
+# Magic, version, precision, flags, vertex count, topology digest
+HEADER = struct.Struct("<4sHBBQ20s")
+HEADER_SIZE = 64
+
+# Header flags
+FLAG_HAS_COLOR = 1	# A bit per vertex marks the vertices that have a color
+FLAG_POSITIONS = 2	# Object space float32 positions follow the colors
+
+# Every block starts on this boundary so it can be mapped as its own array
+ALIGNMENT = 16
+
+COLOR_DTYPES = {undo.PRECISION_UINT8: np.uint8, undo.PRECISION_FLOAT16: np.float16}
+
+## File Layout
+
+def _VCB_Align(offset):
+	return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+# Byte offset of every block in a file, plus the file's size
+def VCB_BlockOffsets(count, precision, flags):
+	offsets = {"colors": HEADER_SIZE}
+	end = HEADER_SIZE + count * 4 * np.dtype(COLOR_DTYPES[precision]).itemsize
+	if flags & FLAG_HAS_COLOR:
+		offsets["hasColor"] = _VCB_Align(end)
+		end = offsets["hasColor"] + (count + 7) // 8
+	if flags & FLAG_POSITIONS:
+		offsets["positions"] = _VCB_Align(end)
+		end = offsets["positions"] + count * 3 * 4
+	offsets["end"] = end
+	return offsets
+
+# Digest of a mesh's polygons, all zeros for meshes without any
+def VCB_TopologyDigest(adapter):
+	faceCounts, faceIndices = adapter.getFaceVertices()
+	if not len(faceCounts):
+		return bytes(20)
+	digest = hashlib.sha1(np.ascontiguousarray(faceCounts, dtype = np.int64).tobytes())
+	digest.update(np.ascontiguousarray(faceIndices, dtype = np.int64).tobytes())
+	return digest.digest()
+
+## Color File
+
+# A color snapshot file mapped into memory. Only the pages of the vertices
+# asked for are read from disk
+class ColorFile(object):
+	def __init__(self, path):
+		self.path = path
+		with open(path, "rb") as fileObj:
+			header = fileObj.read(HEADER_SIZE)
+		if len(header) < HEADER_SIZE:
+			raise ValueError("%s is not a VCB color file." % path)
+		magic, version, self.precision, self.flags, self.count, self.topology = HEADER.unpack_from(header)
+		if magic != MAGIC:
+			raise ValueError("%s is not a VCB color file." % path)
+		if version > VERSION:
+			raise ValueError("%s was written by a newer VCB, version %d." % (path, version))
+		if self.precision not in COLOR_DTYPES:
+			raise ValueError("%s has an unknown color precision %d." % (path, self.precision))
+
+		offsets = VCB_BlockOffsets(self.count, self.precision, self.flags)
+		self._data = np.memmap(path, dtype = np.uint8, mode = "r")
+		if len(self._data) < offsets["end"]:
+			raise ValueError("%s is truncated." % path)
+
+		self._colors = self._block(offsets["colors"], COLOR_DTYPES[self.precision], (self.count, 4))
+		self._hasColor = self._block(offsets["hasColor"], np.uint8, ((self.count + 7) // 8,)) if self.flags & FLAG_HAS_COLOR else None
+		self.positions = self._block(offsets["positions"], np.float32, (self.count, 3)) if self.flags & FLAG_POSITIONS else None
+
+	def _block(self, offset, dtype, shape):
+		size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+		return self._data[offset:offset + size].view(dtype).reshape(shape)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+
+	# Drop the mapping, arrays taken from the file before stay valid only as copies
+	def close(self):
+		self._data = self._colors = self._hasColor = self.positions = None
+
+	def hasPositions(self):
+		return self.positions is not None
+
+	# RGBA float32 colors of the given vertices, or all of them
+	def colors(self, indices = None):
+		colors = self._colors if indices is None else self._colors[indices]
+		if self.precision == undo.PRECISION_UINT8:
+			return colors.astype(np.float32) / 255.0
+		return colors.astype(np.float32)
+
+	# Which of the given vertices have a color
+	def hasColor(self, indices = None):
+		if self._hasColor is None:
+			hasColor = np.ones(self.count, dtype = bool)
+		else:
+			hasColor = np.unpackbits(self._hasColor, count = self.count).astype(bool)
+		return hasColor if indices is None else hasColor[indices]
+
+	# Whether the colors can go on the mesh by index. Files or meshes without
+	# polygons only need the vertex count to match
+	def matches(self, adapter):
+		if adapter.numVertices() != self.count:
+			return False
+		topology = VCB_TopologyDigest(adapter)
+		return self.topology == topology or not any(self.topology) or not any(topology)
+
+## Export
+
+# Write a mesh's vertex colors to path as uint8 or half float RGBA, with the
+# object space positions when they're wanted for nearest point transfers.
+# Returns the bytes written
+def VCB_ExportColors(adapter, path, precision = undo.PRECISION_FLOAT16, positions = True):
+	colors, hasColor = adapter.readColors()
+	snapshot = undo.ColorSnapshot(colors, hasColor, precision)
+
+	flags = (FLAG_HAS_COLOR if snapshot.hasColor is not None else 0) | (FLAG_POSITIONS if positions else 0)
+	offsets = VCB_BlockOffsets(snapshot.count, precision, flags)
+
+	with open(path, "wb") as fileObj:
+		fileObj.write(HEADER.pack(MAGIC, VERSION, precision, flags, snapshot.count, VCB_TopologyDigest(adapter)).ljust(HEADER_SIZE, b"\0"))
+		fileObj.write(snapshot.colors.tobytes())
+		if flags & FLAG_HAS_COLOR:
+			fileObj.seek(offsets["hasColor"])
+			fileObj.write(snapshot.hasColor.tobytes())
+		if flags & FLAG_POSITIONS:
+			fileObj.seek(offsets["positions"])
+			fileObj.write(adapter.getPositions().astype(np.float32).tobytes())
+		fileObj.truncate(offsets["end"])
+	return offsets["end"]
+
+## Import
+
+# Colors for a set of target positions from the nearest colored vertex of the
+# file. Targets farther than radius from every colored vertex are left out.
+# Returns the target indices that get a color and their colors
+def VCB_TransferColors(colorFile, positions, radius = None):
+	if not colorFile.hasPositions():
+		raise ValueError("%s was exported without positions, it can only be imported onto the same topology." % colorFile.path)
+
+	# Only colored vertices are candidates, unassigned ones shouldn't win
+	sources = np.flatnonzero(colorFile.hasColor())
+	if not len(sources):
+		return np.zeros(0, dtype = np.int64), np.zeros((0, 4), dtype = np.float32)
+	index = spatial.VCB_GetIndex(colorFile.positions[sources])
+
+	distances, nearest = index.nearest(positions, radius)
+	targets = np.flatnonzero(nearest >= 0)
+	return targets, colorFile.colors(sources[nearest[targets]])
+
+# Put the colors of a file on a mesh with commit(adapter, indices, colors).
+# By index when the topology matches, otherwise by nearest point. transfer
+# forces one or the other. Returns "index" or "nearest"
+def VCB_ImportColors(adapter, path, commit = engine.VCB_Commit, transfer = None, radius = None):
+	with ColorFile(path) as colorFile:
+		if transfer is None:
+			transfer = not colorFile.matches(adapter)
+
+		if transfer:
+			indices, colors = VCB_TransferColors(colorFile, adapter.getPositions(), radius)
+		else:
+			if colorFile.count != adapter.numVertices():
+				raise ValueError("%s has %d vertices, %s has %d." % (path, colorFile.count, adapter.name, adapter.numVertices()))
+			indices = np.flatnonzero(colorFile.hasColor())
+			colors = colorFile.colors(indices)
+
+	commit(adapter, indices, colors)
+	return "nearest" if transfer else "index"
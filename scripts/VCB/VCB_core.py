@@ -10,169 +10,432 @@
 """
 
 ## Imports
-import pymel.core as pm
-import math
+import maya.cmds as cmds
+import maya.mel as mel
+import json
+
+import numpy as np
+
+import VCB.VCB_cache as cache
+import VCB.VCB_colorFile as colorFile
+import VCB.VCB_engine as engine
+import VCB.VCB_falloff as falloff
+import VCB.VCB_kernel as kernel
+import VCB.VCB_mesh as vmesh
+import VCB.VCB_optVars as vars
+import VCB.VCB_preview as preview
+import VCB.VCB_profile as profile
+import VCB.VCB_scene as scene
+import VCB.VCB_selection as resolver
+import VCB.VCB_undo as undo
 
 ## Initialization
 
+_applier = None		# Background applier, made on the first background apply
+
+# The tool options window updates the limit whenever it changes
+if "resultCacheMB_VCB" in vars.optionVar:
+	cache.VCB_SetCacheLimit(vars.optionVar["resultCacheMB_VCB"] * 1024 * 1024)
+
 ## Core Functionalaity
 	
 # Applies a gradient to the selected mesh
+@profile.VCB_Recorded("VCB_Apply")
 def VCB_Apply():
 	# Get Settings
-	mode = pm.optionVar["gradientMode_VCB"]
-	blendMode = pm.optionVar["blendMode_VCB"]
-	# Color Settings
-	colorMain = pm.optionVar["colorMain_VCB"]
-	alphaMain = pm.optionVar["alphaMain_VCB"]
-	colorSub = pm.optionVar["colorSub_VCB"]
-	alphaSub = pm.optionVar["alphaSub_VCB"]
-	# Gradient Settings
-	gradientDirection = pm.optionVar["gradientDirection_VCB"]
-	gradientMode = pm.optionVar["gradientBounds_VCB"]
+	settings = engine.Settings.fromOptionVars(vars.optionVar)
+	
+	# Start from the colors the mesh had before any preview
+	preview.VCB_CancelPreview()
+	
+	adapters, indicesList, anchorsList = VCB_GetTargets(settings)
+	indicesList, weightsList = VCB_GetSoftWeights(adapters, indicesList)
+	
+	# Large applies write a chunk at a time behind a progress window
+	total = sum(adapter.numVertices() if indices is None else len(indices) for adapter, indices in zip(adapters, indicesList))
+	if total > engine.CHUNK_SIZE:
+		group = VCB_ApplyWithProgress(adapters, settings, indicesList, anchorsList, weightsList)
+		if group is not None:
+			VCB_CommitGroup(group)
+		return
+	
+	# Compute the colors and snapshot them for undo
+	group = undo.OperationGroup([])
+	record = undo.VCB_RecordingCommit(group, vars.optionVar["undoPrecision_VCB"])
+	
+	if anchorsList is not None:
+		# Every mesh measures from its own anchor or seed vertices
+		for adapter, indices, anchorIndices, weights in zip(adapters, indicesList, anchorsList, weightsList):
+			engine.VCB_ApplyMesh(adapter, settings, indices, anchorIndices, commit = record, weights = weights)
+	else:
+		# Threads rather than processes, the kernel's array math releases the GIL
+		# and Maya can't cheaply spawn worker interpreters
+		engine.VCB_ApplyMeshes(adapters, settings, indicesList, processes = False, commit = record, weightsList = weightsList)
+	
+	# Commit everything with one bulk write per mesh, as a single undoable command
+	VCB_CommitGroup(group)
+
+# Applies on a worker thread so Maya stays responsive. The selection is
+# snapshotted now and the colors are written as one undoable command once Maya
+# is idle. Changing the settings or applying again before then drops the
+# result. Returns the job's future
+def VCB_ApplyAsync():
+	global _applier
+	if _applier is None:
+		import VCB.VCB_async as vasync
+		_applier = vasync.AsyncApplier()
+	
+	settings = engine.Settings.fromOptionVars(vars.optionVar)
+	preview.VCB_CancelPreview()
+	
+	adapters, indicesList, anchorsList = VCB_GetTargets(settings)
+	indicesList, weightsList = VCB_GetSoftWeights(adapters, indicesList)
+	
+	group = undo.OperationGroup([])
+	record = undo.VCB_RecordingCommit(group, vars.optionVar["undoPrecision_VCB"])
+	
+	# Results computed with settings the user has since moved away from are stale
+	def IsCurrent():
+		return engine.Settings.fromOptionVars(vars.optionVar).asDict() == settings.asDict()
+	
+	# Runs on the main thread once every mesh has been recorded
+	def Done(future):
+		if future.cancelled():
+			cmds.warning("VCB: Settings changed before the background apply finished, its colors were dropped.")
+		elif future.exception() is not None:
+			cmds.warning("VCB: Background apply failed. %s" % future.exception())
+		else:
+			VCB_CommitGroup(group)
+	
+	future = _applier.submit(adapters, settings, indicesList, anchorsList, commit = record, isCurrent = IsCurrent, weightsList = weightsList)
+	future.add_done_callback(Done)
+	return future
+
+# Applies in the background when that's turned on in the tool options
+def VCB_ApplyFromOptions():
+	if vars.optionVar["asyncApply_VCB"]:
+		return VCB_ApplyAsync()
+	return VCB_Apply()
+
+# Applies to every mesh under the given object sets, namespaces and name
+# patterns rather than the selection. Instanced shapes are colored once, the
+# whole batch is one undoable command. Returns the scene report
+def VCB_ApplyToScene(targets):
+	settings = engine.Settings.fromOptionVars(vars.optionVar)
+	preview.VCB_CancelPreview()
+	
+	group = undo.OperationGroup([])
+	record = undo.VCB_RecordingCommit(group, vars.optionVar["undoPrecision_VCB"])
+	
+	try:
+		report = scene.VCB_ApplyScene(settings, targets, commit = record, log = print if vars.optionVar["logStats_VCB"] else None)
+	except ValueError as error:
+		cmds.warning("VCB: %s" % error)
+		return None
+	if not report.shapes:
+		cmds.warning("VCB: No meshes found under %s." % ", ".join(targets))
+		return report
+	
+	VCB_CommitGroup(group)
+	print("VCB: %s" % report.summary())
+	return report
+
+# Writes the vertex colors of the selected mesh to a color file
+def VCB_ExportColors(path):
+	resolved = resolver.VCB_ResolveSelection()
+	if resolved.isEmpty():
+		return errorCode(0) #no selection
+	shapes = resolved.shapes()
+	if not shapes:
+		return errorCode(2) #at least one mesh
+	if len(shapes) > 1:
+		errorCode(100) #more than one mesh
+	
+	adapter = vmesh.MayaMesh(shapes[0])
+	size = colorFile.VCB_ExportColors(adapter, path)
+	print("VCB: wrote %d vertices of %s to %s, %.1f KB" % (adapter.numVertices(), adapter.name, path, size / 1024.0))
+
+# Puts the colors of a color file on every selected mesh, by index where the
+# topology matches and by nearest point elsewhere, as one undoable command
+def VCB_ImportColors(path):
+	resolved = resolver.VCB_ResolveSelection()
+	if resolved.isEmpty():
+		return errorCode(0) #no selection
+	if not resolved.shapes():
+		return errorCode(2) #at least one mesh
+	preview.VCB_CancelPreview()
+	
+	group = undo.OperationGroup([])
+	record = undo.VCB_RecordingCommit(group, vars.optionVar["undoPrecision_VCB"])
+	
+	for shape in resolved.shapes():
+		adapter = vmesh.MayaMesh(shape)
+		with profile.VCB_Phase("import", adapter.numVertices()):
+			method = colorFile.VCB_ImportColors(adapter, path, commit = record)
+		print("VCB: %s colored by %s" % (adapter.name, method))
+	
+	VCB_CommitGroup(group)
+
+# Smooths the vertex colors of the selection
+@profile.VCB_Recorded("VCB_Smooth")
+def VCB_Smooth():
+	iterations = vars.optionVar["smoothIterations_VCB"]
+	strength = vars.optionVar["smoothStrength_VCB"]
+	channels = [bool(channel) for channel in vars.optionVar["smoothChannels_VCB"]]
+	
+	# Smooth what is on the mesh, not a preview of it
+	preview.VCB_CancelPreview()
+	
+	with profile.VCB_Phase("resolve") as phase:
+		resolved = resolver.VCB_ResolveSelection()
+		phase.count = resolved.itemCount
+	
+	# Validate
+	if resolved.isEmpty():
+		return errorCode(0) #no selection
+	if not resolved.shapes():
+		return errorCode(4) #only polygon objects or components
+	
+	group = undo.OperationGroup([])
+	record = undo.VCB_RecordingCommit(group, vars.optionVar["undoPrecision_VCB"])
+	
+	for shape, indices in resolved.meshIndices().items():
+		engine.VCB_SmoothMesh(vmesh.MayaMesh(shape), indices, iterations, strength, channels, commit = record)
+	
+	VCB_CommitGroup(group)
+
+# Bakes the settings stored per channel into the selected meshes, one RGBA
+# write per mesh
+@profile.VCB_Recorded("VCB_BakePacked")
+def VCB_BakePacked():
+	channelSettings = [engine.Settings.fromDict(json.loads(text)) if text else None for text in vars.optionVar["packedChannels_VCB"]]
+	if not any(channelSettings):
+		cmds.error("Set the gradient of at least one channel before baking.")
+	
+	# Bake over the colors the mesh had before any preview
+	preview.VCB_CancelPreview()
+	
+	with profile.VCB_Phase("resolve") as phase:
+		resolved = resolver.VCB_ResolveSelection()
+		phase.count = resolved.itemCount
+	
+	# Validate
+	if resolved.isEmpty():
+		return errorCode(0) #no selection
+	if not resolved.shapes():
+		return errorCode(4) #only polygon objects or components
+	
+	# Whole meshes are baked. Selected vertices lead the anchors in selection
+	# order, so Point to Point channels measure between the first two
+	# Combined channels span the meshes in world space, the others measure
+	# each mesh in its own object space
+	combined = any(settings is not None and settings.mode == 2 and settings.gradientBounds == 1 and settings.multiMeshBounds == 2 for settings in channelSettings)
+	adapters = []
+	worldAdapters = [] if combined else None
+	anchorsList = []
+	for shape, indices in resolved.meshIndices().items():
+		adapters.append(vmesh.MayaMesh(shape))
+		if combined:
+			worldAdapters.append(vmesh.MayaMesh(shape, worldSpace = True))
+		anchors = []
+		if shape not in resolved.objects:
+			anchors = [index for vertexShape, index in resolved.firstVertices if vertexShape == shape]
+			leading = set(anchors)
+			anchors += [index for index in indices.tolist() if index not in leading]
+		anchorsList.append(anchors)
+	
+	modes = set(settings.gradientBounds for settings in channelSettings if settings is not None and settings.mode == 2)
+	if 2 in modes and min(len(anchors) for anchors in anchorsList) < 2:
+		return errorCode(3) #2 verts
+	if modes & set([3, 4]) and not all(anchorsList):
+		return errorCode(5) #components
+	
+	group = undo.OperationGroup([])
+	record = undo.VCB_RecordingCommit(group, vars.optionVar["undoPrecision_VCB"])
+	
+	engine.VCB_BakeChannels(adapters, channelSettings, anchorsList = anchorsList, commit = record, worldAdapters = worldAdapters)
+	
+	VCB_CommitGroup(group)
+
+# Write a recorded undo group through the undoable command
+def VCB_CommitGroup(group):
+	with profile.VCB_Phase("commit", len(group.operations)):
+		undo.VCB_Execute(group)
+	profile.VCB_Note("undo", group.summary())
+
+# Chunked apply with a progress window that can cancel it. Returns the written
+# undo group, or None when cancelled and every written chunk was rolled back
+def VCB_ApplyWithProgress(adapters, settings, indicesList, anchorsList, weightsList = None):
+	cmds.progressWindow(
+		title = "Vertex Color Bench",
+		status = "Applying colors...",
+		progress = 0,
+		maxValue = 100,
+		isInterruptable = True,
+	)
+	
+	def Progress(done, total):
+		if cmds.progressWindow(query = True, isCancelled = True):
+			return False
+		cmds.progressWindow(edit = True, progress = int(100 * done / total), status = "%d of %d vertices" % (done, total))
+	
+	try:
+		return engine.VCB_ApplyChunked(adapters, settings, indicesList, anchorsList, progress = Progress, precision = vars.optionVar["undoPrecision_VCB"], weightsList = weightsList)
+	except engine.ApplyCancelled:
+		cmds.warning("Apply cancelled, the colors have been put back.")
+		return None
+	finally:
+		cmds.progressWindow(endProgress = True)
+
+# Widen the selected vertices of every mesh by the soft falloff when it's
+# turned on. Returns the indices per mesh and a weights array per mesh, or
+# None for meshes colored at full strength. Weights are gathered as one array
+# per mesh, never per vertex
+def VCB_GetSoftWeights(adapters, indicesList):
+	weightsList = [None] * len(adapters)
+	if not vars.optionVar["softWeights_VCB"]:
+		return indicesList, weightsList
+	
+	indicesList = list(indicesList)
+	with profile.VCB_Phase("falloff") as phase:
+		for mesh, (adapter, indices) in enumerate(zip(adapters, indicesList)):
+			# Whole meshes have nothing around them to fade into
+			if indices is None:
+				continue
+			indicesList[mesh], weightsList[mesh] = falloff.VCB_SoftSelectWeights(adapter.dagPath.fullPathName(), indices, vars.optionVar["softRadius_VCB"])
+		phase.count = sum(len(weights) for weights in weightsList if weights is not None)
+	return indicesList, weightsList
+
+# Targets of a live preview as VCB_GetTargets returns them quietly, widened by
+# the soft falloff once for the whole session. Returns (adapters, indicesList,
+# anchorsList, weightsList), or None when the selection doesn't fit
+def VCB_GetPreviewTargets(settings):
+	targets = VCB_GetTargets(settings, quiet = True)
+	if targets is None:
+		return None
+	adapters, indicesList, anchorsList = targets
+	indicesList, weightsList = VCB_GetSoftWeights(adapters, indicesList)
+	return adapters, indicesList, anchorsList, weightsList
+
+# Resolve the selection to the meshes and vertices the settings color.
+# Returns (adapters, indicesList, anchorsList), anchorsList holding the anchor
+# or seed vertex indices per mesh when the gradient needs them. When quiet a
+# selection that doesn't fit returns None instead of being reported
+def VCB_GetTargets(settings, quiet = False):
+	mode = settings.mode
+	gradientMode = settings.gradientBounds
+	
+	# Report an invalid selection, only returns when quiet
+	def Invalid(code):
+		if not quiet:
+			errorCode(code)
 	
 	# Turn on Selection Order -- NOT WORKING
-	pm.selectPref(trackSelectionOrder=True)
+	cmds.selectPref(trackSelectionOrder=True)
 	
-	# Get Selection and Validate
-	selection = pm.ls(selection = True)
-	if selection == [] or selection == None:
-		errorCode(0) #no selection
+	# Resolve the selection to vertex indices per mesh in a single pass
+	with profile.VCB_Phase("resolve") as phase:
+		resolved = resolver.VCB_ResolveSelection()
+		phase.count = resolved.itemCount
+	
+	# Validate
+	if resolved.isEmpty():
+		return Invalid(0) #no selection
 		
 	# Get Object Info and Validate Selections
+	adapters = []
+	indicesList = []
+	anchorsList = None
 	if mode == 1: # Standard
-		# Validate
-		if pm.filterExpand(selectionMask=[12,31,32,34,35]) == [] or pm.filterExpand(selectionMask=[12,31,32,34,35]) == None:
-			errorCode(4) #only polygon objects or components
-		
-		object = pm.ls(selection, o=True)
-		object = list(set(object))
+		if not resolved.shapes():
+			return Invalid(4) #only polygon objects or components
 		
-		vertList = pm.ls( pm.polyListComponentConversion(toVertex = True), flatten = True)
+		for shape, indices in resolved.meshIndices().items():
+			adapters.append(vmesh.MayaMesh(shape))
+			indicesList.append(indices)
 		
 	elif gradientMode == 1: # Mesh Bounds
-		# Validate
-		if pm.filterExpand(selectionMask=12) == [] or pm.filterExpand(selectionMask=12) == None:
-			errorCode(1) #only meshes
-				
-		if len(pm.filterExpand(selectionMask=12)) > 1:
-			errorCode(100) #more than one mesh warn
+		if not resolved.objects:
+			return Invalid(1) #only meshes
 			
-		object = pm.PyNode(selection[0])
-		vertList = object.verts
+		# Every selected mesh, in world space when they share combined bounds
+		for shape in sorted(set(resolved.objects), key = resolved.objects.index):
+			adapters.append(vmesh.MayaMesh(shape, worldSpace = settings.multiMeshBounds == 2))
+			indicesList.append(None)
 		
 	elif gradientMode == 2: # Point to Point
-		# Order Selection
-		#selection = pm.ls(selection, orderedSelection=True) ## FIX ME: Order of selection is not maintained
-		
-		#Validate
-		if pm.filterExpand(selectionMask=31) == [] or pm.filterExpand(selectionMask=31) == None or len(pm.filterExpand(selectionMask=31)) <= 1:
-			errorCode(3) #2 verts
+		if resolved.vertexComponentCount <= 1:
+			return Invalid(3) #2 verts
 			
-		if len(pm.filterExpand(selectionMask=31)) > 2:
+		if resolved.vertexComponentCount > 2 and not quiet:
 			errorCode(101) #more than 2 verts
 		
-		object = pm.ls(selection, o=True)
-		object = list(set(object))
-
-		if len(object) > 1:
-			print(len(object))
-			pm.error("You may only select vertices from a single mesh while performing this operation.")
+		if len(resolved.shapes()) > 1:
+			if quiet:
+				return None
+			cmds.error("You may only select vertices from a single mesh while performing this operation.")
 		
-		object = pm.PyNode(object[0])
-		vertList = object.verts
-	
-	# Walk through our object's verts
-	for vert in vertList:
-		color = vert.getColor()
+		anchorsList = [[index for shape, index in resolved.firstVertices[0:2]]]
+		adapters.append(vmesh.MayaMesh(resolved.firstVertices[0][0]))
+		indicesList.append(None)
 		
-		if mode == 1: # Standard
-			if blendMode == 1: # Replace
-				color = [colorMain[0], colorMain[1], colorMain[2], alphaMain]
-				
-			elif blendMode == 2: # Add
-				color += [colorMain[0], colorMain[1], colorMain[2], alphaMain]
-				
-			elif blendMode == 3: # Multiply
-				color *= [colorMain[0], colorMain[1], colorMain[2], alphaMain]
-		
-		elif mode == 2: # Gradient
-			# Determine how far our vert is from the bounds
-			dist = VCB_GetVertexDistance( vert, gradientMode, gradientDirection, selection, object)
-			
-			# Blend our new color
-			if blendMode == 1: # Replace
-				color = VCB_GetColorAtDistance(colorMain, colorSub, alphaMain, alphaSub, dist)
-				
-			elif blendMode == 2: # Add
-				color += VCB_GetColorAtDistance(colorMain, colorSub, alphaMain, alphaSub, dist)
-				
-			elif blendMode == 3: # Multiply
-				color *= VCB_GetColorAtDistance(colorMain, colorSub, alphaMain, alphaSub, dist)
+	elif gradientMode in (3, 4): # Selection, Surface
+		if not resolved.componentTypes:
+			return Invalid(5) #components
 		
-		# Apply the color
-		pm.select(vert, replace = True)
-		pm.polyColorPerVertex(rgb = (color[0:3]), a = color[3], colorDisplayOption = True)
+		# The selected components are the seeds, the whole mesh is colored
+		anchorsList = []
+		for shape, indices in resolved.meshIndices().items():
+			adapters.append(vmesh.MayaMesh(shape))
+			indicesList.append(None)
+			anchorsList.append(indices)
+	
+	return adapters, indicesList, anchorsList
 
-	# Restore the user's selection
-	pm.select(selection, replace = True)
+# Print the result cache's hit and miss counts to the Script Editor
+def VCB_PrintCacheStats():
+	stats = cache.VCB_CacheStats()
+	print("VCB result cache: %(hits)d hits, %(misses)d misses, %(evictions)d evictions, %(entries)d entries" % stats
+		+ ", %.1f of %.1f MB" % (stats["bytes"] / 1048576.0, stats["limit"] / 1048576.0))
 
 # Apply and Close the window
 def VCB_ApplyAndClose(window):
-	VCB_Apply()
-	pm.deleteUI(window)
+	VCB_ApplyFromOptions()
+	cmds.deleteUI(window)
 
 def VCB_GetColorAtDistance(colorMain, colorSub, alphaMain, alphaSub, dist):
-	return [colorMain[0] + (colorSub[0]-colorMain[0]) * dist, 	#red
-		colorMain[1] + (colorSub[1]-colorMain[1]) * dist, 		#green
-		colorMain[2] + (colorSub[2]-colorMain[2]) * dist, 		#blue
-		alphaMain + (alphaSub-alphaMain) * dist] 				#alpha
-	
-def VCB_DistanceBetweenTwoPoints( pointOne, pointTwo ):
-	return math.sqrt((pointOne.x - pointTwo.x)**2 + (pointOne.y - pointTwo.y)**2 + (pointOne.z - pointTwo.z)**2)	
+	return kernel.VCB_LerpColors(colorMain, colorSub, alphaMain, alphaSub, [dist])[0].tolist()
 	
-# Return given vertex's distance between bounds as percent
-def VCB_GetVertexDistance( vert, gradientMode, gradientDirection, selection, object):
-	meshBounds = VCB_GetMeshBounds(object)
+# Distance between two (x, y, z) points
+def VCB_DistanceBetweenTwoPoints(pointOne, pointTwo):
+	return float(np.linalg.norm(np.subtract(pointTwo, pointOne, dtype = np.float64)))
 
-	if gradientMode == 2: # Point to Point
-		return max(min(VCB_DistanceBetweenTwoPoints(vert.getPosition(), selection[0].getPosition()) / VCB_DistanceBetweenTwoPoints(selection[0].getPosition(), selection[1].getPosition()), 1), 0)
-	elif gradientDirection == 1: # X
-		return abs((vert.getPosition().x - meshBounds.max().x) / (meshBounds.max().x - meshBounds.min().x))
-	elif gradientDirection == 2: # Y
-		return abs((vert.getPosition().y - meshBounds.max().y) / (meshBounds.max().y - meshBounds.min().y))
-	elif gradientDirection == 3: # Z
-		return abs((vert.getPosition().z - meshBounds.max().z) / (meshBounds.max().z - meshBounds.min().z))
-
-# Return the bounding box of the given mesh
-def VCB_GetMeshBounds(mesh):
-	return mesh.boundingBox()
-		
+# Return an (x, y, z) position's distance between the gradient bounds as
+# percent, measured by a plan from engine.VCB_BuildPlan
+def VCB_GetVertexDistance(position, plan):
+	return float(plan.weights([position])[0])
+	
 # Create VCB Shelf button
 def VCB_CreateShelfBtn():
 
     shelfImg = "vcb_ico_32.png"
     
     # Get top shelf as parent
-    pm.mel.eval("global string $gShelfTopLevel")
-    topShelf = pm.mel.eval("$temp = $gShelfTopLevel")
-    currentShelf = pm.tabLayout(topShelf, query=True, selectTab=True)
-    pm.setParent(topShelf + "|" + currentShelf)
+    mel.eval("global string $gShelfTopLevel")
+    topShelf = mel.eval("$temp = $gShelfTopLevel")
+    currentShelf = cmds.tabLayout(topShelf, query=True, selectTab=True)
+    cmds.setParent(topShelf + "|" + currentShelf)
     
     # Create the button
-    pm.shelfButton(
+    cmds.shelfButton(
         annotation="Vertex Color Bench",
-        command="python(\"import sys\");"
-        "if (`window -ex VCB_winMain`){"
+        command="if (`window -ex VCB_winMain`){"
         "    if (`window -q -iconify VCB_winMain`){"
         "        window -e -iconify 0 VCB_winMain;"
         "    }else{"
         "        window -e -iconify 1 VCB_winMain;}"
         "}else{"
-        "    catchQuiet ( `python(\"del sys.modules['VCB']\")`);"
-        "    catchQuiet ( `python(\"del sys.modules['VCB.VCB_UI']\")`);"
-        "    catchQuiet ( `python(\"del sys.modules['VCB.VCB_core']\")`);"
-        "    python(\"import VCB\");"
+        "    python(\"import VCB; VCB.show()\");"
         "}",
         label="VCB",
         image1=shelfImg,
@@ -185,6 +448,7 @@ def VCB_CreateShelfBtn():
 # 2 At least one mesh
 # 3 At least two verts
 # 4 Only meshes or mesh components
+# 5 At least one mesh component
 ## Warning Codes
 # 100 More than one mesh
 # 101 More than two verts
@@ -192,7 +456,7 @@ def VCB_CreateShelfBtn():
 def errorCode(code, detail = "detail"):
 	# No selection at all
 	if code == 0:
-		pm.confirmDialog(
+		cmds.confirmDialog(
 			button="Ok",
 			cancelButton="Ok",
 			defaultButton="Ok",
@@ -200,11 +464,11 @@ def errorCode(code, detail = "detail"):
 			message="You must select something before performing this operation.",
 			title="Error!"
 		)
-		pm.error("You must select something before performing this operation.")
+		cmds.error("You must select something before performing this operation.")
 	
 	# Only meshes allowed
 	if code == 1:
-		pm.confirmDialog(
+		cmds.confirmDialog(
 			button="Ok",
 			cancelButton="Ok",
 			defaultButton="Ok",
@@ -212,11 +476,11 @@ def errorCode(code, detail = "detail"):
 			message="You may only select mesh objects while performing this operation.",
 			title="Error!"
 		)
-		pm.error("You may only select meshes while performing this operation.")
+		cmds.error("You may only select meshes while performing this operation.")
 	
 	# At least one mesh
 	if code == 2:
-		pm.confirmDialog(
+		cmds.confirmDialog(
 			button="Ok",
 			cancelButton="Ok",
 			defaultButton="Ok",
@@ -224,11 +488,11 @@ def errorCode(code, detail = "detail"):
 			message="You must have at least one mesh selected while performing this operation.",
 			title="Error!"
 		)
-		pm.error("You must have at least one mesh selected while performing this operation.")
+		cmds.error("You must have at least one mesh selected while performing this operation.")
 		
 	# At least two vertices
 	if code == 3:
-		pm.confirmDialog(
+		cmds.confirmDialog(
 			button="Ok",
 			cancelButton="Ok",
 			defaultButton="Ok",
@@ -236,11 +500,11 @@ def errorCode(code, detail = "detail"):
 			message="You must select two mesh vertices before performing this operation.",
 			title="Error!"
 		)
-		pm.error("You must select two mesh vertices before performing this operation.")
+		cmds.error("You must select two mesh vertices before performing this operation.")
 		
 	# Only Mesh or Mesh Components
-	if code == 3:
-		pm.confirmDialog(
+	if code == 4:
+		cmds.confirmDialog(
 			button="Ok",
 			cancelButton="Ok",
 			defaultButton="Ok",
@@ -248,12 +512,24 @@ def errorCode(code, detail = "detail"):
 			message="You may only select mesh objects or mesh components before performing this operation.",
 			title="Error!"
 		)
-		pm.error("You may only select mesh objects or mesh components before performing this operation.")
+		cmds.error("You may only select mesh objects or mesh components before performing this operation.")
+	
+	# At least one component
+	if code == 5:
+		cmds.confirmDialog(
+			button="Ok",
+			cancelButton="Ok",
+			defaultButton="Ok",
+			dismissString="Ok",
+			message="You must select mesh vertices, edges or faces to measure the distance from.",
+			title="Error!"
+		)
+		cmds.error("You must select mesh vertices, edges or faces to measure the distance from.")
 	
 	# More than one mesh selected
 	if code == 100:
 		"""
-		pm.confirmDialog(
+		cmds.confirmDialog(
 			button="Ok",
 			cancelButton="Ok",
 			defaultButton="Ok",
@@ -261,12 +537,12 @@ def errorCode(code, detail = "detail"):
 			message="Wanring: More than one mesh is selected.\nOperation will only be performed on the first mesh.",
 			title="Warning!"
 		)"""
-		pm.warning("Operation will only be performed on the first selected mesh.")
+		cmds.warning("Operation will only be performed on the first selected mesh.")
 	
 	# More than two vertices selected
 	if code == 101:
 		"""
-		pm.confirmDialog(
+		cmds.confirmDialog(
 			button="Ok",
 			cancelButton="Ok",
 			defaultButton="Ok",
@@ -274,4 +550,4 @@ def errorCode(code, detail = "detail"):
 			message="Wanring: More than two vertices selected.\nOperation will be performed using the first two.",
 			title="Warning!"
 		)"""
-		pm.warning("Operation will be performed using only the first two selected vertices.")
\ No newline at end of file
+		cmds.warning("Operation will be performed using only the first two selected vertices.")
\ No newline at end of file
@@ -0,0 +1,521 @@
+"""
+
+	Headless engine for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Table of Contents
+# Settings
+# Apply
+# Multi-Mesh Apply
+# Chunked Apply
+# Channel Packing
+# Smooth
+
+## Imports
+import concurrent.futures
+import contextlib
+import os
+import time
+
+import numpy as np
+
+import VCB.VCB_cache as cache
+import VCB.VCB_geodesic as geodesic
+import VCB.VCB_kernel as kernel
+import VCB.VCB_profile as profile
+import VCB.VCB_spatial as spatial
+import VCB.VCB_undo as undo
+
+## Initialization
+
+# Vertices read, computed and written at once by a chunked apply
+CHUNK_SIZE = 65536
+
+## Settings
+
+# Snapshot of the VCB optionVars an apply runs with. The values use the same
+# 1-based codes as the optionVars and the UI radio buttons
+class Settings(object):
+	def __init__(self, mode = 1, blendMode = 1, colorMain = (1.0, 1.0, 1.0), alphaMain = 1.0, colorSub = (1.0, 1.0, 1.0), alphaSub = 1.0, gradientBounds = 1, gradientDirection = 1, multiMeshBounds = 1, unsetColor = None, ramp = None, falloffRadius = 1.0, opacity = 1.0, blendChannels = (True, True, True, True)):
+		self.mode = int(mode)							# 1 Standard, 2 Gradient
+		self.blendMode = int(blendMode)					# kernel.BLEND_* code
+		self.opacity = float(opacity)					# How much of the blend is kept over the base colors
+		self.blendChannels = tuple(bool(c) for c in blendChannels)	# RGBA channels the blend writes
+		self.colorMain = tuple(float(c) for c in colorMain)
+		self.alphaMain = float(alphaMain)
+		self.colorSub = tuple(float(c) for c in colorSub)
+		self.alphaSub = float(alphaSub)
+		self.gradientBounds = int(gradientBounds)		# 1 Mesh Bounds, 2 Point to Point, 3 Selection, 4 Surface
+		self.gradientDirection = int(gradientDirection)	# 1 X, 2 Y, 3 Z
+		self.multiMeshBounds = int(multiMeshBounds)		# 1 Per Mesh, 2 Combined
+		self.falloffRadius = float(falloffRadius)		# Selection distance that reaches the sub color
+		# RGBA blended over for vertices with no color yet, None uses the blend's neutral color
+		self.unsetColor = tuple(float(c) for c in unsetColor) if unsetColor is not None else None
+		# kernel.Ramp used by gradients instead of the main and sub colors
+		self.ramp = ramp
+
+	# Read the settings from vars.optionVar or any mapping with the same keys
+	@classmethod
+	def fromOptionVars(cls, optionVars):
+		ramp = None
+		if optionVars.get("gradientRamp_VCB") == 2 and optionVars.get("rampStops_VCB"): # Ramp
+			ramp = kernel.Ramp.fromFlat(optionVars["rampStops_VCB"], optionVars["rampInterpolation_VCB"])
+
+		return cls(
+			mode = optionVars["gradientMode_VCB"],
+			blendMode = optionVars["blendMode_VCB"],
+			colorMain = optionVars["colorMain_VCB"],
+			alphaMain = optionVars["alphaMain_VCB"],
+			colorSub = optionVars["colorSub_VCB"],
+			alphaSub = optionVars["alphaSub_VCB"],
+			gradientBounds = optionVars["gradientBounds_VCB"],
+			gradientDirection = optionVars["gradientDirection_VCB"],
+			multiMeshBounds = optionVars["multiMeshBounds_VCB"],
+			ramp = ramp,
+			falloffRadius = optionVars["falloffRadius_VCB"],
+			opacity = optionVars["blendOpacity_VCB"],
+			blendChannels = optionVars["blendChannels_VCB"],
+		)
+
+	# Plain values, for keeping settings in a string option var as JSON
+	def asDict(self):
+		values = dict(self.__dict__)
+		values["ramp"] = None
+		if self.ramp is not None:
+			values["ramp"] = {"stops": self.ramp.flat(), "interpolation": self.ramp.interpolation}
+		return values
+
+	@classmethod
+	def fromDict(cls, values):
+		values = dict(values)
+		if values.get("ramp") is not None:
+			values["ramp"] = kernel.Ramp.fromFlat(values["ramp"]["stops"], values["ramp"]["interpolation"])
+		return cls(**values)
+
+## Apply
+
+# Color that vertices with no assigned color are read as
+def VCB_FillColor(settings):
+	if settings.unsetColor is not None:
+		return settings.unsetColor
+	return kernel.NEUTRAL_COLORS[settings.blendMode]
+
+# Return the (min, max) corners of an (N,3) position array
+def VCB_GetBounds(positions):
+	return positions.min(axis = 0), positions.max(axis = 0)
+
+# Build a gradient plan from already resolved (min, max) bounds, a pair of
+# anchor positions, the seed positions of a Selection gradient or the
+# per vertex distances of a Surface gradient. Only the one the settings
+# need has to be given
+def VCB_PlanFromSettings(settings, bounds = None, anchors = None, distances = None):
+	if settings.mode == 1: # Standard
+		return kernel.GradientPlan(settings.mode, settings.colorMain, settings.colorSub, settings.alphaMain, settings.alphaSub)
+
+	if settings.gradientBounds == 4: # Surface
+		return kernel.GradientPlan(settings.mode, settings.colorMain, settings.colorSub, settings.alphaMain, settings.alphaSub,
+			settings.gradientBounds, settings.gradientDirection, ramp = settings.ramp, vertexDistances = distances, radius = settings.falloffRadius)
+
+	if settings.gradientBounds == 3: # Selection
+		return kernel.GradientPlan(settings.mode, settings.colorMain, settings.colorSub, settings.alphaMain, settings.alphaSub,
+			settings.gradientBounds, settings.gradientDirection, ramp = settings.ramp, seedIndex = spatial.VCB_GetIndex(anchors), radius = settings.falloffRadius)
+
+	if settings.gradientBounds == 2: # Point to Point
+		return kernel.GradientPlan(settings.mode, settings.colorMain, settings.colorSub, settings.alphaMain, settings.alphaSub,
+			settings.gradientBounds, settings.gradientDirection, pointOne = anchors[0], pointTwo = anchors[1], ramp = settings.ramp)
+
+	return kernel.GradientPlan(settings.mode, settings.colorMain, settings.colorSub, settings.alphaMain, settings.alphaSub,
+		settings.gradientBounds, settings.gradientDirection, boundsMin = bounds[0], boundsMax = bounds[1], ramp = settings.ramp)
+
+# Build the gradient plan for a mesh. Bounds come from the mesh's own vertex
+# positions unless given, anchors are two vertex indices for Point to Point
+# or any number of seed vertex indices for Selection and Surface. Surface
+# distances are walked along the mesh's edges, so its plan covers every vertex
+def VCB_BuildPlan(adapter, settings, anchorIndices = None, bounds = None):
+	anchors = None
+	distances = None
+	if settings.mode == 2 and settings.gradientBounds == 2: # Point to Point
+		if anchorIndices is None or len(anchorIndices) < 2:
+			raise ValueError("Point to Point gradients need two anchor vertices.")
+		anchors = adapter.getPositions(np.asarray(anchorIndices[0:2], dtype = np.int64))
+
+	elif settings.mode == 2 and settings.gradientBounds == 3: # Selection
+		if anchorIndices is None or not len(anchorIndices):
+			raise ValueError("Selection gradients need at least one seed vertex.")
+		anchors = adapter.getPositions(np.asarray(anchorIndices, dtype = np.int64))
+
+	elif settings.mode == 2 and settings.gradientBounds == 4: # Surface
+		if anchorIndices is None or not len(anchorIndices):
+			raise ValueError("Surface gradients need at least one seed vertex.")
+		faceCounts, faceIndices = adapter.getFaceVertices()
+		graph = geodesic.VCB_GetGraph(faceCounts, faceIndices, adapter.numVertices())
+		distances = graph.distances(adapter.getPositions(), anchorIndices, settings.falloffRadius)
+
+	elif settings.mode == 2 and bounds is None: # Mesh Bounds
+		bounds = VCB_GetBounds(adapter.getPositions())
+
+	return VCB_PlanFromSettings(settings, bounds, anchors, distances)
+
+# Result cache key of one mesh's colors. It holds everything the plan and the
+# blend read: the settings, the colored vertices, the anchors or resolved
+# bounds, the mesh's positions (and polygons for Surface) and, unless they
+# are replaced, the base colors
+def VCB_ResultKey(adapter, settings, meshPositions, baseColors, indices = None, anchorIndices = None, bounds = None):
+	parts = [settings, len(baseColors), indices, anchorIndices]
+	if bounds is not None:
+		parts.append(np.asarray(bounds, dtype = np.float64))
+	if settings.mode == 2: # Gradient
+		parts.append(meshPositions)
+		if settings.gradientBounds == 4: # Surface
+			parts.extend(adapter.getFaceVertices())
+	if kernel.VCB_BlendReadsBase(settings.blendMode, settings.opacity, settings.blendChannels):
+		parts.append(baseColors)
+	return cache.VCB_HashKey(*parts)
+
+# Compute the final colors for the given vertices without writing them.
+# Without a plan the colors are looked up in the result cache first, a given
+# plan may have been built from anything so its colors aren't cached. weights
+# holds a 0-1 strength per vertex, applied after the cache so soft and hard
+# applies share their results
+def VCB_ComputeMesh(adapter, settings, indices = None, anchorIndices = None, plan = None, weights = None):
+	resultCache = cache.VCB_GetCache()
+	cached = plan is None and resultCache.enabled()
+
+	with profile.VCB_Phase("read") as phase:
+		baseColors, hasColor = adapter.readColors(indices, VCB_FillColor(settings))
+		meshPositions = positions = None
+		if settings.mode == 2 and cached:
+			# The key needs every position, the plan may depend on all of them
+			meshPositions = adapter.getPositions()
+			positions = meshPositions if indices is None else meshPositions[indices]
+		elif settings.mode == 2:
+			positions = adapter.getPositions(indices)
+		phase.count = len(baseColors)
+
+	key = None
+	if cached:
+		with profile.VCB_Phase("hash", len(baseColors)):
+			key = VCB_ResultKey(adapter, settings, meshPositions, baseColors, indices, anchorIndices)
+			colors = resultCache.get(key)
+		profile.VCB_Note("cache", "hit" if colors is not None else "miss")
+		if colors is not None:
+			return colors if weights is None else kernel.VCB_WeightColors(baseColors, colors, weights)
+
+	if plan is None:
+		with profile.VCB_Phase("plan", 1):
+			bounds = None
+			if meshPositions is not None and settings.gradientBounds == 1: # Mesh Bounds
+				bounds = VCB_GetBounds(meshPositions)
+			plan = VCB_BuildPlan(adapter, settings, anchorIndices, bounds)
+	if indices is not None:
+		plan = plan.forVertices(indices)
+
+	with profile.VCB_Phase("compute", len(baseColors)):
+		colors = kernel.VCB_ComputeColors(plan, positions, baseColors, settings.blendMode, settings.opacity, settings.blendChannels)
+
+	if key is not None:
+		resultCache.put(key, colors)
+	if weights is not None:
+		colors = kernel.VCB_WeightColors(baseColors, colors, weights)
+	return colors
+
+# Default commit, one bulk write straight to the adapter
+def VCB_Commit(adapter, indices, colors):
+	adapter.setColors(indices, colors)
+
+# Color the given vertices of a mesh and commit them with one bulk write.
+# commit(adapter, indices, colors) replaces the write, e.g. to record undo.
+# weights scales each vertex's change as for VCB_ComputeMesh.
+# Returns the written colors
+@profile.VCB_Recorded("VCB_ApplyMesh")
+def VCB_ApplyMesh(adapter, settings, indices = None, anchorIndices = None, plan = None, commit = VCB_Commit, weights = None):
+	colors = VCB_ComputeMesh(adapter, settings, indices, anchorIndices, plan, weights)
+	with profile.VCB_Phase("write", len(colors)):
+		commit(adapter, indices, colors)
+	return colors
+
+## Multi-Mesh Apply
+
+# Worker entry point. Computes one mesh's colors from its extracted arrays, so
+# jobs can be sent to other processes. Returns the colors and the seconds taken
+def _VCB_ComputeJob(job):
+	plan, positions, baseColors, blendMode, opacity, channels = job
+	start = time.perf_counter()
+	colors = kernel.VCB_ComputeColors(plan, positions, baseColors, blendMode, opacity, channels)
+	return colors, time.perf_counter() - start
+
+# Color many meshes at once for the Standard and Mesh Bounds modes. Geometry is
+# read once per mesh, the colors the result cache doesn't have are computed
+# across a worker pool and everything is committed mesh by mesh. settings.multiMeshBounds picks per mesh or combined
+# bounds; combined bounds expect the adapters to share a space.
+# workers of None uses every core, processes False uses threads instead.
+# commit and weightsList, a weights array or None per mesh, work as for
+# VCB_ApplyMesh. A timings list gets a dict of the read, compute and write
+# seconds of every mesh. Returns the written colors per mesh
+@profile.VCB_Recorded("VCB_ApplyMeshes")
+def VCB_ApplyMeshes(adapters, settings, indicesList = None, workers = None, processes = True, commit = VCB_Commit, timings = None, weightsList = None):
+	if settings.mode == 2 and settings.gradientBounds in (2, 3, 4):
+		raise ValueError("Point to Point, Selection and Surface gradients apply to a single mesh, use VCB_ApplyMesh.")
+	if indicesList is None:
+		indicesList = [None] * len(adapters)
+	if weightsList is None:
+		weightsList = [None] * len(adapters)
+
+	meshTimings = [{"read": 0.0, "compute": 0.0, "write": 0.0} for adapter in adapters]
+
+	# Extract geometry once per mesh
+	geometry = []
+	with profile.VCB_Phase("read") as phase:
+		for adapter, indices, meshTiming in zip(adapters, indicesList, meshTimings):
+			start = time.perf_counter()
+			positions = adapter.getPositions() if settings.mode == 2 else None
+			geometry.append((positions, adapter.readColors(indices, VCB_FillColor(settings))[0]))
+			meshTiming["read"] = time.perf_counter() - start
+		phase.count = sum(len(baseColors) for positions, baseColors in geometry)
+
+	# Resolve the bounds
+	sharedBounds = None
+	if settings.mode == 2 and settings.multiMeshBounds == 2: # Combined
+		sharedBounds = VCB_GetBounds(np.concatenate([positions for positions, baseColors in geometry]))
+
+	# Reuse colors computed before from the same settings and geometry
+	resultCache = cache.VCB_GetCache()
+	keys = [None] * len(adapters)
+	results = [None] * len(adapters)
+	if resultCache.enabled():
+		with profile.VCB_Phase("hash", len(adapters)):
+			for mesh, (adapter, indices, (positions, baseColors)) in enumerate(zip(adapters, indicesList, geometry)):
+				keys[mesh] = VCB_ResultKey(adapter, settings, positions, baseColors, indices, bounds = sharedBounds)
+				results[mesh] = resultCache.get(keys[mesh])
+		profile.VCB_Note("cache", "%d of %d hit" % (sum(colors is not None for colors in results), len(adapters)))
+	missing = [mesh for mesh, colors in enumerate(results) if colors is None]
+
+	jobs = []
+	with profile.VCB_Phase("plan", len(missing)):
+		for mesh in missing:
+			adapter, indices, (positions, baseColors) = adapters[mesh], indicesList[mesh], geometry[mesh]
+			if settings.mode == 2: # Gradient
+				bounds = sharedBounds if sharedBounds is not None else VCB_GetBounds(positions)
+				plan = VCB_BuildPlan(adapter, settings, bounds = bounds)
+				if indices is not None:
+					positions = positions[indices]
+			else:
+				plan = VCB_BuildPlan(adapter, settings)
+			jobs.append((plan, positions, baseColors, settings.blendMode, settings.opacity, settings.blendChannels))
+
+	# Compute in parallel
+	if workers is None:
+		workers = os.cpu_count() or 1
+	workers = min(workers, len(jobs))
+
+	with profile.VCB_Phase("compute", sum(len(job[2]) for job in jobs)):
+		if workers <= 1:
+			computed = [_VCB_ComputeJob(job) for job in jobs]
+		else:
+			poolType = concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+			with poolType(max_workers = workers) as pool:
+				computed = list(pool.map(_VCB_ComputeJob, jobs))
+
+	for mesh, (colors, seconds) in zip(missing, computed):
+		results[mesh] = colors
+		meshTimings[mesh]["compute"] = seconds
+		if keys[mesh] is not None:
+			resultCache.put(keys[mesh], colors)
+
+	for mesh, weights in enumerate(weightsList):
+		if weights is not None:
+			results[mesh] = kernel.VCB_WeightColors(geometry[mesh][1], results[mesh], weights)
+
+	# Commit in one pass
+	with profile.VCB_Phase("write", sum(len(colors) for colors in results)):
+		for adapter, indices, colors, meshTiming in zip(adapters, indicesList, results, meshTimings):
+			start = time.perf_counter()
+			commit(adapter, indices, colors)
+			meshTiming["write"] = time.perf_counter() - start
+
+	if timings is not None:
+		timings.extend(meshTimings)
+	return results
+
+## Chunked Apply
+
+# Raised when a chunked apply is cancelled, once its written chunks are rolled back
+class ApplyCancelled(Exception):
+	pass
+
+# Gradient plan of every mesh, with per mesh or combined bounds as in
+# VCB_ApplyMeshes and the anchor or seed vertices of each mesh
+def VCB_PlanMeshes(adapters, settings, anchorsList = None):
+	if anchorsList is None:
+		anchorsList = [None] * len(adapters)
+
+	sharedBounds = None
+	if settings.mode == 2 and settings.gradientBounds == 1 and settings.multiMeshBounds == 2: # Combined
+		boundsList = [VCB_GetBounds(adapter.getPositions()) for adapter in adapters]
+		sharedBounds = (np.min([bounds[0] for bounds in boundsList], axis = 0), np.max([bounds[1] for bounds in boundsList], axis = 0))
+
+	return [VCB_BuildPlan(adapter, settings, anchorIndices, sharedBounds) for adapter, anchorIndices in zip(adapters, anchorsList)]
+
+# Read, compute and write the given vertices of a mesh a chunk at a time, so
+# the arrays held at once are bounded by chunkSize. commit and weights work as
+# for VCB_ApplyMesh. Yields the number of vertices written after every chunk
+def VCB_IterApplyMesh(adapter, settings, indices = None, plan = None, anchorIndices = None, chunkSize = CHUNK_SIZE, commit = VCB_Commit, weights = None):
+	if plan is None:
+		plan = VCB_BuildPlan(adapter, settings, anchorIndices)
+	if indices is None:
+		indices = adapter.allIndices()
+	indices = np.asarray(indices, dtype = np.int64)
+
+	with adapter.holdReads():
+		for start in range(0, len(indices), chunkSize):
+			rows = indices[start:start + chunkSize]
+			colors = VCB_ComputeMesh(adapter, settings, rows, plan = plan, weights = None if weights is None else weights[start:start + chunkSize])
+			with profile.VCB_Phase("write", len(colors)):
+				commit(adapter, rows, colors)
+			yield len(rows)
+
+# Color many meshes chunk by chunk, writing every chunk as soon as it's done
+# and keeping its previous colors for undo. progress(done, total) is called
+# after every chunk with the vertex counts; returning False cancels. A
+# cancelled or failed apply puts back every chunk it wrote, cancelling then
+# raises ApplyCancelled. Returns the undo.OperationGroup of the written chunks
+@profile.VCB_Recorded("VCB_ApplyChunked")
+def VCB_ApplyChunked(adapters, settings, indicesList = None, anchorsList = None, chunkSize = CHUNK_SIZE, progress = None, precision = undo.PRECISION_FLOAT16, weightsList = None):
+	if indicesList is None:
+		indicesList = [None] * len(adapters)
+	if weightsList is None:
+		weightsList = [None] * len(adapters)
+
+	with profile.VCB_Phase("plan", len(adapters)):
+		plans = VCB_PlanMeshes(adapters, settings, anchorsList)
+	total = sum(adapter.numVertices() if indices is None else len(indices) for adapter, indices in zip(adapters, indicesList))
+
+	operations = []
+	def Commit(adapter, indices, colors):
+		operation = undo.ColorOperation(adapter, indices, colors, precision)
+		operation.redo()
+		operations.append(operation)
+
+	done = 0
+	try:
+		for adapter, indices, plan, weights in zip(adapters, indicesList, plans, weightsList):
+			for count in VCB_IterApplyMesh(adapter, settings, indices, plan, chunkSize = chunkSize, commit = Commit, weights = weights):
+				done += count
+				if progress is not None and progress(done, total) is False:
+					raise ApplyCancelled("Apply cancelled after %d of %d vertices." % (done, total))
+	except BaseException:
+		with profile.VCB_Phase("rollback", len(operations)):
+			undo.OperationGroup(operations).undo()
+		raise
+
+	return undo.OperationGroup(operations, written = True)
+
+## Channel Packing
+
+# Bake a different gradient into each of the R, G, B and A channels with one
+# read and one write per mesh. channelSettings holds up to four Settings or
+# None, one per channel; each channel takes the same channel of its
+# gradient's colors and blends by its own blend mode, None keeps the current
+# values. anchorsList holds each mesh's anchor or seed vertex indices, shared
+# by every channel that needs them. worldAdapters, world space adapters over
+# the same meshes, are measured by the channels with Combined bounds while the
+# rest stay in the space of adapters. commit works as for VCB_ApplyMesh.
+# Returns the written colors per mesh
+@profile.VCB_Recorded("VCB_BakeChannels")
+def VCB_BakeChannels(adapters, channelSettings, indicesList = None, anchorsList = None, commit = VCB_Commit, worldAdapters = None):
+	channelSettings = list(channelSettings)
+	if len(channelSettings) > 4:
+		raise ValueError("Only four channels can be packed, got %d settings." % len(channelSettings))
+	channelSettings += [None] * (4 - len(channelSettings))
+	if indicesList is None:
+		indicesList = [None] * len(adapters)
+
+	# Which adapters each channel measures its gradient on, None for channels without one
+	channelSpaces = []
+	for settings in channelSettings:
+		if settings is None or settings.mode != 2:
+			channelSpaces.append(None)
+		elif worldAdapters is not None and settings.gradientBounds == 1 and settings.multiMeshBounds == 2: # Combined
+			channelSpaces.append(worldAdapters)
+		else:
+			channelSpaces.append(adapters)
+
+	results = []
+	with contextlib.ExitStack() as stack:
+		# Every channel's plan reads the same geometry, read it once per space
+		for adapter in adapters:
+			stack.enter_context(adapter.holdReads())
+		if worldAdapters is not None and any(space is worldAdapters for space in channelSpaces):
+			for adapter in worldAdapters:
+				stack.enter_context(adapter.holdReads())
+
+		with profile.VCB_Phase("plan", len(adapters)):
+			channelPlans = [VCB_PlanMeshes(space if space is not None else adapters, settings, anchorsList) if settings is not None else [None] * len(adapters) for settings, space in zip(channelSettings, channelSpaces)]
+
+		for mesh, (adapter, indices) in enumerate(zip(adapters, indicesList)):
+			with profile.VCB_Phase("read") as phase:
+				# One read per space the channels measure in
+				spacePositions = {}
+				for space in channelSpaces:
+					if space is not None and id(space) not in spacePositions:
+						spacePositions[id(space)] = space[mesh].getPositions(indices)
+				positions = [spacePositions.get(id(space)) for space in channelSpaces]
+				baseColors, hasColor = adapter.readColors(indices)
+				phase.count = len(baseColors)
+
+			# Unset vertices read as each channel's own fill
+			plans = []
+			for channel, settings in enumerate(channelSettings):
+				plan = channelPlans[channel][mesh]
+				if settings is not None:
+					baseColors[~hasColor, channel] = VCB_FillColor(settings)[channel]
+					if indices is not None:
+						plan = plan.forVertices(indices)
+				plans.append(plan)
+
+			with profile.VCB_Phase("compute", len(baseColors)):
+				blendModes = [settings.blendMode if settings is not None else None for settings in channelSettings]
+				opacities = [settings.opacity if settings is not None else None for settings in channelSettings]
+				colors = kernel.VCB_PackChannels(plans, blendModes, positions, baseColors, opacities)
+
+			with profile.VCB_Phase("write", len(colors)):
+				commit(adapter, indices, colors)
+			results.append(colors)
+
+	return results
+
+## Smooth
+
+# Average the colors of the given vertices with their neighbors, iterations
+# times. strength is how far each pass moves a vertex towards the average and
+# channels masks the RGBA channels that change. The adjacency comes from the
+# cached mesh graph, so repeated smooths only read and write colors.
+# commit works as for VCB_ApplyMesh. Returns the written indices and colors
+@profile.VCB_Recorded("VCB_SmoothMesh")
+def VCB_SmoothMesh(adapter, indices = None, iterations = 1, strength = 1.0, channels = (True, True, True, True), commit = VCB_Commit):
+	vertices = adapter.allIndices() if indices is None else np.asarray(indices, dtype = np.int64)
+
+	with profile.VCB_Phase("graph", len(vertices)):
+		faceCounts, faceIndices = adapter.getFaceVertices()
+		graph = geodesic.VCB_GetGraph(faceCounts, faceIndices, adapter.numVertices())
+		neighbors, counts = graph.adjacency(vertices)
+
+	with profile.VCB_Phase("read") as phase:
+		colors, hasColor = adapter.readColors()
+		phase.count = len(colors)
+
+	with profile.VCB_Phase("compute", len(vertices) * iterations):
+		colors, hasColor = kernel.VCB_SmoothColors(colors, hasColor, vertices, neighbors, counts, iterations, strength, channels)
+
+	# Vertices without a color stay unassigned
+	vertices = vertices[hasColor]
+	colors = colors[hasColor]
+	with profile.VCB_Phase("write", len(colors)):
+		commit(adapter, vertices, colors)
+	return vertices, colors
@@ -0,0 +1,121 @@
+"""
+
+	Soft selection falloff for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Usage
+# indices, weights = falloff.VCB_FalloffWeights(positions, selected, radius)
+# indices, weights = falloff.VCB_FalloffWeights(positions, selected, radius, falloff.VCB_CurveFromMaya("1,0,2,0,1,2"), graph)
+# engine.VCB_ApplyMesh(adapter, settings, indices, weights = weights)
+#
+# In Maya, following the Soft Select settings when they're on:
+# indices, weights = falloff.VCB_SoftSelectWeights(shape, selected, radius)
+
+## Table of Contents
+# Initialization
+# Curves
+# Weights
+# Soft Select
+
+## Imports
+import numpy as np
+
+import VCB.VCB_geodesic as geodesic
+import VCB.VCB_kernel as kernel
+import VCB.VCB_mesh as vmesh
+import VCB.VCB_spatial as spatial
+
+try:
+	import maya.cmds as cmds
+except ImportError: # Running outside of Maya
+	cmds = None
+
+## Initialization
+
+# Maya's softSelect -falloffMode values
+FALLOFF_VOLUME = 0
+FALLOFF_SURFACE = 1
+FALLOFF_GLOBAL = 2
+FALLOFF_OBJECT = 3
+
+# Maya's default soft select curve, full strength at the selection easing out to none at the radius
+DEFAULT_CURVE = "1,0,2,0,1,2"
+
+# Maya curve key interpolations to ramp interpolations. Ramps interpolate
+# every key the same way, the first key's interpolation is used
+CURVE_INTERPOLATIONS = {0: kernel.INTERPOLATION_CONSTANT, 1: kernel.INTERPOLATION_LINEAR, 2: kernel.INTERPOLATION_SMOOTH, 3: kernel.INTERPOLATION_SMOOTH}
+
+## Curves
+
+# Falloff curve from Maya's "value,position,interpolation,..." text as a grey
+# ramp, position 0 at the selection and 1 at the radius
+def VCB_CurveFromMaya(text = DEFAULT_CURVE):
+	values = np.array([float(value) for value in text.split(",") if value.strip()], dtype = np.float64).reshape(-1, 3)
+	stops = np.column_stack([values[:, 1], values[:, 0], values[:, 0], values[:, 0], values[:, 0]])
+	return kernel.Ramp(stops, CURVE_INTERPOLATIONS.get(int(values[0, 2]), kernel.INTERPOLATION_SMOOTH))
+
+## Weights
+
+# Weight of every vertex within radius of the selected ones, measured straight
+# through space or along the edges of graph when one is given. Selected
+# vertices keep full strength, the rest follow curve over distance / radius.
+# Returns the sorted (N,) vertex indices and their (N,) float32 weights
+def VCB_FalloffWeights(positions, selected, radius, curve = None, graph = None):
+	positions = np.asarray(positions, dtype = np.float64).reshape(-1, 3)
+	selected = np.unique(np.asarray(selected, dtype = np.int64))
+	if radius <= 0.0 or not len(selected):
+		return selected, np.ones(len(selected), dtype = np.float32)
+	if curve is None:
+		curve = VCB_CurveFromMaya()
+
+	if graph is not None:
+		distances = graph.distances(positions, selected, radius)
+	else:
+		# Only vertices within radius of the selection's box can be reached,
+		# the rest never go through the spatial index
+		lower = positions[selected].min(axis = 0) - radius
+		upper = positions[selected].max(axis = 0) + radius
+		candidates = np.flatnonzero(np.all((positions >= lower) & (positions <= upper), axis = 1))
+		distances = np.full(len(positions), np.inf)
+		distances[candidates] = spatial.VCB_GetIndex(positions[selected]).distances(positions[candidates], radius)
+
+	indices = np.flatnonzero(distances <= radius)
+	weights = np.clip(curve.evaluate(distances[indices] / radius)[:, 0], 0.0, 1.0)
+	weights[np.searchsorted(indices, selected)] = 1.0
+	return indices, weights.astype(np.float32)
+
+## Soft Select
+
+# Maya's soft select settings as (enabled, radius, falloff mode, curve text)
+def VCB_SoftSelectSettings():
+	return (
+		bool(cmds.softSelect(query = True, softSelectEnabled = True)),
+		float(cmds.softSelect(query = True, softSelectDistance = True)),
+		int(cmds.softSelect(query = True, softSelectFalloff = True)),
+		cmds.softSelect(query = True, softSelectCurve = True) or DEFAULT_CURVE,
+	)
+
+# Falloff weights of a mesh shape around its selected vertices. With Soft
+# Select on its distance, falloff mode and curve are used, otherwise the
+# built-in smooth falloff over radius. Distances are measured in world space
+# like Maya's. Global and Object falloff measure within the mesh as Volume does.
+# Returns the indices and weights as VCB_FalloffWeights does
+def VCB_SoftSelectWeights(shape, selected, radius):
+	enabled, softRadius, falloffMode, curveText = VCB_SoftSelectSettings()
+	curve = None
+	graph = None
+	if enabled:
+		radius = softRadius
+		curve = VCB_CurveFromMaya(curveText)
+
+	adapter = vmesh.MayaMesh(shape, worldSpace = True)
+	if enabled and falloffMode == FALLOFF_SURFACE:
+		faceCounts, faceIndices = adapter.getFaceVertices()
+		graph = geodesic.VCB_GetGraph(faceCounts, faceIndices, adapter.numVertices())
+	return VCB_FalloffWeights(adapter.getPositions(), selected, radius, curve, graph)
@@ -0,0 +1,165 @@
+"""
+
+	Mesh graph for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Table of Contents
+# Initialization
+# Mesh Graph
+# Graph Cache
+
+## Imports
+import collections
+import hashlib
+
+import numpy as np
+
+import VCB.VCB_mesh as vmesh
+
+## Initialization
+
+# Bucket width of the shortest path search, in mean edge lengths. Wider
+# buckets take fewer passes but relax more vertices more than once
+BUCKET_EDGES = 8.0
+
+# Graphs kept for reuse across applies. A million vertex mesh takes about 80MB
+CACHE_SIZE = 4
+
+_cache = collections.OrderedDict()
+
+## Mesh Graph
+
+# Vertex adjacency of a mesh in compressed sparse rows: the neighbors of vertex
+# i are neighbors[offsets[i]:offsets[i + 1]]. Only depends on the topology,
+# edge lengths are measured per set of positions
+class MeshGraph(object):
+	def __init__(self, faceCounts, faceIndices, numVertices):
+		edges = vmesh.VCB_EdgesFromFaces(faceCounts, faceIndices)
+		self.numVertices = int(numVertices)
+		self.numEdges = len(edges)
+
+		# Both directions of every edge, grouped by the vertex they leave
+		sources = np.concatenate([edges[:, 0], edges[:, 1]])
+		targets = np.concatenate([edges[:, 1], edges[:, 0]])
+		order = np.argsort(sources, kind = "stable")
+
+		self.offsets = np.zeros(self.numVertices + 1, dtype = np.int64)
+		np.cumsum(np.bincount(sources, minlength = self.numVertices), out = self.offsets[1:])
+		self.sources = sources[order].astype(np.int32)
+		self.neighbors = targets[order].astype(np.int32)
+
+		self._lengths = None
+		self._lengthsKey = None
+
+	# Length of every directed edge as float32, kept for the last positions
+	def lengths(self, positions):
+		positions = np.ascontiguousarray(positions, dtype = np.float64).reshape(-1, 3)
+		if len(positions) != self.numVertices:
+			raise ValueError("Expected %d positions, got %d." % (self.numVertices, len(positions)))
+
+		key = hashlib.sha1(positions.tobytes()).hexdigest()
+		if key != self._lengthsKey:
+			delta = positions[self.neighbors] - positions[self.sources]
+			self._lengths = np.sqrt(np.einsum("ij,ij->i", delta, delta)).astype(np.float32)
+			self._lengthsKey = key
+		return self._lengths
+
+	# Distance along the edges from every vertex to the nearest seed vertex,
+	# inf past radius or on pieces of the mesh without a seed. Returns (N,) float64
+	def distances(self, positions, seeds, radius = None):
+		lengths = self.lengths(positions)
+		limit = np.inf if radius is None else float(radius)
+		result = np.full(self.numVertices, np.inf)
+
+		seeds = np.unique(np.asarray(seeds, dtype = np.int64))
+		if len(seeds) and (seeds[0] < 0 or seeds[-1] >= self.numVertices):
+			raise ValueError("Seed vertex %d is out of range." % (seeds[0] if seeds[0] < 0 else seeds[-1]))
+		result[seeds] = 0.0
+		if not self.numEdges or not len(seeds):
+			return result
+
+		# Multi-source Dijkstra with the heap swapped for distance buckets, so
+		# each pass relaxes a whole bucket of vertices in a few array calls.
+		# Vertices only settle once their bucket is done, any vertex improved
+		# since is relaxed again, which keeps the result exact
+		width = BUCKET_EDGES * float(lengths.mean()) or np.inf
+		threshold = width
+		near = seeds
+		far = np.zeros(0, dtype = np.int64)
+		while True:
+			while len(near):
+				near = self._relax(result, lengths, near, limit)
+				inBucket = result[near] < threshold
+				far = np.concatenate([far, near[~inBucket]])
+				near = near[inBucket]
+
+			# Next bucket that has anything in it
+			far = np.unique(far[result[far] >= threshold])
+			if not len(far):
+				return result
+			threshold = result[far].min() + width
+			inBucket = result[far] < threshold
+			near = far[inBucket]
+			far = far[~inBucket]
+
+	# Positions in neighbors of every edge leaving the given vertices, in the
+	# order of the vertices, plus the number of edges of each
+	def _edgesOf(self, vertices):
+		starts = self.offsets[vertices]
+		counts = self.offsets[vertices + 1] - starts
+
+		# Gather the CSR slices of all the vertices in one go
+		ends = np.cumsum(counts)
+		edges = np.repeat(starts - (ends - counts), counts) + np.arange(int(ends[-1]) if len(ends) else 0)
+		return edges, counts
+
+	# Rows of the adjacency matrix for the given vertices, as the (E,) neighbor
+	# of every edge and the (V,) number of edges per vertex
+	def adjacency(self, vertices):
+		edges, counts = self._edgesOf(np.asarray(vertices, dtype = np.int64))
+		return self.neighbors[edges], counts
+
+	# Relax every edge leaving the given vertices. Returns the vertices whose
+	# distance went down
+	def _relax(self, result, lengths, vertices, limit):
+		edges, counts = self._edgesOf(vertices)
+		if not len(edges):
+			return vertices[0:0]
+
+		targets = self.neighbors[edges]
+		candidates = np.repeat(result[vertices], counts) + lengths[edges]
+
+		better = (candidates < result[targets]) & (candidates <= limit)
+		targets = targets[better]
+		np.minimum.at(result, targets, candidates[better])
+		return np.unique(targets).astype(np.int64)
+
+## Graph Cache
+
+# Adjacency graph of a mesh topology, reused while the same polygons are asked
+# for so repeated applies skip the rebuild
+def VCB_GetGraph(faceCounts, faceIndices, numVertices):
+	faceCounts = np.ascontiguousarray(faceCounts, dtype = np.int64)
+	faceIndices = np.ascontiguousarray(faceIndices, dtype = np.int64)
+
+	digest = hashlib.sha1(faceCounts.tobytes())
+	digest.update(faceIndices.tobytes())
+	key = (int(numVertices), digest.hexdigest())
+
+	if key in _cache:
+		_cache.move_to_end(key)
+		return _cache[key]
+
+	graph = _cache[key] = MeshGraph(faceCounts, faceIndices, numVertices)
+	while len(_cache) > CACHE_SIZE:
+		_cache.popitem(last = False)
+	return graph
+
+def VCB_ClearGraphCache():
+	_cache.clear()
@@ -0,0 +1,409 @@
+"""
+
+	Batched color kernel for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Table of Contents
+# Ramps
+# Gradient Plan
+# Colors
+# Blending
+# Smoothing
+
+## Imports
+import copy
+
+import numpy as np
+
+## Initialization
+
+# Spans shorter than this are treated as zero, every vertex then gets the main color
+EPSILON = 1e-8
+
+# Blend modes, matching the blendMode_VCB option var
+BLEND_REPLACE = 1
+BLEND_ADD = 2
+BLEND_MULTIPLY = 3
+BLEND_SCREEN = 4
+BLEND_OVERLAY = 5
+BLEND_SUBTRACT = 6
+BLEND_MIN = 7
+BLEND_MAX = 8
+BLEND_LERP = 9
+
+# Base color per blend mode that vertices without an assigned color are
+# blended over by default. Most modes then give the new color unchanged, but
+# Subtract takes it from white, giving 1 - color, and Lerp mixes it in from
+# transparent black by its alpha. Filled in as the blend modes are registered
+NEUTRAL_COLORS = {}
+
+# Ramp interpolation between stops, matching the rampInterpolation_VCB option var
+INTERPOLATION_LINEAR = 1
+INTERPOLATION_SMOOTH = 2
+INTERPOLATION_CONSTANT = 3
+
+# Entries in a baked ramp lookup table
+RAMP_RESOLUTION = 1024
+
+## Ramps
+
+# Gradient with any number of (position, r, g, b, a) stops. Positions run from
+# the main (0) to the sub (1) end of the gradient
+class Ramp(object):
+	def __init__(self, stops, interpolation = INTERPOLATION_LINEAR):
+		stops = np.asarray(stops, dtype = np.float64).reshape(-1, 5)
+		if not len(stops):
+			raise ValueError("A ramp needs at least one stop.")
+
+		order = np.argsort(stops[:, 0], kind = "stable")
+		self.positions = np.clip(stops[order, 0], 0.0, 1.0)
+		self.colors = stops[order, 1:5]
+		self.interpolation = int(interpolation)
+
+	# Build a ramp from the flat [position, r, g, b, a, ...] list kept in the rampStops_VCB option var
+	@classmethod
+	def fromFlat(cls, values, interpolation = INTERPOLATION_LINEAR):
+		return cls(np.asarray(values, dtype = np.float64).reshape(-1, 5), interpolation)
+
+	def flat(self):
+		return np.column_stack([self.positions, self.colors]).ravel().tolist()
+
+	# RGBA of the ramp at each position in [0,1]. Returns (N,4) float32
+	def evaluate(self, positions):
+		positions = np.clip(np.asarray(positions, dtype = np.float64).ravel(), 0.0, 1.0)
+		last = len(self.positions) - 1
+
+		# Stops on either side of each position, the end stops hold past the ends
+		right = np.searchsorted(self.positions, positions, side = "right")
+		left = np.clip(right - 1, 0, last)
+		right = np.clip(right, 0, last)
+
+		span = self.positions[right] - self.positions[left]
+		factor = np.zeros(len(positions))
+		spanned = span > EPSILON
+		factor[spanned] = (positions[spanned] - self.positions[left][spanned]) / span[spanned]
+
+		if self.interpolation == INTERPOLATION_SMOOTH:
+			factor = factor * factor * (3.0 - 2.0 * factor)
+		elif self.interpolation == INTERPOLATION_CONSTANT:
+			factor[:] = 0.0
+
+		colors = self.colors[left] + (self.colors[right] - self.colors[left]) * factor[:, None]
+		return colors.astype(np.float32)
+
+	# Sample the ramp into a fixed size RGBA lookup table
+	def bake(self, resolution = RAMP_RESOLUTION):
+		return self.evaluate(np.linspace(0.0, 1.0, resolution))
+
+# Look up each weight in a baked ramp, one gather however many stops the ramp has
+def VCB_RampLookup(lut, weights):
+	indices = np.rint(np.asarray(weights, dtype = np.float32).ravel() * (len(lut) - 1)).astype(np.intp)
+	return lut[indices]
+
+## Gradient Plan
+
+# Everything a gradient needs, resolved once per apply. Evaluating vertices
+# only reads from the plan, so no scene queries happen per vertex. A ramp
+# replaces the main to sub colors and is baked into a lookup table here
+class GradientPlan(object):
+	def __init__(self, mode, colorMain, colorSub, alphaMain, alphaSub, gradientMode = 1, gradientDirection = 1, boundsMin = None, boundsMax = None, pointOne = None, pointTwo = None, ramp = None, seedIndex = None, radius = None, vertexDistances = None):
+		self.mode = mode
+		self.gradientMode = gradientMode
+		self.gradientDirection = gradientDirection
+
+		# Color endpoints
+		self.colorStart = np.array([colorMain[0], colorMain[1], colorMain[2], alphaMain], dtype = np.float32)
+		self.colorEnd = np.array([colorSub[0], colorSub[1], colorSub[2], alphaSub], dtype = np.float32)
+		self.colorDelta = self.colorEnd - self.colorStart
+		self.lut = ramp.bake() if ramp is not None else None
+
+		self.axis = None
+		self.boundsMin = None
+		self.boundsMax = None
+		self.anchor = None
+		self.target = None
+		self.seedIndex = None
+		self.vertexDistances = None
+		self.radius = None
+		self.invSpan = 0.0
+
+		if mode != 2: # Standard
+			return
+
+		if gradientMode == 4: # Surface
+			self.vertexDistances = np.asarray(vertexDistances, dtype = np.float64)
+			self.radius = float(radius)
+			span = self.radius
+		elif gradientMode == 3: # Selection
+			self.seedIndex = seedIndex
+			self.radius = float(radius)
+			span = self.radius
+		elif gradientMode == 2: # Point to Point
+			self.anchor = np.asarray(pointOne, dtype = np.float64)
+			self.target = np.asarray(pointTwo, dtype = np.float64)
+			span = np.linalg.norm(self.target - self.anchor)
+		else: # Mesh Bounds
+			self.axis = gradientDirection - 1 # X, Y, Z
+			self.boundsMin = np.asarray(boundsMin, dtype = np.float64)
+			self.boundsMax = np.asarray(boundsMax, dtype = np.float64)
+			span = self.boundsMax[self.axis] - self.boundsMin[self.axis]
+
+		# Degenerate gradients (flat axis, coincident anchors, zero radius) collapse to the main color
+		if abs(span) > EPSILON:
+			self.invSpan = 1.0 / span
+
+	# Plan for only the given vertices of the mesh. Surface distances are
+	# measured per vertex and have to be cut down to match, other plans only
+	# depend on positions and are returned as is
+	def forVertices(self, indices):
+		if self.vertexDistances is None:
+			return self
+		plan = copy.copy(self)
+		plan.vertexDistances = self.vertexDistances[indices]
+		return plan
+
+	# Return every position's distance between the gradient bounds as percent.
+	# positions is an (N,3) array, the result an (N,) float32 array
+	def weights(self, positions):
+		positions = np.asarray(positions, dtype = np.float64).reshape(-1, 3)
+
+		if self.mode != 2: # Standard
+			return np.zeros(len(positions), dtype = np.float32)
+
+		if self.gradientMode in (3, 4): # Selection, Surface
+			if self.gradientMode == 4:
+				# Measured ahead of time for every vertex of the mesh
+				if len(positions) != len(self.vertexDistances):
+					raise ValueError("Surface plans must be cut down to the colored vertices with forVertices.")
+				distances = self.vertexDistances
+			else:
+				distances = self.seedIndex.distances(positions, self.radius)
+			weights = np.ones(len(positions))
+			inside = np.isfinite(distances)
+			weights[inside] = distances[inside] * self.invSpan
+		elif self.gradientMode == 2: # Point to Point
+			weights = np.linalg.norm(positions - self.anchor, axis = 1) * self.invSpan
+		else: # Mesh Bounds
+			weights = np.abs((positions[:, self.axis] - self.boundsMax[self.axis]) * self.invSpan)
+
+		return np.clip(weights, 0.0, 1.0).astype(np.float32)
+
+	# Interpolate from the main to the sub color, or along the ramp, by each
+	# weight. Returns (N,4) float32
+	def lerp(self, weights):
+		if self.lut is not None:
+			return VCB_RampLookup(self.lut, weights)
+		weights = np.asarray(weights, dtype = np.float32).reshape(-1, 1)
+		return self.colorStart + self.colorDelta * weights
+
+	# Gradient colors for a batch of positions
+	def colors(self, positions):
+		return self.lerp(self.weights(positions))
+
+## Colors
+
+# Interpolate from the main to the sub color by each weight. Returns (N,4) float32
+def VCB_LerpColors(colorMain, colorSub, alphaMain, alphaSub, weights):
+	return GradientPlan(1, colorMain, colorSub, alphaMain, alphaSub).lerp(weights)
+
+## Blending
+
+# Blend mode code -> (name, function). A function takes the (N,4) float32 base
+# and new colors and returns a new array of the blended colors, clamping is
+# left to VCB_BlendColors. Modes only ever run through the table
+_blendModes = {}
+
+# Add a blend mode. neutral is the base color unset vertices are read as,
+# see NEUTRAL_COLORS
+def VCB_RegisterBlendMode(blendMode, name, function, neutral = (0.0, 0.0, 0.0, 0.0)):
+	_blendModes[int(blendMode)] = (name, function)
+	NEUTRAL_COLORS[int(blendMode)] = tuple(float(c) for c in neutral)
+
+# Blend mode code -> name, in code order
+def VCB_BlendModes():
+	return dict((blendMode, _blendModes[blendMode][0]) for blendMode in sorted(_blendModes))
+
+def _VCB_Replace(base, colors):
+	return np.array(colors, dtype = np.float32)
+
+def _VCB_Add(base, colors):
+	return base + colors
+
+def _VCB_Multiply(base, colors):
+	return base * colors
+
+# 1 - (1 - base)(1 - color), lightens like Add without blowing out
+def _VCB_Screen(base, colors):
+	result = (1.0 - base) * (1.0 - colors)
+	return np.subtract(1.0, result, out = result)
+
+# Multiply below a base of 0.5 and Screen above it, both doubled. Written as
+# 2bc plus the Screen side's difference (2b + 2c - 4bc - 1) where the base is
+# high, which is half the work of computing both sides and picking
+def _VCB_Overlay(base, colors):
+	doubled = base * colors
+	result = base + colors
+	result -= doubled
+	result -= doubled
+	result *= 2.0
+	result -= 1.0
+	result *= base >= 0.5
+	doubled *= 2.0
+	result += doubled
+	return result
+
+def _VCB_Subtract(base, colors):
+	return base - colors
+
+def _VCB_Min(base, colors):
+	return np.minimum(base, colors)
+
+def _VCB_Max(base, colors):
+	return np.maximum(base, colors)
+
+# Mix towards the new color by its own alpha
+def _VCB_Lerp(base, colors):
+	colors = np.broadcast_to(colors, base.shape)
+	return base + (colors - base) * colors[:, 3:4]
+
+VCB_RegisterBlendMode(BLEND_REPLACE, "replace", _VCB_Replace)
+VCB_RegisterBlendMode(BLEND_ADD, "add", _VCB_Add)
+VCB_RegisterBlendMode(BLEND_MULTIPLY, "multiply", _VCB_Multiply, (1.0, 1.0, 1.0, 1.0))
+VCB_RegisterBlendMode(BLEND_SCREEN, "screen", _VCB_Screen)
+VCB_RegisterBlendMode(BLEND_OVERLAY, "overlay", _VCB_Overlay, (0.5, 0.5, 0.5, 0.5))
+VCB_RegisterBlendMode(BLEND_SUBTRACT, "subtract", _VCB_Subtract, (1.0, 1.0, 1.0, 1.0))
+VCB_RegisterBlendMode(BLEND_MIN, "min", _VCB_Min, (1.0, 1.0, 1.0, 1.0))
+VCB_RegisterBlendMode(BLEND_MAX, "max", _VCB_Max)
+VCB_RegisterBlendMode(BLEND_LERP, "lerp", _VCB_Lerp)
+
+# Whether a blend's result depends on the base colors. Only a full strength
+# Replace on every channel ignores them
+def VCB_BlendReadsBase(blendMode, opacity = 1.0, channels = None):
+	return blendMode != BLEND_REPLACE or opacity < 1.0 or (channels is not None and not all(channels))
+
+# Blend new colors over (N,4) base colors with the given blend mode, clamp the
+# result to [0,1], then mix it back toward the base by 1 - opacity. Channels
+# switched off in the RGBA channels mask keep the base colors
+def VCB_BlendColors(baseColors, colors, blendMode, opacity = 1.0, channels = None):
+	if int(blendMode) not in _blendModes:
+		raise ValueError("Unknown blend mode %s." % blendMode)
+	baseColors = np.asarray(baseColors, dtype = np.float32)
+	colors = np.asarray(colors, dtype = np.float32)
+
+	result = _blendModes[int(blendMode)][1](baseColors, colors)
+	np.clip(result, 0.0, 1.0, out = result)
+
+	if opacity < 1.0:
+		result -= baseColors
+		result *= max(float(opacity), 0.0)
+		result += baseColors
+	if channels is not None and not all(channels):
+		masked = ~np.asarray(channels, dtype = bool)
+		result[:, masked] = baseColors[:, masked]
+	return result
+
+# Fade blended colors back toward the base colors, keeping weights of each
+# vertex's change. Soft selections pass their falloff weights here
+def VCB_WeightColors(baseColors, colors, weights):
+	baseColors = np.asarray(baseColors, dtype = np.float32).reshape(-1, 4)
+	weights = np.clip(np.asarray(weights, dtype = np.float32).reshape(-1, 1), 0.0, 1.0)
+	return baseColors + (np.asarray(colors, dtype = np.float32) - baseColors) * weights
+
+# Colors with every channel taken from its own plan: channel c gets channel c
+# of plans[c]'s colors, blended over the base by blendModes[c] at opacities[c].
+# A plan of None leaves its channel as it is. positions is one array for every
+# channel, or a list of each channel's own when they measure in different spaces
+def VCB_PackChannels(plans, blendModes, positions, baseColors, opacities = None):
+	result = np.array(baseColors, dtype = np.float32).reshape(-1, 4)
+	if opacities is None:
+		opacities = [1.0] * len(plans)
+	if not isinstance(positions, (list, tuple)):
+		positions = [positions] * len(plans)
+
+	for channel, (plan, blendMode, opacity, channelPositions) in enumerate(zip(plans, blendModes, opacities, positions)):
+		if plan is None:
+			continue
+		if plan.mode == 2: # Gradient
+			weights = plan.weights(channelPositions)
+		else: # Standard
+			weights = np.zeros(len(result), dtype = np.float32)
+		mask = [index == channel for index in range(4)]
+		result = VCB_BlendColors(result, plan.lerp(weights), blendMode, opacity, mask)
+
+	return result
+
+# Compute the final colors for a batch of vertices from a gradient plan.
+# opacity and channels work as for VCB_BlendColors
+def VCB_ComputeColors(plan, positions, baseColors, blendMode, opacity = 1.0, channels = None):
+	baseColors = np.asarray(baseColors, dtype = np.float32).reshape(-1, 4)
+
+	if plan.mode == 2: # Gradient
+		colors = plan.colors(positions)
+	else: # Standard
+		colors = np.broadcast_to(plan.colorStart, baseColors.shape)
+
+	return VCB_BlendColors(baseColors, colors, blendMode, opacity, channels)
+
+## Smoothing
+
+# Average the colors of the given vertices with their neighbors' colors,
+# iterations times. colors and hasColor cover the whole mesh, neighbors and
+# counts are the adjacency rows of vertices (see MeshGraph.adjacency). Each
+# pass moves a vertex strength of the way to the average, only in the RGBA
+# channels set in channels. Only vertices that have a color change, averaged
+# over their colored neighbors; vertices without one stay unassigned.
+# Returns the (V,4) float32 colors and (V,) bool has-color mask of vertices
+def VCB_SmoothColors(colors, hasColor, vertices, neighbors, counts, iterations = 1, strength = 1.0, channels = (True, True, True, True)):
+	colors = np.array(colors, dtype = np.float32).reshape(-1, 4)
+	hasColor = np.asarray(hasColor, dtype = bool)
+	vertices = np.asarray(vertices, dtype = np.int64)
+
+	# One contiguous array per channel, gathering along a 1D array is much
+	# quicker than picking rows and columns out of the (N,4) colors
+	planes = [np.ascontiguousarray(colors[:, channel]) for channel in np.flatnonzero(channels)]
+
+	# Sum rows as segments of the edge list, skipping rows without neighbors
+	# that reduceat can't sum
+	counts = np.asarray(counts, dtype = np.int64)
+	rows = np.flatnonzero(counts)
+	starts = (np.cumsum(counts) - counts)[rows]
+	targets = vertices[rows]
+
+	if len(rows) and planes:
+		# The colored vertices never change, so neither do the rows that move
+		if hasColor.all():
+			# Every vertex has a color, a plain average of the neighbors
+			neighborWeights = None
+			updated = targets
+			scale = (1.0 / counts[rows]).astype(np.float32)
+		else:
+			# Uncolored neighbors are left out of the average
+			neighborWeights = hasColor[neighbors].astype(np.float32)
+			total = np.add.reduceat(neighborWeights, starts)
+			moving = (total > 0.0) & hasColor[targets]
+			updated = targets[moving]
+			scale = 1.0 / total[moving]
+		step = np.float32(strength)
+
+		for i in range(iterations):
+			# Every vertex moves towards the average of the previous pass
+			for plane in planes:
+				values = plane[neighbors]
+				if neighborWeights is not None:
+					values *= neighborWeights
+				average = np.add.reduceat(values, starts)
+				if neighborWeights is not None:
+					average = average[moving]
+				current = plane[updated]
+				plane[updated] = current + (average * scale - current) * step
+
+		for channel, plane in zip(np.flatnonzero(channels), planes):
+			colors[:, channel] = plane
+
+	return np.clip(colors[vertices], 0.0, 1.0), hasColor[vertices]
@@ -0,0 +1,377 @@
+"""
+
+	Mesh adapters for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Table of Contents
+# Initialization
+# Topology
+# Adapter Base
+# In-Memory Mesh
+# Maya Mesh
+
+## Imports
+import collections
+import contextlib
+import hashlib
+import itertools
+
+import numpy as np
+
+try:
+	import maya.api.OpenMaya as om
+	import maya.cmds as cmds
+except ImportError: # Running outside of Maya
+	om = None
+	cmds = None
+
+## Initialization
+
+# Color read back for vertices that have no color assigned, unless a fill is given
+UNSET_COLOR = (0.0, 0.0, 0.0, 1.0)
+
+# Edge vertex tables of Maya meshes kept for reuse, and how many edges are
+# read on their own before the whole table is read and cached instead
+EDGE_CACHE_SIZE = 8
+EDGE_READ_LIMIT = 1024
+
+_edgeCache = collections.OrderedDict()
+
+## Topology
+
+# Start offset of every face in the flat face vertex list, plus the total at the end
+def VCB_FaceOffsets(faceCounts):
+	offsets = np.zeros(len(faceCounts) + 1, dtype = np.int64)
+	np.cumsum(faceCounts, out = offsets[1:])
+	return offsets
+
+# Unique vertex pairs of every polygon edge as an (E,2) int64 array, smaller index first
+def VCB_EdgesFromFaces(faceCounts, faceIndices):
+	faceCounts = np.asarray(faceCounts, dtype = np.int64)
+	faceIndices = np.asarray(faceIndices, dtype = np.int64)
+
+	# Each face vertex connects to the next one around its face
+	faceStarts = np.repeat(VCB_FaceOffsets(faceCounts)[:-1], faceCounts)
+	corner = np.arange(len(faceIndices)) - faceStarts
+	nextCorner = faceStarts + (corner + 1) % np.repeat(faceCounts, faceCounts)
+
+	first = faceIndices
+	second = faceIndices[nextCorner]
+	low = np.minimum(first, second)
+	high = np.maximum(first, second)
+
+	# Pack each pair into one key, far quicker to make unique than rows
+	stride = int(faceIndices.max()) + 1 if len(faceIndices) else 1
+	keys = np.sort(low * stride + high)
+	keys = np.concatenate([keys[0:1], keys[1:][keys[1:] != keys[:-1]]])
+	return np.stack([keys // stride, keys % stride], axis = 1)
+
+# Unique vertex indices used by the given faces
+def VCB_FaceVertexIndices(faces, faceCounts, faceIndices):
+	faces = np.asarray(faces, dtype = np.int64)
+	offsets = VCB_FaceOffsets(faceCounts)
+
+	# Gather every selected face's slice of the flat list in one go
+	lengths = np.asarray(faceCounts, dtype = np.int64)[faces]
+	starts = np.repeat(offsets[faces] - VCB_FaceOffsets(lengths)[:-1], lengths)
+	return np.unique(np.asarray(faceIndices, dtype = np.int64)[starts + np.arange(lengths.sum())])
+
+## Adapter Base
+
+# Every mesh VCB works on goes through an adapter. Reads and writes are bulk
+# array calls, so nothing touches the scene one vertex at a time.
+# indices of None means every vertex on the mesh
+class MeshAdapter(object):
+	# Name used in messages and reports
+	name = "mesh"
+
+	# Number of vertices on the mesh
+	def numVertices(self):
+		raise NotImplementedError
+
+	# Vertex positions as an (N,3) float64 array
+	def getPositions(self, indices = None):
+		raise NotImplementedError
+
+	# Vertex colors as one contiguous (N,4) float32 buffer plus an (N,) bool
+	# mask of the vertices that have a color assigned. Unassigned vertices are set to fill
+	def readColors(self, indices = None, fill = UNSET_COLOR):
+		raise NotImplementedError
+
+	# Vertex colors as an (N,4) float32 array, unassigned vertices come back as fill
+	def getColors(self, indices = None, fill = UNSET_COLOR):
+		return self.readColors(indices, fill)[0]
+
+	# Indices of the selected vertices as an int64 array
+	def getSelectedIndices(self):
+		raise NotImplementedError
+
+	# Polygon vertices as (faceCounts, faceIndices) int64 arrays
+	def getFaceVertices(self):
+		raise NotImplementedError
+
+	# Number of edges on the mesh
+	def numEdges(self):
+		return len(self.getEdgeVertices())
+
+	# Vertex pair of the given edge ids, or of every edge, as an (E,2) int64 array
+	def getEdgeVertices(self, edges = None):
+		raise NotImplementedError
+
+	# Write RGBA colors to the given vertex indices in a single bulk call
+	def setColors(self, indices, colors):
+		raise NotImplementedError
+
+	# Remove the colors of the given vertices, leaving them unassigned
+	def clearColors(self, indices):
+		raise NotImplementedError
+
+	# Every vertex index on the mesh
+	def allIndices(self):
+		return np.arange(self.numVertices(), dtype = np.int64)
+
+	# Block that reads the mesh a chunk at a time. Adapters that can only read
+	# every vertex at once keep those arrays for the length of the block
+	def holdReads(self):
+		return contextlib.nullcontext(self)
+
+## In-Memory Mesh
+
+# Stand-in mesh that keeps its positions, colors and optional polygons in
+# arrays. Without colors every vertex starts out unassigned
+class MemoryMesh(MeshAdapter):
+	def __init__(self, positions, colors = None, selected = None, name = "memoryMesh", faceCounts = None, faceIndices = None, hasColor = None):
+		self.name = name
+		self.positions = np.array(positions, dtype = np.float64).reshape(-1, 3)
+		self.faceCounts = np.array(faceCounts if faceCounts is not None else [], dtype = np.int64)
+		self.faceIndices = np.array(faceIndices if faceIndices is not None else [], dtype = np.int64)
+		self._edges = None
+
+		if colors is None:
+			self.colors = np.empty((len(self.positions), 4), dtype = np.float32)
+			self.colors[:] = UNSET_COLOR
+			self.hasColor = np.zeros(len(self.positions), dtype = bool)
+		else:
+			self.colors = np.array(colors, dtype = np.float32).reshape(-1, 4)
+			self.hasColor = np.ones(len(self.colors), dtype = bool)
+		if len(self.colors) != len(self.positions):
+			raise ValueError("Expected %d colors, got %d." % (len(self.positions), len(self.colors)))
+
+		if hasColor is not None:
+			self.hasColor = np.array(hasColor, dtype = bool)
+
+		if selected is None:
+			self.selected = self.allIndices()
+		else:
+			self.selected = np.array(selected, dtype = np.int64)
+
+		self.writeCount = 0
+
+	def numVertices(self):
+		return len(self.positions)
+
+	def getPositions(self, indices = None):
+		if indices is None:
+			return self.positions.copy()
+		return self.positions[indices]
+
+	def readColors(self, indices = None, fill = UNSET_COLOR):
+		if indices is None:
+			indices = slice(None)
+		colors = self.colors[indices].copy()
+		hasColor = self.hasColor[indices].copy()
+		colors[~hasColor] = fill
+		return colors, hasColor
+
+	def getSelectedIndices(self):
+		return self.selected.copy()
+
+	def getFaceVertices(self):
+		return self.faceCounts, self.faceIndices
+
+	def getEdgeVertices(self, edges = None):
+		if self._edges is None:
+			self._edges = VCB_EdgesFromFaces(self.faceCounts, self.faceIndices)
+		return self._edges if edges is None else self._edges[edges]
+
+	def setColors(self, indices, colors):
+		colors = np.asarray(colors, dtype = np.float32).reshape(-1, 4)
+		if indices is None:
+			indices = self.allIndices()
+		if len(indices) != len(colors):
+			raise ValueError("Expected one color per index, got %d indices and %d colors." % (len(indices), len(colors)))
+
+		self.colors[indices] = colors
+		self.hasColor[indices] = True
+		self.writeCount += 1
+
+	def clearColors(self, indices):
+		self.colors[indices] = UNSET_COLOR
+		self.hasColor[indices] = False
+
+## Maya Mesh
+
+# Adapter over a Maya mesh shape using the OpenMaya 2.0 function set.
+# Positions are in object space unless worldSpace is set
+class MayaMesh(MeshAdapter):
+	def __init__(self, mesh, worldSpace = False):
+		self.space = om.MSpace.kWorld if worldSpace else om.MSpace.kObject
+
+		selList = om.MSelectionList()
+		selList.add(str(mesh))
+
+		self.dagPath = selList.getDagPath(0)
+		self.dagPath.extendToShape()
+		self.fnMesh = om.MFnMesh(self.dagPath)
+		self.name = self.dagPath.partialPathName()
+		self._held = None
+
+	def numVertices(self):
+		return self.fnMesh.numVertices
+
+	# MFnMesh only reads every vertex at once. Inside the block the arrays are
+	# read once and kept up to date by the writes, instead of read per chunk
+	@contextlib.contextmanager
+	def holdReads(self):
+		self._held = {}
+		try:
+			yield self
+		finally:
+			self._held = None
+
+	def _readPositions(self):
+		if self._held is not None and "positions" in self._held:
+			return self._held["positions"]
+		positions = np.array(self.fnMesh.getPoints(self.space), dtype = np.float64)[:, 0:3]
+		if self._held is not None:
+			self._held["positions"] = positions
+		return positions
+
+	# Every vertex color, with -1 for unassigned vertices
+	def _readColors(self):
+		if self._held is not None and "colors" in self._held:
+			return self._held["colors"]
+		# Maya reports unassigned vertices with the unset color, -1 can't be a real color
+		colorArray = self.fnMesh.getVertexColors(defaultUnsetColor = om.MColor((-1.0, -1.0, -1.0, -1.0)))
+		colors = np.fromiter(itertools.chain.from_iterable(colorArray), dtype = np.float32, count = len(colorArray) * 4).reshape(-1, 4)
+		if self._held is not None:
+			self._held["colors"] = colors
+		return colors
+
+	def getPositions(self, indices = None):
+		positions = self._readPositions()
+		if indices is None:
+			return positions.copy() if self._held is not None else positions
+		return positions[indices]
+
+	def readColors(self, indices = None, fill = UNSET_COLOR):
+		colors = self._readColors()
+		colors = colors.copy() if indices is None else colors[indices]
+
+		hasColor = (colors != -1.0).any(axis = 1)
+		colors[~hasColor] = fill
+		return colors, hasColor
+
+	def getSelectedIndices(self):
+		selected = [np.zeros(0, dtype = np.int64)]
+		selIter = om.MItSelectionList(om.MGlobal.getActiveSelectionList())
+		while not selIter.isDone():
+			dagPath, component = selIter.getComponent()
+			selIter.next()
+			if dagPath.extendToShape() != self.dagPath:
+				continue
+
+			# Whole object
+			if component.isNull():
+				return self.allIndices()
+
+			elements = np.array(om.MFnSingleIndexedComponent(component).getElements(), dtype = np.int64)
+			if component.apiType() == om.MFn.kMeshVertComponent:
+				selected.append(elements)
+			elif component.apiType() == om.MFn.kMeshPolygonComponent:
+				selected.append(VCB_FaceVertexIndices(elements, *self.getFaceVertices()))
+			elif component.apiType() == om.MFn.kMeshEdgeComponent:
+				selected.append(self.getEdgeVertices(elements).ravel() if len(elements) < EDGE_READ_LIMIT else VCB_ComponentVertices(self.dagPath, component))
+
+		return np.unique(np.concatenate(selected))
+
+	def getFaceVertices(self):
+		faceCounts, faceIndices = self.fnMesh.getVertices()
+		return np.array(faceCounts, dtype = np.int64), np.array(faceIndices, dtype = np.int64)
+
+	def numEdges(self):
+		return self.fnMesh.numEdges
+
+	# Maya has no bulk query for edge vertices. A few edges are read on their
+	# own, more than that reads the whole table once and keeps it for as long
+	# as the mesh has the same polygons
+	def getEdgeVertices(self, edges = None):
+		if edges is not None:
+			edges = np.asarray(edges, dtype = np.int64).reshape(-1)
+			if len(edges) < EDGE_READ_LIMIT:
+				pairs = [self.fnMesh.getEdgeVertices(edge) for edge in edges.tolist()]
+				return np.array(pairs, dtype = np.int64).reshape(-1, 2)
+
+		faceCounts, faceIndices = self.getFaceVertices()
+		digest = hashlib.sha1(faceCounts.tobytes())
+		digest.update(faceIndices.tobytes())
+		key = (self.dagPath.fullPathName(), digest.hexdigest())
+
+		if key in _edgeCache:
+			_edgeCache.move_to_end(key)
+		else:
+			edgeIter = om.MItMeshEdge(self.dagPath)
+			table = np.zeros((self.fnMesh.numEdges, 2), dtype = np.int64)
+			while not edgeIter.isDone():
+				table[edgeIter.index()] = (edgeIter.vertexId(0), edgeIter.vertexId(1))
+				edgeIter.next()
+			_edgeCache[key] = table
+			while len(_edgeCache) > EDGE_CACHE_SIZE:
+				_edgeCache.popitem(last = False)
+
+		table = _edgeCache[key]
+		return table if edges is None else table[edges]
+
+	def setColors(self, indices, colors):
+		colors = np.asarray(colors, dtype = np.float32).reshape(-1, 4)
+		if indices is None:
+			indices = self.allIndices()
+		indices = np.asarray(indices, dtype = np.int64)
+
+		# One call each way, no Python loop over the vertices
+		self.fnMesh.setVertexColors(om.MColorArray(colors.tolist()), indices.tolist())
+		if self._held is not None and "colors" in self._held:
+			self._held["colors"][indices] = colors
+
+		# Match polyColorPerVertex's colorDisplayOption flag
+		cmds.setAttr(self.dagPath.fullPathName() + ".displayColors", True)
+
+	def clearColors(self, indices):
+		self.fnMesh.removeVertexColors(np.asarray(indices, dtype = np.int64).tolist())
+		if self._held is not None and "colors" in self._held:
+			self._held["colors"][indices] = -1.0
+
+# Vertex indices of a mesh component of any type, converted by Maya in one
+# call instead of walking its elements
+def VCB_ComponentVertices(dagPath, component):
+	selList = om.MSelectionList()
+	selList.add((dagPath, component))
+	converted = cmds.polyListComponentConversion(selList.getSelectionStrings(), toVertex = True) or []
+
+	vertices = om.MSelectionList()
+	for name in converted:
+		vertices.add(name)
+	indices = [np.zeros(0, dtype = np.int64)]
+	for item in range(vertices.length()):
+		_, vertexComponent = vertices.getComponent(item)
+		indices.append(np.array(om.MFnSingleIndexedComponent(vertexComponent).getElements(), dtype = np.int64))
+	return np.unique(np.concatenate(indices))
+
+def VCB_ClearEdgeCache():
+	_edgeCache.clear()
@@ -0,0 +1,469 @@
+"""
+
+	Mesh file support for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Table of Contents
+# Initialization
+# PLY Header
+# Binary PLY Mesh
+# Text Streaming
+# Apply
+
+## Imports
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+import VCB.VCB_engine as engine
+import VCB.VCB_kernel as kernel
+import VCB.VCB_mesh as vmesh
+
+## Initialization
+
+# Vertices read, colored and written per chunk
+CHUNK_SIZE = 65536
+
+# Color stored for vertices the file has no color for
+DEFAULT_COLOR = vmesh.UNSET_COLOR
+
+# File types VCB can color
+FILE_EXTENSIONS = (".ply", ".obj")
+
+# PLY property types as NumPy type codes
+PLY_TYPES = {
+	"char": "i1", "int8": "i1",
+	"uchar": "u1", "uint8": "u1",
+	"short": "i2", "int16": "i2",
+	"ushort": "u2", "uint16": "u2",
+	"int": "i4", "int32": "i4",
+	"uint": "u4", "uint32": "u4",
+	"float": "f4", "float32": "f4",
+	"double": "f8", "float64": "f8",
+}
+
+PLY_BYTE_ORDER = {
+	"binary_little_endian": "<",
+	"binary_big_endian": ">",
+}
+
+COLOR_PROPERTIES = ("red", "green", "blue", "alpha")
+
+# Scale between 0-1 colors and a PLY property type
+def VCB_ColorScale(propertyType):
+	typeCode = np.dtype(PLY_TYPES[propertyType])
+	if typeCode.kind == "f":
+		return 1.0
+	return float(np.iinfo(typeCode).max)
+
+## PLY Header
+
+# Parsed PLY header. Only files that list their vertex element first are
+# supported, which is what every common exporter writes
+class PlyHeader(object):
+	def __init__(self, fileObj):
+		self.lines = []
+		self.elements = [] # [name, count, [(type, name), ...]]
+		self.format = None
+
+		while True:
+			line = fileObj.readline()
+			if not line:
+				raise ValueError("Unexpected end of PLY header.")
+			text = line.decode("ascii").strip()
+			self.lines.append(text)
+			if text == "end_header":
+				break
+
+			words = text.split()
+			if not words:
+				continue
+			if words[0] == "format":
+				self.format = words[1]
+			elif words[0] == "element":
+				self.elements.append([words[1], int(words[2]), []])
+			elif words[0] == "property":
+				self.elements[-1][2].append((" ".join(words[1:-1]), words[-1]))
+
+		self.size = fileObj.tell()
+
+		if self.lines[0] != "ply":
+			raise ValueError("Not a PLY file.")
+		if not self.elements or self.elements[0][0] != "vertex":
+			raise ValueError("Only PLY files that list their vertices first are supported.")
+
+	@property
+	def vertexCount(self):
+		return self.elements[0][1]
+
+	@property
+	def vertexProperties(self):
+		return self.elements[0][2]
+
+	@property
+	def propertyNames(self):
+		return [name for propertyType, name in self.vertexProperties]
+
+	def isBinary(self):
+		return self.format in PLY_BYTE_ORDER
+
+	def hasColors(self):
+		names = self.propertyNames
+		return "red" in names and "green" in names and "blue" in names
+
+	# Structured dtype of one binary vertex record
+	def vertexDtype(self):
+		byteOrder = PLY_BYTE_ORDER[self.format]
+		return np.dtype([(name, byteOrder + PLY_TYPES[propertyType]) for propertyType, name in self.vertexProperties])
+
+	# Add uchar RGBA properties after the existing vertex properties
+	def addColorProperties(self):
+		insertAt = self.lines.index("element vertex %d" % self.vertexCount) + 1
+		while self.lines[insertAt].startswith("property"):
+			insertAt += 1
+
+		for name in COLOR_PROPERTIES:
+			if name not in self.propertyNames:
+				self.lines.insert(insertAt, "property uchar " + name)
+				self.vertexProperties.append(("uchar", name))
+				insertAt += 1
+
+	def toBytes(self):
+		return ("\n".join(self.lines) + "\n").encode("ascii")
+
+## Binary PLY Mesh
+
+# Mesh adapter over the memory-mapped vertex buffer of a binary PLY file.
+# Color writes land in the file in place. indices may also be a slice.
+# hasColor False reads every vertex as unassigned, for freshly added color properties
+class PlyMesh(vmesh.MeshAdapter):
+	def __init__(self, path, writable = True, hasColor = None):
+		with open(path, "rb") as fileObj:
+			self.header = PlyHeader(fileObj)
+		if not self.header.isBinary():
+			raise ValueError("%s is not a binary PLY file." % path)
+
+		self.name = os.path.basename(path)
+		self.vertices = np.memmap(path, dtype = self.header.vertexDtype(), mode = "r+" if writable else "r",
+			offset = self.header.size, shape = (self.header.vertexCount,))
+		self.colorScales = dict((name, VCB_ColorScale(propertyType)) for propertyType, name in self.header.vertexProperties if name in COLOR_PROPERTIES)
+		self.hasColor = self.header.hasColors() if hasColor is None else hasColor
+
+	def _rows(self, indices):
+		if indices is None:
+			return self.vertices
+		return self.vertices[indices]
+
+	def numVertices(self):
+		return len(self.vertices)
+
+	def getPositions(self, indices = None):
+		rows = self._rows(indices)
+		return np.stack([rows["x"], rows["y"], rows["z"]], axis = 1).astype(np.float64)
+
+	def readColors(self, indices = None, fill = vmesh.UNSET_COLOR):
+		rows = self._rows(indices)
+		colors = np.empty((len(rows), 4), dtype = np.float32)
+		if not self.hasColor:
+			colors[:] = fill
+			return colors, np.zeros(len(rows), dtype = bool)
+
+		for i, name in enumerate(COLOR_PROPERTIES):
+			if name in self.colorScales:
+				colors[:, i] = rows[name] / self.colorScales[name]
+			else:
+				colors[:, i] = DEFAULT_COLOR[i]
+		return colors, np.ones(len(rows), dtype = bool)
+
+	def getSelectedIndices(self):
+		return self.allIndices()
+
+	def setColors(self, indices, colors):
+		if not self.header.hasColors():
+			raise ValueError("%s has no vertex colors, add them with VCB_AddPlyColors first." % self.name)
+		if indices is None:
+			indices = slice(None)
+
+		colors = np.asarray(colors, dtype = np.float32).reshape(-1, 4)
+		for i, name in enumerate(COLOR_PROPERTIES):
+			if name not in self.colorScales:
+				continue
+			values = colors[:, i] * self.colorScales[name]
+			if self.colorScales[name] != 1.0:
+				values = np.rint(values)
+			self.vertices[name][indices] = values
+
+	# PLY has no unassigned colors, cleared vertices get the default color
+	def clearColors(self, indices):
+		colors = np.empty((len(self.vertices[indices]), 4), dtype = np.float32)
+		colors[:] = DEFAULT_COLOR
+		self.setColors(indices, colors)
+
+	def flush(self):
+		self.vertices.flush()
+
+	# Write out and drop the mapping, so the file can be moved or removed
+	def close(self):
+		if self.vertices is not None:
+			self.vertices.flush()
+			self.vertices = None
+
+# Copy a binary PLY file to outPath with RGBA vertex properties added, one chunk of vertices at a time
+def VCB_AddPlyColors(path, outPath, chunkSize = CHUNK_SIZE):
+	with open(path, "rb") as source:
+		header = PlyHeader(source)
+		oldDtype = header.vertexDtype()
+		header.addColorProperties()
+		newDtype = header.vertexDtype()
+
+		with open(outPath, "wb") as target:
+			target.write(header.toBytes())
+
+			for start in range(0, header.vertexCount, chunkSize):
+				count = min(chunkSize, header.vertexCount - start)
+				oldRows = np.frombuffer(source.read(count * oldDtype.itemsize), dtype = oldDtype)
+				newRows = np.empty(count, dtype = newDtype)
+				for name in newDtype.names:
+					if name in oldDtype.names:
+						newRows[name] = oldRows[name]
+					else:
+						newRows[name] = DEFAULT_COLOR[COLOR_PROPERTIES.index(name)] * VCB_ColorScale("uchar")
+				target.write(newRows.tobytes())
+
+			# Faces and any other elements are copied as is
+			shutil.copyfileobj(source, target)
+
+## Text Streaming
+
+# Read up to count lines
+def _VCB_ReadLines(fileObj, count):
+	lines = []
+	for i in range(count):
+		line = fileObj.readline()
+		if not line:
+			break
+		lines.append(line)
+	return lines
+
+# Vertex rows of an ASCII PLY file as (N,P) float64 chunks
+def _VCB_PlyAsciiChunks(fileObj, header, chunkSize):
+	remaining = header.vertexCount
+	while remaining:
+		lines = _VCB_ReadLines(fileObj, min(chunkSize, remaining))
+		if not lines:
+			raise ValueError("PLY file ends before its last vertex.")
+		remaining -= len(lines)
+		yield np.array([line.split() for line in lines], dtype = np.float64).reshape(len(lines), -1)
+
+# OBJ lines in chunks of up to chunkSize vertices. Yields the lines, the
+# positions of the vertex lines among them and an (N,7) float64 array of
+# x, y, z, r, g, b and a has-color flag
+def _VCB_ObjChunks(fileObj, chunkSize):
+	while True:
+		lines = []
+		rows = []
+		values = []
+		while len(rows) < chunkSize:
+			line = fileObj.readline()
+			if not line:
+				break
+			if line.startswith(b"v "):
+				words = line.split()
+				if len(words) >= 7:
+					values.append(words[1:7] + [1.0])
+				else:
+					values.append(words[1:4] + [0.0, 0.0, 0.0, 0.0])
+				rows.append(len(lines))
+			lines.append(line)
+
+		if not lines:
+			return
+		yield lines, rows, np.array(values, dtype = np.float64).reshape(-1, 7)
+
+# First pass over a text mesh, resolving the bounds, anchor or seed positions the plan needs
+def _VCB_ScanPlan(settings, positionChunks, anchorIndices):
+	if settings.mode == 1: # Standard
+		return engine.VCB_PlanFromSettings(settings)
+
+	boundsMin = np.full(3, np.inf)
+	boundsMax = np.full(3, -np.inf)
+	anchors = {}
+	wanted = np.asarray(anchorIndices if anchorIndices is not None else [], dtype = np.int64)
+	start = 0
+	for positions in positionChunks:
+		if len(positions):
+			boundsMin = np.minimum(boundsMin, positions.min(axis = 0))
+			boundsMax = np.maximum(boundsMax, positions.max(axis = 0))
+		inChunk = wanted[(wanted >= start) & (wanted < start + len(positions))]
+		anchors.update(zip(inChunk.tolist(), positions[inChunk - start]))
+		start += len(positions)
+
+	if settings.gradientBounds == 3: # Selection
+		if not len(wanted):
+			raise ValueError("Selection gradients need at least one seed vertex.")
+		missing = [index for index in wanted.tolist() if index not in anchors]
+		if missing:
+			raise ValueError("Seed vertex %d is out of range." % missing[0])
+		return engine.VCB_PlanFromSettings(settings, anchors = np.array([anchors[index] for index in wanted.tolist()]))
+
+	if settings.gradientBounds == 2: # Point to Point
+		if anchorIndices is None or len(anchorIndices) < 2:
+			raise ValueError("Point to Point gradients need two anchor vertices.")
+		missing = [index for index in anchorIndices[0:2] if index not in anchors]
+		if missing:
+			raise ValueError("Anchor vertex %d is out of range." % missing[0])
+		return engine.VCB_PlanFromSettings(settings, anchors = [anchors[anchorIndices[0]], anchors[anchorIndices[1]]])
+
+	return engine.VCB_PlanFromSettings(settings, bounds = (boundsMin, boundsMax))
+
+# Stream an ASCII PLY file into target with colors applied
+def _VCB_ApplyPlyAscii(path, target, settings, anchorIndices, chunkSize):
+	with open(path, "rb") as source:
+		header = PlyHeader(source)
+		columns = header.propertyNames
+		positionColumns = [columns.index("x"), columns.index("y"), columns.index("z")]
+		plan = _VCB_ScanPlan(settings, (chunk[:, positionColumns] for chunk in _VCB_PlyAsciiChunks(source, header, chunkSize)), anchorIndices)
+
+	with open(path, "rb") as source:
+		header = PlyHeader(source)
+		oldCount = len(header.vertexProperties)
+		hasColor = header.hasColors()
+		header.addColorProperties()
+		columns = header.propertyNames
+		colorColumns = [columns.index(name) for name in COLOR_PROPERTIES]
+		scales = np.array([VCB_ColorScale(header.vertexProperties[column][0]) for column in colorColumns])
+		formats = ["%.9g" if np.dtype(PLY_TYPES[propertyType]).kind == "f" else "%d" for propertyType, name in header.vertexProperties]
+
+		target.write(header.toBytes())
+		for chunk in _VCB_PlyAsciiChunks(source, header, chunkSize):
+			rows = np.empty((len(chunk), len(columns)), dtype = np.float64)
+			rows[:, 0:oldCount] = chunk
+			rows[:, oldCount:] = [DEFAULT_COLOR[COLOR_PROPERTIES.index(name)] * VCB_ColorScale("uchar") for name in columns[oldCount:]]
+
+			if hasColor:
+				baseColors = rows[:, colorColumns] / scales
+			else:
+				baseColors = np.empty((len(rows), 4), dtype = np.float32)
+				baseColors[:] = engine.VCB_FillColor(settings)
+			colors = kernel.VCB_ComputeColors(plan, rows[:, positionColumns], baseColors, settings.blendMode, settings.opacity, settings.blendChannels)
+			rows[:, colorColumns] = colors * scales
+			if (scales != 1.0).any():
+				rows[:, colorColumns] = np.where(scales != 1.0, np.rint(rows[:, colorColumns]), rows[:, colorColumns])
+
+			np.savetxt(target, rows, fmt = formats)
+
+		# Faces and any other elements are copied as is
+		shutil.copyfileobj(source, target)
+
+# Stream an OBJ file into target with colors applied. OBJ vertex colors
+# are RGB only, alpha is dropped
+def _VCB_ApplyObj(path, target, settings, anchorIndices, chunkSize):
+	with open(path, "rb") as source:
+		plan = _VCB_ScanPlan(settings, (values[:, 0:3] for lines, rows, values in _VCB_ObjChunks(source, chunkSize)), anchorIndices)
+
+	with open(path, "rb") as source:
+		for lines, rows, values in _VCB_ObjChunks(source, chunkSize):
+			baseColors = np.empty((len(values), 4), dtype = np.float32)
+			baseColors[:] = engine.VCB_FillColor(settings)
+			hasColor = values[:, 6] > 0.0
+			baseColors[hasColor, 0:3] = values[hasColor, 3:6]
+			baseColors[hasColor, 3] = 1.0
+
+			colors = kernel.VCB_ComputeColors(plan, values[:, 0:3], baseColors, settings.blendMode, settings.opacity, settings.blendChannels)
+			for row, position, color in zip(rows, values[:, 0:3].tolist(), colors.tolist()):
+				lines[row] = ("v %.9g %.9g %.9g %.6g %.6g %.6g\n" % (position[0], position[1], position[2], color[0], color[1], color[2])).encode("ascii")
+
+			target.writelines(lines)
+
+## Apply
+
+# Apply VCB settings to a PLY or OBJ file. Binary PLY colors are written in
+# place through a memory map, text files are streamed in chunks. outPath of
+# None overwrites the file. Returns the number of vertices colored
+def VCB_ApplyFile(path, settings, outPath = None, anchorIndices = None, chunkSize = CHUNK_SIZE):
+	if outPath is None:
+		outPath = path
+	extension = os.path.splitext(path)[1].lower()
+	if extension not in FILE_EXTENSIONS:
+		raise ValueError("Unsupported mesh file %s." % path)
+	if settings.mode == 2 and settings.gradientBounds == 4:
+		raise ValueError("Surface gradients need the mesh's polygons, files are colored vertex chunk by chunk.")
+
+	if extension == ".ply":
+		with open(path, "rb") as fileObj:
+			header = PlyHeader(fileObj)
+
+		if header.isBinary():
+			return _VCB_ApplyPlyBinary(path, outPath, header, settings, anchorIndices, chunkSize)
+
+	# Text files are rewritten next to the output and swapped in when done
+	handle, tempPath = tempfile.mkstemp(suffix = extension, dir = os.path.dirname(os.path.abspath(outPath)))
+	try:
+		with os.fdopen(handle, "wb") as target:
+			if extension == ".ply":
+				_VCB_ApplyPlyAscii(path, target, settings, anchorIndices, chunkSize)
+			else:
+				_VCB_ApplyObj(path, target, settings, anchorIndices, chunkSize)
+		os.replace(tempPath, outPath)
+	except Exception:
+		os.remove(tempPath)
+		raise
+
+	if extension == ".ply":
+		return header.vertexCount
+	with open(outPath, "rb") as fileObj:
+		return sum(1 for line in fileObj if line.startswith(b"v "))
+
+# Color a binary PLY file through its memory-mapped vertex buffer. A file that
+# already has colors is written in place. Otherwise the colored copy is made
+# next to the output and only moved over it once the apply worked, so bad
+# anchors or settings leave the files as they were
+def _VCB_ApplyPlyBinary(path, outPath, header, settings, anchorIndices, chunkSize):
+	hasColor = header.hasColors()
+	if hasColor and os.path.abspath(outPath) == os.path.abspath(path):
+		return _VCB_ColorPlyBinary(outPath, hasColor, settings, anchorIndices, chunkSize)
+
+	handle, tempPath = tempfile.mkstemp(suffix = ".ply", dir = os.path.dirname(os.path.abspath(outPath)))
+	os.close(handle)
+	try:
+		if hasColor:
+			shutil.copyfile(path, tempPath)
+		else:
+			VCB_AddPlyColors(path, tempPath, chunkSize)
+		count = _VCB_ColorPlyBinary(tempPath, hasColor, settings, anchorIndices, chunkSize)
+		os.replace(tempPath, outPath)
+	except Exception:
+		os.remove(tempPath)
+		raise
+	return count
+
+# Apply to a binary PLY file with color properties, chunk by chunk. hasColor
+# False reads the colors as unassigned. Nothing is written until the plan is built
+def _VCB_ColorPlyBinary(path, hasColor, settings, anchorIndices, chunkSize):
+	mesh = PlyMesh(path, hasColor = hasColor)
+	try:
+		count = mesh.numVertices()
+		chunks = [slice(start, min(start + chunkSize, count)) for start in range(0, count, chunkSize)]
+
+		# Chunked bounds so the whole position array is never held at once
+		bounds = None
+		if settings.mode == 2 and settings.gradientBounds == 1:
+			bounds = (np.full(3, np.inf), np.full(3, -np.inf))
+			for rows in chunks:
+				positions = mesh.getPositions(rows)
+				bounds = (np.minimum(bounds[0], positions.min(axis = 0)), np.maximum(bounds[1], positions.max(axis = 0)))
+
+		plan = engine.VCB_BuildPlan(mesh, settings, anchorIndices, bounds)
+		for rows in chunks:
+			engine.VCB_ApplyMesh(mesh, settings, rows, plan = plan)
+	finally:
+		mesh.close()
+	return count
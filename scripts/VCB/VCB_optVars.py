@@ -10,32 +10,99 @@
 """
 
 ## Import
-import pymel.core as pm
+import maya.cmds as cmds
 
+## Option Vars
+
+# Dict style access to Maya's option vars through maya.cmds, the same way
+# pm.optionVar works without having to import PyMEL
+class OptionVars(object):
+	def __contains__(self, key):
+		return cmds.optionVar(exists = key)
+
+	def __getitem__(self, key):
+		if not cmds.optionVar(exists = key):
+			raise KeyError(key)
+		return cmds.optionVar(query = key)
+
+	def __setitem__(self, key, value):
+		if isinstance(value, (list, tuple)):
+			cmds.optionVar(clearArray = key)
+			for item in value:
+				if isinstance(item, str):
+					cmds.optionVar(stringValueAppend = (key, item))
+				elif isinstance(item, float):
+					cmds.optionVar(floatValueAppend = (key, item))
+				else:
+					cmds.optionVar(intValueAppend = (key, int(item)))
+		elif isinstance(value, str):
+			cmds.optionVar(stringValue = (key, value))
+		elif isinstance(value, float):
+			cmds.optionVar(floatValue = (key, value))
+		else:
+			cmds.optionVar(intValue = (key, int(value)))
+
+	def get(self, key, default = None):
+		if key in self:
+			return self[key]
+		return default
+
+optionVar = OptionVars()
+
+# Default ramp, black to white. Each stop is position, r, g, b, a
+RAMP_STOPS = [
+	0.0, 0.0, 0.0, 0.0, 1.0,
+	1.0, 1.0, 1.0, 1.0, 1.0,
+]
 
 ## Functions
 
 # Create
 def create():
 	# Global Settings
-	if "gradientMode_VCB" not in pm.env.optionVars: pm.optionVar["gradientMode_VCB"] = True
-	if "blendMode_VCB" not in pm.env.optionVars: pm.optionVar["blendMode_VCB"] = True
+	if "gradientMode_VCB" not in optionVar: optionVar["gradientMode_VCB"] = True
+	if "blendMode_VCB" not in optionVar: optionVar["blendMode_VCB"] = True
 
 	# Color Settings
-	if "colorMain_VCB" not in pm.env.optionVars: pm.optionVar["colorMain_VCB"] = [ 1.0, 1.0, 1.0 ]
-	if "alphaMain_VCB" not in pm.env.optionVars: pm.optionVar["alphaMain_VCB"] = 1.0
-	if "colorSub_VCB" not in pm.env.optionVars: pm.optionVar["colorSub_VCB"] = [ 1.0, 1.0, 1.0 ]
-	if "alphaSub_VCB" not in pm.env.optionVars: pm.optionVar["alphaSub_VCB"] = 1.0
+	if "colorMain_VCB" not in optionVar: optionVar["colorMain_VCB"] = [ 1.0, 1.0, 1.0 ]
+	if "alphaMain_VCB" not in optionVar: optionVar["alphaMain_VCB"] = 1.0
+	if "colorSub_VCB" not in optionVar: optionVar["colorSub_VCB"] = [ 1.0, 1.0, 1.0 ]
+	if "alphaSub_VCB" not in optionVar: optionVar["alphaSub_VCB"] = 1.0
 	
 	# Gradient Settings
-	if "gradientBounds_VCB" not in pm.env.optionVars: pm.optionVar["gradientBounds_VCB"] = True
-	if "gradientDirection_VCB" not in pm.env.optionVars: pm.optionVar["gradientDirection_VCB"] = True
+	if "gradientBounds_VCB" not in optionVar: optionVar["gradientBounds_VCB"] = True
+	if "gradientDirection_VCB" not in optionVar: optionVar["gradientDirection_VCB"] = True
+	if "multiMeshBounds_VCB" not in optionVar: optionVar["multiMeshBounds_VCB"] = True
+	if "falloffRadius_VCB" not in optionVar: optionVar["falloffRadius_VCB"] = 1.0
+	if "gradientRamp_VCB" not in optionVar: optionVar["gradientRamp_VCB"] = True
+	if "rampStops_VCB" not in optionVar: optionVar["rampStops_VCB"] = RAMP_STOPS
+	if "rampInterpolation_VCB" not in optionVar: optionVar["rampInterpolation_VCB"] = True
+
+	# Smooth Settings
+	if "smoothIterations_VCB" not in optionVar: optionVar["smoothIterations_VCB"] = 4
+	if "smoothStrength_VCB" not in optionVar: optionVar["smoothStrength_VCB"] = 0.5
+	if "smoothChannels_VCB" not in optionVar: optionVar["smoothChannels_VCB"] = [ 1, 1, 1, 1 ]
+
+	# Channel Pack Settings, the JSON settings baked into R, G, B and A
+	if "packedChannels_VCB" not in optionVar: optionVar["packedChannels_VCB"] = [ "", "", "", "" ]
+
+	# Tool Settings
+	if "logStats_VCB" not in optionVar: optionVar["logStats_VCB"] = False
+	if "undoPrecision_VCB" not in optionVar: optionVar["undoPrecision_VCB"] = 2
+	if "livePreview_VCB" not in optionVar: optionVar["livePreview_VCB"] = False
+	if "resultCacheMB_VCB" not in optionVar: optionVar["resultCacheMB_VCB"] = 256
+	if "asyncApply_VCB" not in optionVar: optionVar["asyncApply_VCB"] = False
+	if "sceneTargets_VCB" not in optionVar: optionVar["sceneTargets_VCB"] = ""
+	if "softWeights_VCB" not in optionVar: optionVar["softWeights_VCB"] = False
+	if "softRadius_VCB" not in optionVar: optionVar["softRadius_VCB"] = 1.0
+	if "blendOpacity_VCB" not in optionVar: optionVar["blendOpacity_VCB"] = 1.0
+	if "blendChannels_VCB" not in optionVar: optionVar["blendChannels_VCB"] = [ 1, 1, 1, 1 ]
 
 
 # Reset All
 def reset():
 
-	userResponse = pm.confirmDialog(
+	userResponse = cmds.confirmDialog(
 		button=["Yes", "No"],
 		cancelButton="No",
 		defaultButton="No",
@@ -47,19 +114,41 @@ def reset():
 	if userResponse == "No":
 		pass
 	else:
-		pm.optionVar["gradientMode_VCB"]
-		pm.optionVar["blendMode_VCB"]
+		optionVar["gradientMode_VCB"]
+		optionVar["blendMode_VCB"]
 		
-		pm.optionVar["colorMain_VCB"] = [ 1.0, 1.0, 1.0 ]
-		pm.optionVar["alphaMain_VCB"] = 1.0
-		pm.optionVar["colorSub_VCB"] = [ 1.0, 1.0, 1.0 ]
-		pm.optionVar["alphaSub_VCB"] = 1.0
+		optionVar["colorMain_VCB"] = [ 1.0, 1.0, 1.0 ]
+		optionVar["alphaMain_VCB"] = 1.0
+		optionVar["colorSub_VCB"] = [ 1.0, 1.0, 1.0 ]
+		optionVar["alphaSub_VCB"] = 1.0
 	
-		pm.optionVar["gradientBounds_VCB"] = True
-		pm.optionVar["gradientDirection_VCB"] = True
+		optionVar["gradientBounds_VCB"] = True
+		optionVar["gradientDirection_VCB"] = True
+		optionVar["multiMeshBounds_VCB"] = True
+		optionVar["falloffRadius_VCB"] = 1.0
+		optionVar["gradientRamp_VCB"] = True
+		optionVar["rampStops_VCB"] = RAMP_STOPS
+		optionVar["rampInterpolation_VCB"] = True
+		
+		optionVar["smoothIterations_VCB"] = 4
+		optionVar["smoothStrength_VCB"] = 0.5
+		optionVar["smoothChannels_VCB"] = [ 1, 1, 1, 1 ]
+		
+		optionVar["packedChannels_VCB"] = [ "", "", "", "" ]
+		
+		optionVar["logStats_VCB"] = False
+		optionVar["undoPrecision_VCB"] = 2
+		optionVar["livePreview_VCB"] = False
+		optionVar["resultCacheMB_VCB"] = 256
+		optionVar["asyncApply_VCB"] = False
+		optionVar["sceneTargets_VCB"] = ""
+		optionVar["softWeights_VCB"] = False
+		optionVar["softRadius_VCB"] = 1.0
+		optionVar["blendOpacity_VCB"] = 1.0
+		optionVar["blendChannels_VCB"] = [ 1, 1, 1, 1 ]
 
 		# Restart
-		pm.confirmDialog(
+		cmds.confirmDialog(
 			button=["Yes"],
 			cancelButton="Yes",
 			defaultButton="Yes",
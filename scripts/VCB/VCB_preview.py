@@ -0,0 +1,161 @@
+"""
+
+	Live preview for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Usage
+# preview.VCB_UpdatePreview(settings, getTargets)	# From a slider's dragCommand, getTargets returns PreviewSession's arguments
+# preview.VCB_CancelPreview()						# Put the original colors back
+
+## Table of Contents
+# Initialization
+# Preview Session
+# Live Preview
+
+## Imports
+import numpy as np
+
+import VCB.VCB_engine as engine
+import VCB.VCB_kernel as kernel
+
+try:
+	import maya.cmds as cmds
+except ImportError: # Running outside of Maya
+	cmds = None
+
+## Initialization
+
+_session = None
+_pending = None		# Latest settings waiting to be written
+_scheduled = False
+
+## Preview Session
+
+# The settings a session's cached weights and base colors depend on. Only the
+# colors, alphas, opacity and blend channels may change while a session is running
+def VCB_PreviewKey(settings):
+	return (settings.mode, settings.blendMode, settings.gradientBounds, settings.gradientDirection, settings.multiMeshBounds, settings.falloffRadius, settings.unsetColor)
+
+# Cached arrays of one previewed mesh
+class PreviewMesh(object):
+	def __init__(self, adapter, indices, weights, baseColors, original, hasColor, falloff = None):
+		self.adapter = adapter
+		self.indices = indices
+		self.weights = weights			# Gradient weight per vertex
+		self.falloff = falloff			# Soft falloff weight per vertex, None at full strength
+		self.baseColors = baseColors	# Colors blended over, unset vertices filled
+		self.original = original		# Colors to revert to
+		self.hasColor = hasColor
+
+# Reads the geometry, colors and soft falloff weights of the targets once, so
+# every update is only a color lerp, a blend and one bulk write per mesh.
+# weightsList holds the falloff weights per mesh as for VCB_ApplyMeshes
+class PreviewSession(object):
+	def __init__(self, settings, adapters, indicesList = None, anchorsList = None, weightsList = None):
+		self.key = VCB_PreviewKey(settings)
+		self.blendMode = settings.blendMode
+		self.meshes = []
+		if indicesList is None:
+			indicesList = [None] * len(adapters)
+		if anchorsList is None:
+			anchorsList = [None] * len(adapters)
+		if weightsList is None:
+			weightsList = [None] * len(adapters)
+
+		gradient = settings.mode == 2
+		meshBounds = gradient and settings.gradientBounds == 1
+		positionsList = [adapter.getPositions() if gradient else None for adapter in adapters]
+
+		sharedBounds = None
+		if meshBounds and settings.multiMeshBounds == 2: # Combined
+			sharedBounds = engine.VCB_GetBounds(np.concatenate(positionsList))
+
+		fill = engine.VCB_FillColor(settings)
+		for adapter, indices, anchorIndices, positions, falloff in zip(adapters, indicesList, anchorsList, positionsList, weightsList):
+			original, hasColor = adapter.readColors(indices)
+			baseColors = original.copy()
+			baseColors[~hasColor] = fill
+
+			if gradient:
+				bounds = None
+				if meshBounds:
+					bounds = sharedBounds if sharedBounds is not None else engine.VCB_GetBounds(positions)
+				plan = engine.VCB_BuildPlan(adapter, settings, anchorIndices, bounds)
+				weights = plan.weights(positions if indices is None else positions[indices])
+			else:
+				weights = np.zeros(len(baseColors), dtype = np.float32)
+
+			self.meshes.append(PreviewMesh(adapter, indices, weights, baseColors, original, hasColor, falloff))
+
+	def colors(self, mesh, settings):
+		plan = kernel.GradientPlan(1, settings.colorMain, settings.colorSub, settings.alphaMain, settings.alphaSub, ramp = settings.ramp if settings.mode == 2 else None)
+		colors = plan.lerp(mesh.weights)
+		colors = kernel.VCB_BlendColors(mesh.baseColors, colors, self.blendMode, settings.opacity, settings.blendChannels)
+		# Fade out around the selection as the apply does
+		if mesh.falloff is not None:
+			colors = kernel.VCB_WeightColors(mesh.baseColors, colors, mesh.falloff)
+		return colors
+
+	def update(self, settings):
+		for mesh in self.meshes:
+			mesh.adapter.setColors(mesh.indices, self.colors(mesh, settings))
+
+	def revert(self):
+		for mesh in self.meshes:
+			mesh.adapter.setColors(mesh.indices, mesh.original)
+
+			# Vertices that had no color go back to having none
+			if not mesh.hasColor.all():
+				indices = mesh.indices if mesh.indices is not None else mesh.adapter.allIndices()
+				mesh.adapter.clearColors(np.asarray(indices)[~mesh.hasColor])
+
+## Live Preview
+
+def VCB_PreviewActive():
+	return _session is not None
+
+# Show the settings on the targets. The first call starts a session on the
+# targets returned by getTargets(settings), which may return None to skip the
+# preview. Calls arriving faster than Maya goes idle are coalesced into one
+# write of the latest settings. Returns whether a preview is running
+def VCB_UpdatePreview(settings, getTargets):
+	global _session, _pending, _scheduled
+
+	# Anything but the colors changed, start over from the original colors
+	if _session is not None and _session.key != VCB_PreviewKey(settings):
+		VCB_CancelPreview()
+
+	if _session is None:
+		targets = getTargets(settings)
+		if targets is None:
+			return False
+		_session = PreviewSession(settings, *targets)
+
+	_pending = settings
+	if cmds is None:
+		_VCB_FlushPreview()
+	elif not _scheduled:
+		_scheduled = True
+		cmds.evalDeferred(_VCB_FlushPreview, lowestPriority = True)
+	return True
+
+# Write the latest pending settings
+def _VCB_FlushPreview():
+	global _pending, _scheduled
+	_scheduled = False
+	if _session is not None and _pending is not None:
+		settings, _pending = _pending, None
+		_session.update(settings)
+
+# Put the original colors back and end the preview
+def VCB_CancelPreview():
+	global _session, _pending
+	session, _session, _pending = _session, None, None
+	if session is not None:
+		session.revert()
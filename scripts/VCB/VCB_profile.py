@@ -0,0 +1,192 @@
+"""
+
+	Timing and profiling hooks for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Usage
+# import VCB.VCB_profile as profile
+# profile.VCB_EnableStats(True, log = True)	# Print a stats line after every apply
+# profile.VCB_LastStats().asDict()				# Phase timings of the last apply
+# profile.VCB_ProfileNextApply()				# cProfile the next apply only
+
+## Table of Contents
+# Initialization
+# Stats
+# Phases
+# Recording
+
+## Imports
+import collections
+import cProfile
+import functools
+import io
+import pstats
+import threading
+import time
+
+## Initialization
+
+# Stats of the most recent applies, newest last
+HISTORY_SIZE = 50
+
+_enabled = False
+_log = False
+_history = collections.deque(maxlen = HISTORY_SIZE)
+_profileRequest = None
+
+# The apply being recorded, per thread. A background apply records its own
+# stats instead of adding its phases to one running on the main thread
+class _Recording(threading.local):
+	current = None
+
+_recording = _Recording()
+
+## Stats
+
+# Wall time and item count of every phase of one apply
+class ApplyStats(object):
+	def __init__(self, name):
+		self.name = name
+		self.phases = [] # (phase, seconds, count)
+		self.seconds = 0.0
+		self.profile = None
+		self.notes = collections.OrderedDict()
+
+	def add(self, phase, seconds, count):
+		self.phases.append((phase, seconds, count))
+
+	# Seconds and counts summed per phase name, in first-seen order
+	def totals(self):
+		totals = collections.OrderedDict()
+		for phase, seconds, count in self.phases:
+			phaseSeconds, phaseCount = totals.get(phase, (0.0, 0))
+			totals[phase] = (phaseSeconds + seconds, phaseCount + count)
+		return totals
+
+	def asDict(self):
+		return {
+			"name": self.name,
+			"seconds": self.seconds,
+			"phases": [{"phase": phase, "seconds": seconds, "count": count} for phase, (seconds, count) in self.totals().items()],
+			"notes": dict(self.notes),
+		}
+
+	def summary(self):
+		parts = ["%s %.4fs (%d)" % (phase, seconds, count) for phase, (seconds, count) in self.totals().items()]
+		parts.extend("%s: %s" % (key, value) for key, value in self.notes.items())
+		return "%s %.4fs: %s" % (self.name, self.seconds, " | ".join(parts))
+
+# Turn phase recording on or off. log prints a stats line after every apply
+def VCB_EnableStats(enabled = True, log = False):
+	global _enabled, _log
+	_enabled = enabled
+	_log = log
+
+def VCB_StatsEnabled():
+	return _enabled
+
+# Stats of the last recorded apply, or None
+def VCB_LastStats():
+	return _history[-1] if _history else None
+
+# Stats of the recent applies, oldest first
+def VCB_GetStats():
+	return list(_history)
+
+def VCB_ClearStats():
+	_history.clear()
+
+## Phases
+
+# Times one phase of the apply being recorded. count may be set inside the block
+class _Phase(object):
+	__slots__ = ("name", "count", "start")
+
+	def __init__(self, name, count):
+		self.name = name
+		self.count = count
+
+	def __enter__(self):
+		self.start = time.perf_counter()
+		return self
+
+	def __exit__(self, *args):
+		if _recording.current is not None:
+			_recording.current.add(self.name, time.perf_counter() - self.start, self.count)
+
+# Stand-in returned while nothing is being recorded
+class _NullPhase(object):
+	__slots__ = ("count",)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		pass
+
+_NULL_PHASE = _NullPhase()
+
+# Context manager timing a phase of the current apply:
+#	with profile.VCB_Phase("read", len(indices)):
+# Costs one thread-local lookup when recording is off
+def VCB_Phase(name, count = 0):
+	if _recording.current is None:
+		return _NULL_PHASE
+	return _Phase(name, count)
+
+# Attach a value to the apply being recorded, shown in its summary
+def VCB_Note(key, value):
+	if _recording.current is not None:
+		_recording.current.notes[key] = value
+
+## Recording
+
+# Capture a cProfile of the next recorded apply. The report is kept on its
+# stats and also written to path when given
+def VCB_ProfileNextApply(sortBy = "cumulative", limit = 30, path = None):
+	global _profileRequest
+	_profileRequest = (sortBy, limit, path)
+
+# Decorator recording every call of an apply function as one ApplyStats
+def VCB_Recorded(name):
+	def decorator(func):
+		@functools.wraps(func)
+		def wrapper(*args, **kwargs):
+			global _profileRequest
+			# Nested applies are phases of the outer one
+			if _recording.current is not None or (not _enabled and _profileRequest is None):
+				return func(*args, **kwargs)
+
+			stats = _recording.current = ApplyStats(name)
+			profileRequest, _profileRequest = _profileRequest, None
+			profiler = cProfile.Profile() if profileRequest else None
+
+			start = time.perf_counter()
+			try:
+				if profiler:
+					return profiler.runcall(func, *args, **kwargs)
+				return func(*args, **kwargs)
+			finally:
+				stats.seconds = time.perf_counter() - start
+				_recording.current = None
+				_history.append(stats)
+
+				if profiler:
+					sortBy, limit, path = profileRequest
+					report = io.StringIO()
+					pstats.Stats(profiler, stream = report).sort_stats(sortBy).print_stats(limit)
+					stats.profile = report.getvalue()
+					if path:
+						profiler.dump_stats(path)
+					print(stats.profile)
+
+				if _log:
+					print("VCB: " + stats.summary())
+		return wrapper
+	return decorator
@@ -0,0 +1,201 @@
+"""
+
+	Scene batch for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Usage
+# import VCB.VCB_scene as scene
+# report = scene.VCB_ApplyScene(settings, ["rocks_SET", "env", "*_geo"])	# Sets, namespaces or name patterns
+# print(report.summary())
+# report.slowest(10)		# [ShapeResult] that took the longest
+
+## Table of Contents
+# Initialization
+# Query
+# Report
+# Apply
+
+## Imports
+import collections
+import time
+
+import VCB.VCB_engine as engine
+import VCB.VCB_mesh as vmesh
+import VCB.VCB_profile as profile
+
+try:
+	import maya.cmds as cmds
+	import maya.api.OpenMaya as om
+except ImportError: # Running outside of Maya
+	cmds = None
+	om = None
+
+## Initialization
+
+# Unique shapes read, computed and written together. Bounds how much geometry
+# is held at once on scenes with tens of thousands of meshes
+BATCH_SIZE = 512
+
+## Query
+
+# Patterns cmds.ls matches for one target: the members of object sets, every
+# node in a namespace, or the nodes the target matches as a name pattern
+def VCB_TargetPatterns(target):
+	# objectType takes a single node, so name patterns are expanded first
+	nodes = cmds.ls(target, long = True) or []
+	objectSets = set(node for node in nodes if cmds.objectType(node, isAType = "objectSet"))
+	if not objectSets:
+		namespace = target.strip(":")
+		if namespace and cmds.namespace(exists = ":" + namespace):
+			return [":%s:*" % namespace]
+
+	patterns = []
+	for node in nodes:
+		if node in objectSets:
+			# Sets can hold other sets
+			for member in cmds.sets(node, query = True) or []:
+				patterns.extend(VCB_TargetPatterns(member))
+		else:
+			patterns.append(node)
+	return patterns
+
+# Every DAG path of the mesh shapes under the targets, instances included.
+# One ls call gathers the shapes of all the targets
+def VCB_QueryShapePaths(targets):
+	patterns = []
+	for target in targets:
+		patterns.extend(VCB_TargetPatterns(target))
+	if not patterns:
+		return []
+	return cmds.ls(patterns, dag = True, allPaths = True, type = "mesh", noIntermediate = True, long = True) or []
+
+# Group paths by the node they lead to, so every instance of a shape lands in
+# the same group. keys holds one node key per path. Returns key -> [path] in
+# the order the shapes were first found
+def VCB_GroupInstances(paths, keys):
+	groups = collections.OrderedDict()
+	for path, key in zip(paths, keys):
+		groups.setdefault(key, []).append(path)
+	return groups
+
+# Node UUID of every path, instances of a shape share it
+def VCB_NodeKeys(paths):
+	keys = []
+	selList = om.MSelectionList()
+	for index, path in enumerate(paths):
+		selList.add(path)
+		keys.append(om.MFnDependencyNode(selList.getDependNode(index)).uuid().asString())
+	return keys
+
+## Report
+
+# Outcome of one unique shape
+class ShapeResult(object):
+	def __init__(self, name, instances, vertices, timing):
+		self.name = name
+		self.instances = instances	# DAG paths sharing the shape
+		self.vertices = vertices
+		self.read = timing["read"]
+		self.compute = timing["compute"]
+		self.write = timing["write"]
+
+	def seconds(self):
+		return self.read + self.compute + self.write
+
+	def __repr__(self):
+		return "%s: %d vertices, %d instances, %.4fs (read %.4fs, compute %.4fs, write %.4fs)" % (
+			self.name, self.vertices, len(self.instances), self.seconds(), self.read, self.compute, self.write)
+
+# Per shape timings and totals of a scene batch
+class SceneReport(object):
+	def __init__(self):
+		self.shapes = []
+		self.querySeconds = 0.0
+		self.seconds = 0.0
+
+	def add(self, result):
+		self.shapes.append(result)
+
+	def instanceCount(self):
+		return sum(len(result.instances) for result in self.shapes)
+
+	def vertexCount(self):
+		return sum(result.vertices for result in self.shapes)
+
+	def slowest(self, count = 10):
+		return sorted(self.shapes, key = lambda result: result.seconds(), reverse = True)[0:count]
+
+	# Phase totals over every shape
+	def totals(self):
+		return {
+			"read": sum(result.read for result in self.shapes),
+			"compute": sum(result.compute for result in self.shapes),
+			"write": sum(result.write for result in self.shapes),
+		}
+
+	def summary(self):
+		totals = self.totals()
+		instances = self.instanceCount()
+		return "%d shapes (%d instances skipped), %d vertices in %.3fs. Query %.3fs, read %.3fs, compute %.3fs, write %.3fs" % (
+			len(self.shapes), instances - len(self.shapes), self.vertexCount(), self.seconds,
+			self.querySeconds, totals["read"], totals["compute"], totals["write"])
+
+## Apply
+
+# Color unique shapes in batches through the multi-mesh apply. instancesList
+# holds the DAG paths sharing each adapter's shape, for the report. commit
+# works as for VCB_ApplyMesh. Returns the SceneReport
+def VCB_ApplyShapes(adapters, settings, instancesList = None, batchSize = BATCH_SIZE, commit = engine.VCB_Commit, log = None):
+	if settings.mode == 2 and settings.gradientBounds in (2, 3, 4):
+		raise ValueError("Point to Point, Selection and Surface gradients need vertices picked per mesh, they can't batch a scene.")
+	if instancesList is None:
+		instancesList = [[adapter.name] for adapter in adapters]
+
+	# Combined bounds span every shape, so they can't be split into batches
+	if settings.mode == 2 and settings.multiMeshBounds == 2:
+		batchSize = len(adapters)
+
+	report = SceneReport()
+	start = time.perf_counter()
+	for first in range(0, len(adapters), max(batchSize, 1)):
+		batch = adapters[first:first + batchSize]
+		timings = []
+		# Threads rather than processes, the kernel's array math releases the GIL
+		engine.VCB_ApplyMeshes(batch, settings, processes = False, commit = commit, timings = timings)
+		for adapter, instances, timing in zip(batch, instancesList[first:first + batchSize], timings):
+			result = ShapeResult(adapter.name, instances, adapter.numVertices(), timing)
+			report.add(result)
+			if log:
+				log(repr(result))
+	report.seconds = time.perf_counter() - start
+	return report
+
+# Color every mesh under the targets, each object set, namespace or name
+# pattern. Instances share one shape, which is computed and written once.
+# Shapes are colored in object space since their instances share the colors,
+# except for Combined bounds which span the shapes in world space as the
+# apply does. Those use the first instance's placement
+@profile.VCB_Recorded("VCB_ApplyScene")
+def VCB_ApplyScene(settings, targets, batchSize = BATCH_SIZE, commit = engine.VCB_Commit, log = None):
+	start = time.perf_counter()
+	with profile.VCB_Phase("query") as phase:
+		paths = VCB_QueryShapePaths(targets)
+		groups = VCB_GroupInstances(paths, VCB_NodeKeys(paths))
+		phase.count = len(paths)
+	profile.VCB_Note("instances", "%d paths, %d shapes" % (len(paths), len(groups)))
+
+	instancesList = list(groups.values())
+	worldSpace = settings.mode == 2 and settings.gradientBounds == 1 and settings.multiMeshBounds == 2
+	adapters = [vmesh.MayaMesh(instances[0], worldSpace = worldSpace) for instances in instancesList]
+	querySeconds = time.perf_counter() - start
+
+	report = VCB_ApplyShapes(adapters, settings, instancesList, batchSize, commit, log)
+	report.querySeconds = querySeconds
+	report.seconds += querySeconds
+	return report
@@ -0,0 +1,158 @@
+"""
+
+	Selection resolver for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Table of Contents
+# Component Parsing
+# Resolved Selection
+# Resolver
+
+## Imports
+import collections
+import re
+
+import numpy as np
+
+import VCB.VCB_mesh as vmesh
+
+try:
+	import maya.cmds as cmds
+except ImportError: # Running outside of Maya
+	cmds = None
+
+## Component Parsing
+
+# "node.vtx[0:9999]" -> node, component type, index text
+COMPONENT_PATTERN = re.compile(r"^(?P<node>[^.]+)\.(?P<type>[A-Za-z]+)\[(?P<indices>[^\]]*)\](?P<rest>.*)$")
+
+# Component types resolved here with array ops. Anything else on a mesh
+# (edges, UVs, vertex faces) goes through polyListComponentConversion, Maya
+# has no bulk query for edge vertices
+VERTEX = "vtx"
+FACE = "f"
+
+# Indices of a component range such as "12", "0:9999" or "*"
+def VCB_ParseIndexRange(text, count = None):
+	if text == "*":
+		return np.arange(count, dtype = np.int64)
+	if ":" in text:
+		first, last = text.split(":")
+		return np.arange(int(first), int(last) + 1, dtype = np.int64)
+	return np.array([int(text)], dtype = np.int64)
+
+# Split a component string into its node, component type and index text.
+# Returns None for plain object names
+def VCB_SplitComponent(name):
+	match = COMPONENT_PATTERN.match(name)
+	if match is None or match.group("rest"):
+		return None
+	return match.group("node"), match.group("type"), match.group("indices")
+
+## Resolved Selection
+
+# Vertex indices per mesh shape, built from a single walk of the selection
+class ResolvedSelection(object):
+	def __init__(self):
+		self.itemCount = 0
+		self.objects = []		# Mesh shapes selected as whole objects
+		self.firstVertices = []	# (shape, index) of the first vertices of each vertex range, in selection order
+		self.vertexComponentCount = 0
+		self.invalid = []		# Selected items that are neither meshes nor mesh components
+		self.componentTypes = set()
+		self._indices = collections.OrderedDict()
+
+	def add(self, shape, indices):
+		self._indices.setdefault(shape, []).append(indices)
+
+	def isEmpty(self):
+		return self.itemCount == 0
+
+	def shapes(self):
+		return list(self._indices)
+
+	# Sorted unique vertex indices of a shape as an int64 array
+	def indices(self, shape):
+		return np.unique(np.concatenate(self._indices[shape]))
+
+	# Shape -> vertex index array, in selection order
+	def meshIndices(self):
+		return collections.OrderedDict((shape, self.indices(shape)) for shape in self._indices)
+
+	def vertexCount(self):
+		return sum(len(indices) for indices in self.meshIndices().values())
+
+## Resolver
+
+# Walk the current selection once and resolve it to compact vertex index
+# arrays per mesh shape. Component ranges are never flattened into per-vertex
+# names; faces and edges become vertex indices through the mesh's topology arrays
+def VCB_ResolveSelection(items = None):
+	if items is None:
+		items = cmds.ls(orderedSelection = True, long = True) or cmds.ls(selection = True, long = True)
+
+	resolved = ResolvedSelection()
+	resolved.itemCount = len(items)
+	shapes = {}
+	adapters = {}
+
+	# Node -> mesh shape path, or None when the node is not a mesh
+	def GetShape(node):
+		if node not in shapes:
+			shape = None
+			if cmds.objectType(node, isAType = "mesh"):
+				shape = cmds.ls(node, long = True)[0]
+			else:
+				children = cmds.listRelatives(node, shapes = True, type = "mesh", noIntermediate = True, fullPath = True) or []
+				if children:
+					shape = children[0]
+			shapes[node] = shape
+		return shapes[node]
+
+	def GetAdapter(shape):
+		if shape not in adapters:
+			adapters[shape] = vmesh.MayaMesh(shape)
+		return adapters[shape]
+
+	for item in items:
+		component = VCB_SplitComponent(item)
+		node = component[0] if component else item
+		shape = GetShape(node)
+		if shape is None:
+			resolved.invalid.append(item)
+			continue
+
+		# Whole mesh
+		if component is None:
+			resolved.objects.append(shape)
+			resolved.add(shape, GetAdapter(shape).allIndices())
+			continue
+
+		componentType, indexText = component[1], component[2]
+		resolved.componentTypes.add(componentType)
+
+		if componentType == VERTEX:
+			indices = VCB_ParseIndexRange(indexText, GetAdapter(shape).numVertices())
+			resolved.firstVertices.extend((shape, index) for index in indices[0:2].tolist())
+			resolved.vertexComponentCount += len(indices)
+
+		elif componentType == FACE:
+			adapter = GetAdapter(shape)
+			faceCounts, faceIndices = adapter.getFaceVertices()
+			indices = vmesh.VCB_FaceVertexIndices(VCB_ParseIndexRange(indexText, len(faceCounts)), faceCounts, faceIndices)
+
+		else:
+			# Maya converts these to unflattened vertex ranges for us
+			converted = cmds.polyListComponentConversion(item, toVertex = True) or []
+			ranges = [VCB_SplitComponent(name) for name in converted]
+			indices = np.concatenate([VCB_ParseIndexRange(parts[2], GetAdapter(shape).numVertices()) for parts in ranges if parts] or [np.zeros(0, dtype = np.int64)])
+
+		resolved.add(shape, indices)
+
+	return resolved
@@ -0,0 +1,207 @@
+"""
+
+	Spatial index for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Table of Contents
+# Initialization
+# KD-Tree
+# Index Cache
+
+## Imports
+import collections
+import hashlib
+import math
+
+import numpy as np
+
+## Initialization
+
+# Most points in one leaf of the tree
+LEAF_SIZE = 16
+
+# Queries per batch, and (query, point) distances measured at once
+QUERY_CHUNK = 65536
+PAIR_CHUNK = 262144
+
+# Indices kept for reuse across applies
+CACHE_SIZE = 8
+
+_cache = collections.OrderedDict()
+
+## KD-Tree
+
+# Balanced KD-tree over a set of points, answering bulk nearest point
+# queries. The tree is complete and stored in flat arrays: node i has the
+# children 2i+1 and 2i+2, and each leaf keeps its points padded with inf
+class KDTree(object):
+	def __init__(self, points, leafSize = LEAF_SIZE):
+		points = np.asarray(points, dtype = np.float64).reshape(-1, 3)
+		if not len(points):
+			raise ValueError("A spatial index needs at least one point.")
+
+		self.depth = max(0, int(math.ceil(math.log2(len(points) / float(leafSize)))))
+		numNodes = 2 ** (self.depth + 1) - 1
+		numInner = 2 ** self.depth - 1
+
+		# Empty nodes get an inverted box, so no query ever reaches them
+		self.lower = np.full((numNodes, 3), np.inf)
+		self.upper = np.full((numNodes, 3), -np.inf)
+		self.splitAxis = np.zeros(numInner, dtype = np.intp)
+		self.splitValue = np.zeros(numInner)
+
+		# Split every node of a level at the median of its widest axis. A level
+		# is one sort of the points by node, then by their value on the node's
+		# axis scaled into [0, 0.5), instead of a partition per node
+		order = np.arange(len(points))
+		starts = np.zeros(1, dtype = np.intp)
+		ends = np.full(1, len(points), dtype = np.intp)
+		for level in range(self.depth + 1):
+			nodes = 2 ** level - 1 + np.arange(len(starts))
+			counts = ends - starts
+			filled = counts > 0
+			block = points[order]
+			self.lower[nodes[filled]] = np.minimum.reduceat(block, starts[filled])
+			self.upper[nodes[filled]] = np.maximum.reduceat(block, starts[filled])
+			if level == self.depth:
+				break
+
+			extent = np.where(filled[:, None], self.upper[nodes] - self.lower[nodes], 0.0)
+			axes = np.argmax(extent, axis = 1)
+			span = extent[np.arange(len(nodes)), axes]
+			owner = np.repeat(np.arange(len(nodes)), counts)
+			values = block[np.arange(len(block)), axes[owner]] - self.lower[nodes, axes][owner]
+			scale = np.where(span > 0.0, 0.49 / np.where(span > 0.0, span, 1.0), 0.0)
+			order = order[np.argsort(owner + values * scale[owner])]
+
+			middles = (starts + ends) // 2
+			split = counts > 1
+			self.splitAxis[nodes[split]] = axes[split]
+			self.splitValue[nodes[split]] = points[order[middles[split]], axes[split]]
+			starts, ends = np.stack([starts, middles], axis = 1).ravel(), np.stack([middles, ends], axis = 1).ravel()
+
+		# Pack every leaf's points, and their indices for nearest point lookups
+		counts = ends - starts
+		leaf = np.repeat(np.arange(len(starts)), counts)
+		slot = np.arange(len(points)) - np.repeat(starts, counts)
+		leafPoints = np.full((len(starts), int(counts.max()), 3), np.inf)
+		leafPoints[leaf, slot] = points[order]
+		self.leafIndices = np.full((len(starts), int(counts.max())), -1, dtype = np.intp)
+		self.leafIndices[leaf, slot] = order
+
+		# Per axis copies for the queries
+		self.leafAxes = [np.ascontiguousarray(leafPoints[:, :, axis]) for axis in range(3)]
+		self.lowerAxes = [np.ascontiguousarray(self.lower[:, axis]) for axis in range(3)]
+		self.upperAxes = [np.ascontiguousarray(self.upper[:, axis]) for axis in range(3)]
+		self.numPoints = len(points)
+
+	def __len__(self):
+		return self.numPoints
+
+	# Leaf each query falls in when descending by the split planes
+	def _descend(self, queries):
+		nodes = np.zeros(len(queries), dtype = np.intp)
+		rows = np.arange(len(queries))
+		for level in range(self.depth):
+			right = queries[rows, self.splitAxis[nodes]] >= self.splitValue[nodes]
+			nodes = 2 * nodes + 1 + right
+		return nodes - (2 ** self.depth - 1)
+
+	# Squared distance from each query to the nearest point of its leaf, and
+	# that point's index
+	def _leafNearest(self, axes, leaves):
+		squared = 0.0
+		for axis, values in enumerate(axes):
+			delta = self.leafAxes[axis][leaves] - values[:, None]
+			squared = squared + delta * delta
+		slots = squared.argmin(axis = 1)
+		rows = np.arange(len(leaves))
+		return squared[rows, slots], self.leafIndices[leaves, slots]
+
+	# Distance from each query to its nearest point, inf past radius
+	def distances(self, queries, radius = None):
+		return self.nearest(queries, radius)[0]
+
+	# Distance from each query to its nearest point and that point's index.
+	# Past radius the distance is inf and the index -1
+	def nearest(self, queries, radius = None):
+		queries = np.asarray(queries, dtype = np.float64).reshape(-1, 3)
+		result = np.full(len(queries), np.inf)
+		indices = np.full(len(queries), -1, dtype = np.intp)
+
+		# Queries sorted by the leaf they fall in walk the same nodes together,
+		# which keeps the gathers of each batch local
+		leaves = self._descend(queries)
+		order = np.argsort(leaves, kind = "stable")
+		for start in range(0, len(queries), QUERY_CHUNK):
+			batch = order[start:start + QUERY_CHUNK]
+			result[batch], indices[batch] = self._nearest(queries[batch], leaves[batch], radius)
+		return result, indices
+
+	# Axes are kept as separate 1D arrays throughout, NumPy is far slower
+	# reducing many short rows than adding a few long columns
+	def _nearest(self, queries, leaves, radius):
+		limit = np.inf if radius is None else float(radius) ** 2
+		firstLeaf = 2 ** self.depth - 1
+		axes = [np.ascontiguousarray(queries[:, axis]) for axis in range(3)]
+
+		# The query's own leaf gives a first upper bound
+		best, bestIndex = self._leafNearest(axes, leaves)
+
+		# Walk the tree a level at a time, dropping every (query, node) pair
+		# whose box is farther than the query's best distance or the radius
+		owners = np.arange(len(queries))
+		nodes = np.zeros(len(queries), dtype = np.intp)
+		for level in range(self.depth + 1):
+			bound = 0.0
+			for axis, values in enumerate(axes):
+				points = values[owners]
+				gap = np.maximum(np.maximum(self.lowerAxes[axis][nodes] - points, points - self.upperAxes[axis][nodes]), 0.0)
+				bound = bound + gap * gap
+			keep = (bound < best[owners]) & (bound <= limit)
+			owners = owners[keep]
+			nodes = nodes[keep]
+			if level < self.depth:
+				owners = np.repeat(owners, 2)
+				nodes = (2 * nodes[:, None] + np.array([1, 2])).ravel()
+
+		# Pairs that reach the new minimum of their query carry its index, any
+		# of several equally near points will do
+		step = max(1, PAIR_CHUNK // self.leafAxes[0].shape[1])
+		for start in range(0, len(owners), step):
+			chunkOwners = owners[start:start + step]
+			squared, pointIndices = self._leafNearest([values[chunkOwners] for values in axes], nodes[start:start + step] - firstLeaf)
+			np.minimum.at(best, chunkOwners, squared)
+			hit = squared == best[chunkOwners]
+			bestIndex[chunkOwners[hit]] = pointIndices[hit]
+
+		outside = best > limit
+		best[outside] = np.inf
+		bestIndex[outside] = -1
+		return np.sqrt(best), bestIndex
+
+## Index Cache
+
+# Spatial index of a set of points, reused while the same points are asked
+# for. Keyed on the point data itself so moved or reselected seeds rebuild it
+def VCB_GetIndex(points):
+	points = np.ascontiguousarray(points, dtype = np.float64).reshape(-1, 3)
+	key = hashlib.sha1(points.tobytes()).hexdigest()
+
+	if key in _cache:
+		_cache.move_to_end(key)
+		return _cache[key]
+
+	index = _cache[key] = KDTree(points)
+	while len(_cache) > CACHE_SIZE:
+		_cache.popitem(last = False)
+	return index
+
+def VCB_ClearIndexCache():
+	_cache.clear()
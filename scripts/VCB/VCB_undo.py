@@ -0,0 +1,173 @@
+"""
+
+	Undo snapshots for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Table of Contents
+# Initialization
+# Snapshots
+# Operations
+# Maya Command
+
+## Imports
+import os
+
+import numpy as np
+
+try:
+	import maya.cmds as cmds
+except ImportError: # Running outside of Maya
+	cmds = None
+
+## Initialization
+
+# Snapshot precisions, matching the undoPrecision_VCB option var
+PRECISION_UINT8 = 1
+PRECISION_FLOAT16 = 2
+
+PLUGIN_NAME = "VCB_undoCmd"
+COMMAND_NAME = "vcbApplyColors"
+
+# Operations waiting for the Maya command to pick them up
+_pending = []
+
+## Snapshots
+
+# Smallest unsigned type that holds every index
+def VCB_IndexDtype(maxIndex):
+	for dtype in (np.uint16, np.uint32):
+		if maxIndex <= np.iinfo(dtype).max:
+			return dtype
+	return np.int64
+
+# RGBA colors of a set of vertices packed into compact arrays
+class ColorSnapshot(object):
+	def __init__(self, colors, hasColor = None, precision = PRECISION_FLOAT16):
+		colors = np.asarray(colors, dtype = np.float32).reshape(-1, 4)
+		self.precision = precision
+		self.count = len(colors)
+
+		if precision == PRECISION_UINT8:
+			self.colors = np.rint(np.clip(colors, 0.0, 1.0) * 255.0).astype(np.uint8)
+		else:
+			self.colors = colors.astype(np.float16)
+
+		# One bit per vertex, only kept when some vertices had no color
+		self.hasColor = None
+		if hasColor is not None and not np.all(hasColor):
+			self.hasColor = np.packbits(np.asarray(hasColor, dtype = bool))
+
+	def unpack(self):
+		if self.precision == PRECISION_UINT8:
+			return self.colors.astype(np.float32) / 255.0
+		return self.colors.astype(np.float32)
+
+	def unpackHasColor(self):
+		if self.hasColor is None:
+			return np.ones(self.count, dtype = bool)
+		return np.unpackbits(self.hasColor, count = self.count).astype(bool)
+
+	@property
+	def nbytes(self):
+		return self.colors.nbytes + (self.hasColor.nbytes if self.hasColor is not None else 0)
+
+## Operations
+
+# Before and after colors of one mesh's vertices. Undo and redo are each one bulk write
+class ColorOperation(object):
+	def __init__(self, adapter, indices, colors, precision = PRECISION_FLOAT16):
+		if indices is None:
+			indices = adapter.allIndices()
+		indices = np.asarray(indices)
+
+		self.adapter = adapter
+		self.indices = indices.astype(VCB_IndexDtype(int(indices.max()) if len(indices) else 0))
+
+		beforeColors, hasColor = adapter.readColors(indices)
+		self.before = ColorSnapshot(beforeColors, hasColor, precision)
+		self.after = ColorSnapshot(colors, None, precision)
+
+		# The first write uses the exact colors, redo uses the snapshot
+		self._colors = np.asarray(colors, dtype = np.float32)
+
+	def redo(self):
+		if self._colors is not None:
+			colors, self._colors = self._colors, None
+		else:
+			colors = self.after.unpack()
+		self.adapter.setColors(self.indices, colors)
+
+	def undo(self):
+		self.adapter.setColors(self.indices, self.before.unpack())
+
+		# Vertices that had no color go back to having none
+		hasColor = self.before.unpackHasColor()
+		if not hasColor.all():
+			self.adapter.clearColors(self.indices[~hasColor])
+
+	@property
+	def nbytes(self):
+		return self.indices.nbytes + self.before.nbytes + self.after.nbytes
+
+# Applies a list of operations as one step that can be undone and redone headless.
+# written marks operations that have already put their colors on the meshes
+class OperationGroup(object):
+	def __init__(self, operations, written = False):
+		self.operations = list(operations)
+		self.written = written
+
+	def redo(self):
+		for operation in self.operations:
+			operation.redo()
+		self.written = True
+
+	def undo(self):
+		for operation in reversed(self.operations):
+			operation.undo()
+		self.written = False
+
+	@property
+	def nbytes(self):
+		return sum(operation.nbytes for operation in self.operations)
+
+	def summary(self):
+		meshes = len(set(id(operation.adapter) for operation in self.operations))
+		return "%d vertices on %d meshes, %.1f KB undo data" % (sum(len(operation.indices) for operation in self.operations), meshes, self.nbytes / 1024.0)
+
+# Commit for the engine's applies that snapshots every write into group as a
+# ColorOperation instead of writing it. VCB_Execute then writes the group
+def VCB_RecordingCommit(group, precision = PRECISION_FLOAT16):
+	def RecordOperation(adapter, indices, colors):
+		group.operations.append(ColorOperation(adapter, indices, colors, precision))
+	return RecordOperation
+
+## Maya Command
+
+# Load the vcbApplyColors command plugin that lives next to this module
+def VCB_LoadPlugin():
+	if not cmds.pluginInfo(PLUGIN_NAME, query = True, loaded = True):
+		cmds.loadPlugin(os.path.join(os.path.dirname(os.path.abspath(__file__)), PLUGIN_NAME + ".py"), quiet = True)
+
+# Hand the next group to the Maya command
+def VCB_TakePending():
+	return _pending.pop(0)
+
+# Write the operations through one undoable Maya command, so the whole apply
+# is a single entry in the undo queue. A written group is only registered for
+# undo. Returns the group
+def VCB_Execute(operations):
+	group = operations if isinstance(operations, OperationGroup) else OperationGroup(operations)
+	VCB_LoadPlugin()
+	_pending.append(group)
+	try:
+		getattr(cmds, COMMAND_NAME)()
+	finally:
+		if group in _pending:
+			_pending.remove(group)
+	return group
@@ -0,0 +1,60 @@
+"""
+
+	Undoable color command plugin for Vertex Color Bench (VCB) v1.0
+
+	VCB offers a set of tools for editting vertex color information.
+	Made by Noah Bench - noahbench.com - nbench0218@gmail.com
+
+	Many thanks to Martin Dahlin for all his scripts have taught me about pymel
+
+"""
+
+## Usage
+# Loaded by VCB_undo.VCB_LoadPlugin. VCB_undo.VCB_Execute queues the colors
+# to write and calls vcbApplyColors, which holds on to them for undo and redo
+
+## Imports
+import maya.api.OpenMaya as om
+
+import VCB.VCB_undo as undo
+
+# Use the OpenMaya 2.0 plugin API
+maya_useNewAPI = True
+
+## Command
+
+class ApplyColorsCommand(om.MPxCommand):
+	def __init__(self):
+		om.MPxCommand.__init__(self)
+		self.group = None
+
+	@staticmethod
+	def creator():
+		return ApplyColorsCommand()
+
+	def isUndoable(self):
+		return True
+
+	def doIt(self, args):
+		self.group = undo.VCB_TakePending()
+
+		# Chunked applies have already written their colors
+		if self.group.written:
+			self.setResult(int(self.group.nbytes))
+		else:
+			self.redoIt()
+
+	def redoIt(self):
+		self.group.redo()
+		self.setResult(int(self.group.nbytes))
+
+	def undoIt(self):
+		self.group.undo()
+
+## Plugin
+
+def initializePlugin(plugin):
+	om.MFnPlugin(plugin, "Noah Bench", "1.0").registerCommand(undo.COMMAND_NAME, ApplyColorsCommand.creator)
+
+def uninitializePlugin(plugin):
+	om.MFnPlugin(plugin).deregisterCommand(undo.COMMAND_NAME)
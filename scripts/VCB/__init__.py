@@ -10,14 +10,51 @@
 """
 
 ## Import
-import pymel.core as pm
+# The engine, kernel and mesh adapters run without Maya. Only an interactive
+# session sets up the option vars and opens the window
+import time
 
-# Option vars
-import VCB_optVars as vars
-vars.create()
+_importStart = time.perf_counter()
+
+try:
+	import maya.cmds as cmds
+	INTERACTIVE = not cmds.about(batch = True)
+except (ImportError, AttributeError):
+	INTERACTIVE = False
 
 ## Startup
 
-# Import and create UI
-import VCB.VCB_UI as UI
-UI.createUI()
\ No newline at end of file
+# Seconds from the start of the last show() until Maya went idle with the window drawn
+startupSeconds = None
+
+# Open the VCB window. An open window is brought to the front, rebuild
+# recreates it. The modules stay loaded between calls, so only the first
+# call pays for importing them
+def show(rebuild = False, start = None):
+	if start is None:
+		start = time.perf_counter()
+
+	# Option vars
+	import VCB.VCB_optVars as vars
+	vars.create()
+
+	import VCB.VCB_UI as UI
+	if cmds.window(UI.WIN_MAIN, exists = True) and not rebuild:
+		cmds.window(UI.WIN_MAIN, edit = True, iconify = False)
+		cmds.showWindow(UI.WIN_MAIN)
+		return UI.WIN_MAIN
+
+	# Create UI
+	window = UI.createUI()
+
+	# Measured once the window has been drawn
+	def ReportStartup():
+		global startupSeconds
+		startupSeconds = time.perf_counter() - start
+		print("VCB: window opened in %.3fs" % startupSeconds)
+	cmds.evalDeferred(ReportStartup, lowestPriority = True)
+
+	return window
+
+if INTERACTIVE:
+	show(start = _importStart)
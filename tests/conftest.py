@@ -0,0 +1,12 @@
+"""
+
+	Test setup for Vertex Color Bench (VCB) v1.0
+
+	The VCB package lives in the scripts folder Maya loads it from.
+
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
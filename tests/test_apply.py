@@ -0,0 +1,72 @@
+"""
+
+	Apply tests for Vertex Color Bench (VCB) v1.0
+
+	Colors in-memory meshes through the engine, no Maya required.
+
+"""
+
+## Imports
+import numpy as np
+
+import VCB.VCB_engine as engine
+import VCB.VCB_mesh as vmesh
+
+## Meshes
+
+def _VCB_Mesh(count = 100, colored = False, seed = 0):
+	positions = np.random.default_rng(seed).random((count, 3))
+	colors = np.full((count, 4), 0.25, dtype = np.float32) if colored else None
+	return vmesh.MemoryMesh(positions, colors)
+
+## Tests
+
+def test_apply_writes_once_per_mesh():
+	mesh = _VCB_Mesh()
+	settings = engine.Settings(mode = 1, colorMain = (1.0, 0.5, 0.0), alphaMain = 0.75)
+	engine.VCB_ApplyMesh(mesh, settings)
+
+	assert mesh.writeCount == 1
+	np.testing.assert_allclose(mesh.colors, np.tile((1.0, 0.5, 0.0, 0.75), (100, 1)))
+	assert mesh.hasColor.all()
+
+def test_apply_selected_vertices_only():
+	mesh = _VCB_Mesh()
+	indices = np.array([3, 10, 42, 99])
+	settings = engine.Settings(mode = 1, colorMain = (0.0, 1.0, 0.0))
+	engine.VCB_ApplyMesh(mesh, settings, indices)
+
+	assert mesh.writeCount == 1
+	np.testing.assert_array_equal(np.flatnonzero(mesh.hasColor), indices)
+	np.testing.assert_allclose(mesh.colors[indices], np.tile((0.0, 1.0, 0.0, 1.0), (4, 1)))
+
+def test_apply_gradient_matches_per_vertex_lerp():
+	mesh = _VCB_Mesh()
+	positions = mesh.getPositions()
+	settings = engine.Settings(mode = 2, colorMain = (1.0, 0.0, 0.0), alphaMain = 1.0, colorSub = (0.0, 0.0, 1.0), alphaSub = 0.5, gradientBounds = 1, gradientDirection = 2)
+	engine.VCB_ApplyMesh(mesh, settings)
+
+	# One vertex at a time, as the tool used to. The sub color sits at the
+	# bottom of the bounds and the main color at the top
+	low, high = positions[:, 1].min(), positions[:, 1].max()
+	for vertex in range(len(positions)):
+		weight = (positions[vertex, 1] - low) / (high - low)
+		expected = np.array([weight, 0.0, 1.0 - weight, 0.5 + 0.5 * weight])
+		np.testing.assert_allclose(mesh.colors[vertex], expected, atol = 1e-5)
+	assert mesh.writeCount == 1
+
+def test_apply_meshes_writes_once_each():
+	meshes = [_VCB_Mesh(50, seed = seed) for seed in range(3)]
+	settings = engine.Settings(mode = 2, gradientBounds = 1, multiMeshBounds = 2, colorMain = (0.0, 0.0, 0.0), colorSub = (1.0, 1.0, 1.0))
+	engine.VCB_ApplyMeshes(meshes, settings, processes = False)
+
+	assert [mesh.writeCount for mesh in meshes] == [1, 1, 1]
+	assert all(mesh.hasColor.all() for mesh in meshes)
+
+def test_apply_blends_over_existing_colors():
+	mesh = _VCB_Mesh(colored = True)
+	settings = engine.Settings(mode = 1, blendMode = 2, colorMain = (0.5, 0.5, 0.5), alphaMain = 0.5)
+	engine.VCB_ApplyMesh(mesh, settings)
+
+	np.testing.assert_allclose(mesh.colors, np.full((100, 4), 0.75), atol = 1e-6)
+	assert mesh.writeCount == 1
@@ -0,0 +1,109 @@
+"""
+
+	Background apply tests for Vertex Color Bench (VCB) v1.0
+
+	Drives the async applier with the stand-in event loop, no Maya required.
+
+"""
+
+## Imports
+import numpy as np
+import pytest
+
+import VCB.VCB_async as vasync
+import VCB.VCB_engine as engine
+import VCB.VCB_mesh as vmesh
+
+## Fixtures
+
+@pytest.fixture
+def applier():
+	applier = vasync.AsyncApplier(loop = vasync.EventLoop())
+	yield applier
+	applier.shutdown()
+
+# Commit that writes like the default one and remembers every call
+class _RecordingCommit(object):
+	def __init__(self):
+		self.calls = []
+
+	def __call__(self, adapter, indices, colors):
+		self.calls.append((adapter, indices, np.array(colors)))
+		engine.VCB_Commit(adapter, indices, colors)
+
+def _VCB_Meshes(count = 2):
+	rng = np.random.default_rng(0)
+	return [vmesh.MemoryMesh(rng.random((200, 3))) for i in range(count)]
+
+def _VCB_Settings(color = (1.0, 0.0, 0.0)):
+	return engine.Settings(mode = 2, gradientBounds = 1, gradientDirection = 2, colorMain = color, colorSub = (0.0, 0.0, 1.0))
+
+## Tests
+
+def test_commits_once_and_calls_back_with_the_result(applier):
+	meshes = _VCB_Meshes()
+	commit = _RecordingCommit()
+	callbacks = []
+
+	future = applier.submit(meshes, _VCB_Settings(), commit = commit)
+	future.add_done_callback(callbacks.append)
+	applier.loop.runUntil(future, timeout = 30.0)
+	# Anything left on the loop must not write or call back again
+	applier.loop.process(timeout = 0.1)
+
+	assert callbacks == [future]
+	assert len(commit.calls) == len(meshes)
+	written = future.result()
+	assert [adapter for adapter, indices, colors in written] == meshes
+
+	# Same colors a blocking apply writes
+	for mesh, (adapter, indices, colors) in zip(_VCB_Meshes(), written):
+		engine.VCB_ApplyMesh(mesh, _VCB_Settings())
+		np.testing.assert_allclose(colors, mesh.colors, atol = 1e-6)
+	assert [mesh.writeCount for mesh in meshes] == [1, 1]
+
+def test_superseded_job_is_cancelled(applier):
+	meshes = _VCB_Meshes(1)
+	first = _RecordingCommit()
+	second = _RecordingCommit()
+
+	superseded = applier.submit(meshes, _VCB_Settings((1.0, 0.0, 0.0)), commit = first)
+	current = applier.submit(meshes, _VCB_Settings((0.0, 1.0, 0.0)), commit = second)
+	applier.loop.runUntil(current, timeout = 30.0)
+	applier.loop.runUntil(superseded, timeout = 30.0)
+
+	assert superseded.cancelled()
+	assert not first.calls
+	assert len(second.calls) == 1
+	assert meshes[0].writeCount == 1
+
+def test_stale_job_never_commits(applier):
+	meshes = _VCB_Meshes(1)
+	commit = _RecordingCommit()
+
+	future = applier.submit(meshes, _VCB_Settings(), commit = commit, isCurrent = lambda: False)
+	applier.loop.runUntil(future, timeout = 30.0)
+
+	assert future.cancelled()
+	assert not commit.calls
+	assert meshes[0].writeCount == 0
+
+def test_supersede_drops_pending_job(applier):
+	meshes = _VCB_Meshes(1)
+	commit = _RecordingCommit()
+
+	future = applier.submit(meshes, _VCB_Settings(), commit = commit)
+	applier.supersede()
+	applier.loop.runUntil(future, timeout = 30.0)
+
+	assert future.cancelled()
+	assert not commit.calls
+
+def test_commit_errors_reach_the_future(applier):
+	def Fail(adapter, indices, colors):
+		raise RuntimeError("boom")
+
+	future = applier.submit(_VCB_Meshes(1), _VCB_Settings(), commit = Fail)
+	applier.loop.runUntil(future, timeout = 30.0)
+	with pytest.raises(RuntimeError):
+		future.result(timeout = 0)
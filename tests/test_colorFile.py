@@ -0,0 +1,88 @@
+"""
+
+	Color file tests for Vertex Color Bench (VCB) v1.0
+
+	Round trips colors through snapshot files on in-memory meshes.
+
+"""
+
+## Imports
+import numpy as np
+import pytest
+
+import VCB.VCB_colorFile as colorFile
+import VCB.VCB_mesh as vmesh
+import VCB.VCB_undo as undo
+
+## Meshes
+
+# A strip of quads with random colors, every third vertex unassigned
+def _VCB_Mesh(count = 60, seed = 0):
+	rng = np.random.default_rng(seed)
+	positions = rng.random((count, 3))
+	faceIndices = [index for quad in range(count // 2 - 1) for index in (quad * 2, quad * 2 + 2, quad * 2 + 3, quad * 2 + 1)]
+	hasColor = np.arange(count) % 3 != 0
+	return vmesh.MemoryMesh(positions, rng.random((count, 4)), faceCounts = [4] * (count // 2 - 1), faceIndices = faceIndices, hasColor = hasColor)
+
+def _VCB_Blank(mesh, positions = None):
+	return vmesh.MemoryMesh(mesh.positions if positions is None else positions, faceCounts = mesh.faceCounts, faceIndices = mesh.faceIndices)
+
+## Tests
+
+@pytest.mark.parametrize("precision, tolerance", [(undo.PRECISION_FLOAT16, 1e-3), (undo.PRECISION_UINT8, 0.5 / 255.0 + 1e-6)])
+def test_round_trip_by_index(tmp_path, precision, tolerance):
+	mesh = _VCB_Mesh()
+	path = str(tmp_path / ("mesh" + colorFile.FILE_EXTENSION))
+	size = colorFile.VCB_ExportColors(mesh, path, precision)
+	assert size == (tmp_path / ("mesh" + colorFile.FILE_EXTENSION)).stat().st_size
+
+	target = _VCB_Blank(mesh)
+	assert colorFile.VCB_ImportColors(target, path) == "index"
+	np.testing.assert_array_equal(target.hasColor, mesh.hasColor)
+	np.testing.assert_allclose(target.colors[mesh.hasColor], mesh.colors[mesh.hasColor], atol = tolerance)
+	assert target.writeCount == 1
+
+def test_transfer_matches_brute_force(tmp_path):
+	mesh = _VCB_Mesh()
+	path = str(tmp_path / "mesh.vcbc")
+	colorFile.VCB_ExportColors(mesh, path, undo.PRECISION_FLOAT16)
+
+	# Different vertex count, so the colors go by nearest colored point
+	positions = np.random.default_rng(9).random((45, 3))
+	target = vmesh.MemoryMesh(positions)
+	assert colorFile.VCB_ImportColors(target, path) == "nearest"
+
+	sources = np.flatnonzero(mesh.hasColor)
+	stored = mesh.positions.astype(np.float32).astype(np.float64)[sources]
+	for vertex, position in enumerate(positions):
+		nearest = sources[np.argmin(((stored - position) ** 2).sum(axis = 1))]
+		np.testing.assert_allclose(target.colors[vertex], mesh.colors[nearest], atol = 1e-3)
+	assert target.hasColor.all()
+
+def test_transfer_radius_skips_far_vertices(tmp_path):
+	mesh = _VCB_Mesh()
+	path = str(tmp_path / "mesh.vcbc")
+	colorFile.VCB_ExportColors(mesh, path)
+
+	positions = np.concatenate([mesh.positions[0:5] + 0.001, mesh.positions[0:5] + 50.0])
+	target = vmesh.MemoryMesh(positions)
+	colorFile.VCB_ImportColors(target, path, transfer = True, radius = 0.5)
+	assert target.hasColor[0:5].all()
+	assert not target.hasColor[5:].any()
+
+def test_index_import_needs_matching_count(tmp_path):
+	mesh = _VCB_Mesh()
+	path = str(tmp_path / "mesh.vcbc")
+	colorFile.VCB_ExportColors(mesh, path, positions = False)
+
+	with pytest.raises(ValueError):
+		colorFile.VCB_ImportColors(vmesh.MemoryMesh(np.zeros((10, 3))), path, transfer = False)
+	# Without positions there is nothing to transfer by
+	with pytest.raises(ValueError):
+		colorFile.VCB_ImportColors(vmesh.MemoryMesh(np.zeros((10, 3))), path)
+
+def test_rejects_other_files(tmp_path):
+	path = tmp_path / "bogus.vcbc"
+	path.write_bytes(b"not a color file" * 8)
+	with pytest.raises(ValueError):
+		colorFile.ColorFile(str(path))
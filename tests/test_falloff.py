@@ -0,0 +1,88 @@
+"""
+
+	Soft falloff tests for Vertex Color Bench (VCB) v1.0
+
+	Checks falloff weights against brute-force distances to the selection.
+
+"""
+
+## Imports
+import heapq
+
+import numpy as np
+
+import VCB.VCB_falloff as falloff
+import VCB.VCB_geodesic as geodesic
+import VCB.VCB_mesh as vmesh
+
+## References
+
+# Maya's default curve, full strength easing out to none
+def _VCB_DefaultCurve(t):
+	t = np.clip(t, 0.0, 1.0)
+	return 1.0 - t * t * (3.0 - 2.0 * t)
+
+def _VCB_ReferenceWeights(distances, selected, radius):
+	indices = np.flatnonzero(distances <= radius)
+	weights = _VCB_DefaultCurve(distances[indices] / radius)
+	weights[np.isin(indices, selected)] = 1.0
+	return indices, weights
+
+## Tests
+
+def test_volume_weights_match_brute_force():
+	rng = np.random.default_rng(1)
+	positions = rng.random((3000, 3)) * 4.0
+	selected = rng.choice(len(positions), 25, replace = False)
+	radius = 0.6
+	indices, weights = falloff.VCB_FalloffWeights(positions, selected, radius)
+
+	distances = np.sqrt(((positions[:, None, :] - positions[selected][None, :, :]) ** 2).sum(axis = 2)).min(axis = 1)
+	expectedIndices, expectedWeights = _VCB_ReferenceWeights(distances, selected, radius)
+	np.testing.assert_array_equal(indices, expectedIndices)
+	np.testing.assert_allclose(weights, expectedWeights, atol = 1e-5)
+
+def test_surface_weights_follow_the_edges():
+	# A strip folded back on itself: the far end is close in space but not along the surface
+	count = 40
+	positions = np.array([(float(column % 20) if column < 20 else 39.0 - column, float(row), 0.2 * (column >= 20)) for column in range(count) for row in range(2)])
+	faceIndices = [index for quad in range(count - 1) for index in (quad * 2, quad * 2 + 2, quad * 2 + 3, quad * 2 + 1)]
+	faceCounts = [4] * (count - 1)
+	graph = geodesic.MeshGraph(faceCounts, faceIndices, len(positions))
+
+	selected = [0, 1]
+	radius = 4.5
+	indices, weights = falloff.VCB_FalloffWeights(positions, selected, radius, graph = graph)
+
+	# Heap Dijkstra over the same edges
+	edges = vmesh.VCB_EdgesFromFaces(faceCounts, faceIndices)
+	neighbors = [[] for i in range(len(positions))]
+	for first, second in edges.tolist():
+		length = float(np.linalg.norm(positions[first] - positions[second]))
+		neighbors[first].append((second, length))
+		neighbors[second].append((first, length))
+	distances = np.full(len(positions), np.inf)
+	heap = [(0.0, seed) for seed in selected]
+	while heap:
+		distance, vertex = heapq.heappop(heap)
+		if distance >= distances[vertex]:
+			continue
+		distances[vertex] = distance
+		for neighbor, length in neighbors[vertex]:
+			heapq.heappush(heap, (distance + length, neighbor))
+
+	expectedIndices, expectedWeights = _VCB_ReferenceWeights(distances, selected, radius)
+	np.testing.assert_array_equal(indices, expectedIndices)
+	np.testing.assert_allclose(weights, expectedWeights, atol = 1e-5)
+	# The folded end is within radius in space, but only reached along the surface
+	assert indices.max() < 20
+
+def test_zero_radius_keeps_the_selection():
+	positions = np.random.default_rng(2).random((50, 3))
+	indices, weights = falloff.VCB_FalloffWeights(positions, [7, 3, 7], 0.0)
+	np.testing.assert_array_equal(indices, [3, 7])
+	np.testing.assert_array_equal(weights, [1.0, 1.0])
+
+def test_curve_from_maya_text():
+	curve = falloff.VCB_CurveFromMaya("1,0,1,0.5,0.5,1,0,1,1")
+	np.testing.assert_allclose(curve.evaluate([0.0, 0.25, 0.5, 0.75, 1.0])[:, 0], [1.0, 0.75, 0.5, 0.25, 0.0], atol = 1e-6)
@@ -0,0 +1,100 @@
+"""
+
+	Mesh graph tests for Vertex Color Bench (VCB) v1.0
+
+	Checks edge distances against a heap-based Dijkstra over the same edges.
+
+"""
+
+## Imports
+import heapq
+
+import numpy as np
+
+import VCB.VCB_geodesic as geodesic
+import VCB.VCB_mesh as vmesh
+
+## Meshes
+
+# A width by height grid of quads with jittered vertices
+def _VCB_Grid(width, height, seed = 0, offset = 0):
+	rng = np.random.default_rng(seed)
+	columns, rows = np.meshgrid(np.arange(width + 1), np.arange(height + 1), indexing = "ij")
+	positions = np.column_stack([columns.ravel(), rows.ravel(), np.zeros(columns.size)]).astype(np.float64)
+	positions += rng.random(positions.shape) * 0.4
+
+	faceIndices = []
+	for column in range(width):
+		for row in range(height):
+			corner = column * (height + 1) + row
+			faceIndices += [corner, corner + height + 1, corner + height + 2, corner + 1]
+	return positions, np.full(width * height, 4), np.array(faceIndices) + offset
+
+## References
+
+def _VCB_Dijkstra(positions, edges, seeds, radius = np.inf):
+	neighbors = [[] for i in range(len(positions))]
+	for first, second in edges.tolist():
+		length = float(np.linalg.norm(positions[first] - positions[second]))
+		neighbors[first].append((second, length))
+		neighbors[second].append((first, length))
+
+	result = np.full(len(positions), np.inf)
+	heap = [(0.0, seed) for seed in seeds]
+	while heap:
+		distance, vertex = heapq.heappop(heap)
+		if distance >= result[vertex] or distance > radius:
+			continue
+		result[vertex] = distance
+		for neighbor, length in neighbors[vertex]:
+			if distance + length < result[neighbor]:
+				heapq.heappush(heap, (distance + length, neighbor))
+	return result
+
+## Tests
+
+def test_distances_match_dijkstra():
+	positions, faceCounts, faceIndices = _VCB_Grid(30, 20)
+	graph = geodesic.MeshGraph(faceCounts, faceIndices, len(positions))
+	edges = vmesh.VCB_EdgesFromFaces(faceCounts, faceIndices)
+
+	seeds = [0, 77, 400]
+	expected = _VCB_Dijkstra(positions, edges, seeds)
+	# float32 edge lengths summed along long paths
+	np.testing.assert_allclose(graph.distances(positions, seeds), expected, rtol = 1e-5)
+
+def test_radius_leaves_far_vertices_unreached():
+	positions, faceCounts, faceIndices = _VCB_Grid(25, 25, seed = 1)
+	graph = geodesic.MeshGraph(faceCounts, faceIndices, len(positions))
+	edges = vmesh.VCB_EdgesFromFaces(faceCounts, faceIndices)
+
+	radius = 6.0
+	expected = _VCB_Dijkstra(positions, edges, [300], radius)
+	distances = graph.distances(positions, [300], radius)
+	inside = np.isfinite(expected)
+	np.testing.assert_allclose(distances[inside], expected[inside], rtol = 1e-5)
+	# Nothing past the radius gets a finite distance
+	assert (np.isinf(distances) | (distances <= radius + 1e-4)).all()
+	assert np.isinf(distances[distances > radius]).all()
+
+def test_pieces_without_a_seed_stay_unreached():
+	first, counts, indices = _VCB_Grid(4, 4)
+	second, moreCounts, moreIndices = _VCB_Grid(3, 3, seed = 2, offset = len(first))
+	positions = np.concatenate([first, second + 10.0])
+	graph = geodesic.MeshGraph(np.concatenate([counts, moreCounts]), np.concatenate([indices, moreIndices]), len(positions))
+
+	distances = graph.distances(positions, [0])
+	assert np.isfinite(distances[:len(first)]).all()
+	assert np.isinf(distances[len(first):]).all()
+
+def test_adjacency_matches_edges():
+	positions, faceCounts, faceIndices = _VCB_Grid(6, 5)
+	graph = geodesic.MeshGraph(faceCounts, faceIndices, len(positions))
+	edges = vmesh.VCB_EdgesFromFaces(faceCounts, faceIndices)
+
+	vertices = np.array([0, 8, 20, len(positions) - 1])
+	neighbors, counts = graph.adjacency(vertices)
+	starts = np.cumsum(counts) - counts
+	for vertex, start, count in zip(vertices, starts, counts):
+		expected = set(edges[edges[:, 0] == vertex, 1]) | set(edges[edges[:, 1] == vertex, 0])
+		assert set(neighbors[start:start + count].tolist()) == expected
@@ -0,0 +1,156 @@
+"""
+
+	Kernel tests for Vertex Color Bench (VCB) v1.0
+
+	Checks the batched NumPy kernel against plain per-vertex references.
+
+"""
+
+## Imports
+import math
+
+import numpy as np
+import pytest
+
+import VCB.VCB_kernel as kernel
+
+## References
+
+# One channel of one vertex, the way a per-vertex loop would blend it
+def _VCB_BlendScalar(blendMode, base, color, alpha):
+	if blendMode == kernel.BLEND_REPLACE:
+		return color
+	if blendMode == kernel.BLEND_ADD:
+		return base + color
+	if blendMode == kernel.BLEND_MULTIPLY:
+		return base * color
+	if blendMode == kernel.BLEND_SCREEN:
+		return 1.0 - (1.0 - base) * (1.0 - color)
+	if blendMode == kernel.BLEND_OVERLAY:
+		if base < 0.5:
+			return 2.0 * base * color
+		return 1.0 - 2.0 * (1.0 - base) * (1.0 - color)
+	if blendMode == kernel.BLEND_SUBTRACT:
+		return base - color
+	if blendMode == kernel.BLEND_MIN:
+		return min(base, color)
+	if blendMode == kernel.BLEND_MAX:
+		return max(base, color)
+	if blendMode == kernel.BLEND_LERP:
+		return base + (color - base) * alpha
+	raise ValueError(blendMode)
+
+def _VCB_BlendReference(baseColors, colors, blendMode, opacity, channels):
+	result = np.array(baseColors, dtype = np.float64)
+	for vertex in range(len(baseColors)):
+		for channel in range(4):
+			if not channels[channel]:
+				continue
+			base = float(baseColors[vertex][channel])
+			blended = _VCB_BlendScalar(blendMode, base, float(colors[vertex][channel]), float(colors[vertex][3]))
+			blended = min(max(blended, 0.0), 1.0)
+			result[vertex][channel] = base + (blended - base) * opacity
+	return result
+
+def _VCB_Colors(count, seed):
+	return np.random.default_rng(seed).random((count, 4)).astype(np.float32)
+
+## Blending
+
+@pytest.mark.parametrize("blendMode", sorted(kernel.VCB_BlendModes()))
+@pytest.mark.parametrize("opacity, channels", [(1.0, (True, True, True, True)), (0.35, (True, False, True, False))])
+def test_blend_matches_reference(blendMode, opacity, channels):
+	baseColors = _VCB_Colors(200, 1)
+	colors = _VCB_Colors(200, 2)
+	# Exact half greys sit on the Overlay switch
+	baseColors[0:4] = 0.5
+
+	result = kernel.VCB_BlendColors(baseColors, colors, blendMode, opacity, channels)
+	np.testing.assert_allclose(result, _VCB_BlendReference(baseColors, colors, blendMode, opacity, channels), atol = 1e-5)
+
+def test_every_blend_mode_is_registered():
+	assert sorted(kernel.VCB_BlendModes()) == list(range(kernel.BLEND_REPLACE, kernel.BLEND_LERP + 1))
+	assert sorted(kernel.NEUTRAL_COLORS) == sorted(kernel.VCB_BlendModes())
+
+def test_blend_unknown_mode():
+	with pytest.raises(ValueError):
+		kernel.VCB_BlendColors(_VCB_Colors(2, 0), _VCB_Colors(2, 1), 42)
+
+def test_blend_leaves_inputs_alone():
+	baseColors = _VCB_Colors(10, 3)
+	colors = _VCB_Colors(10, 4)
+	before = baseColors.copy(), colors.copy()
+	for blendMode in kernel.VCB_BlendModes():
+		kernel.VCB_BlendColors(baseColors, colors, blendMode, 0.5, (True, False, True, True))
+	np.testing.assert_array_equal(baseColors, before[0])
+	np.testing.assert_array_equal(colors, before[1])
+
+## Gradient Plan
+
+def test_mesh_bounds_weights_match_reference():
+	positions = np.random.default_rng(5).random((100, 3)) * 4.0 - 2.0
+	boundsMin, boundsMax = positions.min(axis = 0), positions.max(axis = 0)
+	for direction in (1, 2, 3):
+		plan = kernel.GradientPlan(2, (1, 0, 0), (0, 0, 1), 1.0, 0.0, 1, direction, boundsMin, boundsMax)
+		axis = direction - 1
+		expected = [abs((position[axis] - boundsMax[axis]) / (boundsMax[axis] - boundsMin[axis])) for position in positions]
+		np.testing.assert_allclose(plan.weights(positions), expected, atol = 1e-6)
+
+def test_point_to_point_weights_match_reference():
+	positions = np.random.default_rng(6).random((100, 3))
+	pointOne, pointTwo = (0.1, 0.2, 0.3), (0.9, 0.4, 0.8)
+	plan = kernel.GradientPlan(2, (1, 0, 0), (0, 0, 1), 1.0, 1.0, 2, 1, pointOne = pointOne, pointTwo = pointTwo)
+	span = math.dist(pointOne, pointTwo)
+	expected = [min(math.dist(position, pointOne) / span, 1.0) for position in positions]
+	np.testing.assert_allclose(plan.weights(positions), expected, atol = 1e-6)
+
+@pytest.mark.parametrize("gradientMode, extra", [
+	(1, {"boundsMin": (0.0, 1.0, 0.0), "boundsMax": (1.0, 1.0, 1.0)}),		# Flat along Y
+	(2, {"pointOne": (0.5, 0.5, 0.5), "pointTwo": (0.5, 0.5, 0.5)}),		# Coincident anchors
+	(4, {"radius": 0.0, "vertexDistances": np.zeros(20)}),					# Zero radius
+])
+def test_degenerate_span_gives_main_color(gradientMode, extra):
+	positions = np.random.default_rng(7).random((20, 3))
+	plan = kernel.GradientPlan(2, (0.2, 0.4, 0.6), (1, 1, 1), 0.8, 0.0, gradientMode, 2, **extra)
+	colors = plan.colors(positions)
+	assert np.isfinite(colors).all()
+	np.testing.assert_allclose(colors, np.tile((0.2, 0.4, 0.6, 0.8), (20, 1)), atol = 1e-6)
+
+def test_standard_plan_is_main_color():
+	plan = kernel.GradientPlan(1, (0.1, 0.2, 0.3), (1, 1, 1), 0.4, 1.0)
+	np.testing.assert_allclose(plan.colors(np.zeros((3, 3))), np.tile((0.1, 0.2, 0.3, 0.4), (3, 1)), atol = 1e-6)
+
+## Ramps
+
+# Linear ramp color at one position, stops sorted by position
+def _VCB_RampReference(stops, position):
+	stops = sorted(stops, key = lambda stop: stop[0])
+	if position <= stops[0][0]:
+		return stops[0][1:]
+	for left, right in zip(stops, stops[1:]):
+		if position < right[0]:
+			factor = (position - left[0]) / (right[0] - left[0]) if right[0] - left[0] > kernel.EPSILON else 0.0
+			return [a + (b - a) * factor for a, b in zip(left[1:], right[1:])]
+	return stops[-1][1:]
+
+def test_ramp_matches_reference():
+	stops = [(0.7, 0, 1, 0, 1), (0.0, 1, 0, 0, 1), (1.0, 0, 0, 1, 0.5), (0.25, 1, 1, 0, 1)]
+	ramp = kernel.Ramp(stops)
+	positions = np.linspace(0.0, 1.0, 101)
+	expected = [_VCB_RampReference(stops, position) for position in positions]
+	np.testing.assert_allclose(ramp.evaluate(positions), expected, atol = 1e-6)
+
+def test_ramp_degenerate_stops():
+	# One stop holds everywhere, stacked stops jump instead of dividing by zero
+	single = kernel.Ramp([(0.5, 0.1, 0.2, 0.3, 0.4)])
+	np.testing.assert_allclose(single.evaluate([0.0, 0.5, 1.0]), np.tile((0.1, 0.2, 0.3, 0.4), (3, 1)), atol = 1e-6)
+
+	stacked = kernel.Ramp([(0.5, 1, 0, 0, 1), (0.5, 0, 0, 1, 1)])
+	colors = stacked.evaluate([0.25, 0.75])
+	assert np.isfinite(colors).all()
+	np.testing.assert_allclose(colors, [(1, 0, 0, 1), (0, 0, 1, 1)], atol = 1e-6)
+
+def test_ramp_lookup_matches_evaluate():
+	ramp = kernel.Ramp([(0.0, 1, 0, 0, 1), (1.0, 0, 0, 1, 1)])
+	weights = np.linspace(0.0, 1.0, 57)
+	np.testing.assert_allclose(kernel.VCB_RampLookup(ramp.bake(), weights), ramp.evaluate(weights), atol = 1.0 / kernel.RAMP_RESOLUTION)
@@ -0,0 +1,62 @@
+"""
+
+	Smoothing tests for Vertex Color Bench (VCB) v1.0
+
+	Runs on in-memory meshes, no Maya required.
+
+"""
+
+## Imports
+import numpy as np
+
+import VCB.VCB_engine as engine
+import VCB.VCB_mesh as vmesh
+
+## Meshes
+
+# A row of count quads, vertex 2i below 2i + 1
+def _VCB_Strip(count):
+	positions = [(float(column), float(row), 0.0) for column in range(count + 1) for row in range(2)]
+	faceIndices = []
+	for quad in range(count):
+		faceIndices += [quad * 2, quad * 2 + 2, quad * 2 + 3, quad * 2 + 1]
+	return positions, [4] * count, faceIndices
+
+# Strip whose first two columns are colored, red then blue, the rest unassigned
+def _VCB_PartlyColored():
+	positions, faceCounts, faceIndices = _VCB_Strip(4)
+	colors = np.zeros((len(positions), 4), dtype = np.float32)
+	colors[0:2] = (1.0, 0.0, 0.0, 1.0)
+	colors[2:4] = (0.0, 0.0, 1.0, 1.0)
+	hasColor = np.zeros(len(positions), dtype = bool)
+	hasColor[0:4] = True
+	return vmesh.MemoryMesh(positions, colors, faceCounts = faceCounts, faceIndices = faceIndices, hasColor = hasColor)
+
+## Tests
+
+def test_smooth_leaves_uncolored_vertices_unassigned():
+	mesh = _VCB_PartlyColored()
+	vertices, colors = engine.VCB_SmoothMesh(mesh, iterations = 3)
+
+	np.testing.assert_array_equal(vertices, [0, 1, 2, 3])
+	assert not mesh.hasColor[4:].any()
+
+def test_smooth_averages_colored_neighbors_only():
+	mesh = _VCB_PartlyColored()
+	engine.VCB_SmoothMesh(mesh, iterations = 1)
+
+	# Vertex 0 has neighbors 1 (red) and 2 (blue), vertex 2 has neighbors 0
+	# (red), 3 (blue) and 4 (unassigned, left out)
+	np.testing.assert_allclose(mesh.colors[0], (0.5, 0.0, 0.5, 1.0), atol = 1e-6)
+	np.testing.assert_allclose(mesh.colors[2], (0.5, 0.0, 0.5, 1.0), atol = 1e-6)
+
+def test_smooth_fully_colored_mesh():
+	positions, faceCounts, faceIndices = _VCB_Strip(2)
+	colors = np.zeros((len(positions), 4), dtype = np.float32)
+	colors[0] = 1.0
+	mesh = vmesh.MemoryMesh(positions, colors, faceCounts = faceCounts, faceIndices = faceIndices)
+	engine.VCB_SmoothMesh(mesh, iterations = 1, strength = 0.5)
+
+	# Half way from white to the black of its two neighbors
+	np.testing.assert_allclose(mesh.colors[0], (0.5, 0.5, 0.5, 0.5), atol = 1e-6)
+	assert mesh.hasColor.all()
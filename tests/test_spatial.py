@@ -0,0 +1,61 @@
+"""
+
+	Spatial index tests for Vertex Color Bench (VCB) v1.0
+
+	Checks the KD-tree against brute-force nearest point searches.
+
+"""
+
+## Imports
+import numpy as np
+import pytest
+
+import VCB.VCB_spatial as spatial
+
+## References
+
+def _VCB_BruteNearest(points, queries):
+	squared = ((queries[:, None, :] - points[None, :, :]) ** 2).sum(axis = 2)
+	nearest = squared.argmin(axis = 1)
+	return np.sqrt(squared[np.arange(len(queries)), nearest]), nearest
+
+## Tests
+
+@pytest.mark.parametrize("count", [1, 5, spatial.LEAF_SIZE, 1000, 5000])
+def test_nearest_matches_brute_force(count):
+	rng = np.random.default_rng(count)
+	points = rng.random((count, 3))
+	queries = rng.random((700, 3)) * 1.4 - 0.2
+	distances, indices = spatial.KDTree(points).nearest(queries)
+
+	expected, nearest = _VCB_BruteNearest(points, queries)
+	np.testing.assert_allclose(distances, expected, atol = 1e-9)
+	np.testing.assert_array_equal(indices, nearest)
+
+def test_radius_cuts_off_far_queries():
+	rng = np.random.default_rng(3)
+	points = rng.random((2000, 3))
+	queries = rng.random((500, 3)) * 3.0 - 1.0
+	radius = 0.2
+	distances, indices = spatial.KDTree(points).nearest(queries, radius)
+
+	expected, nearest = _VCB_BruteNearest(points, queries)
+	inside = expected <= radius
+	np.testing.assert_allclose(distances[inside], expected[inside], atol = 1e-9)
+	np.testing.assert_array_equal(indices[inside], nearest[inside])
+	assert np.isinf(distances[~inside]).all()
+	assert (indices[~inside] == -1).all()
+
+def test_clustered_and_duplicate_points():
+	rng = np.random.default_rng(4)
+	# Many copies of a few points, and a flat sheet, both stress the splits
+	points = np.concatenate([np.repeat(rng.random((10, 3)), 50, axis = 0), np.column_stack([rng.random((500, 2)), np.zeros(500)])])
+	queries = rng.random((300, 3))
+	distances = spatial.KDTree(points).distances(queries)
+	np.testing.assert_allclose(distances, _VCB_BruteNearest(points, queries)[0], atol = 1e-9)
+
+def test_index_cache_reuses_trees():
+	spatial.VCB_ClearIndexCache()
+	points = np.random.default_rng(5).random((100, 3))
+	assert spatial.VCB_GetIndex(points) is spatial.VCB_GetIndex(points.copy())
+	assert spatial.VCB_GetIndex(points) is not spatial.VCB_GetIndex(points + 1.0)